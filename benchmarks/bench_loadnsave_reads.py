@@ -0,0 +1,53 @@
+"""Micro-benchmark for per-message cache reads in loadnsave.py.
+
+Compares the copying loader a hot listener used to call on every message
+(smartreact_load(), which returns _SMART_REACT_CACHE.copy()) with the
+copy-free load_view('smart_react.json') it calls now, for documents holding
+an increasing number of guilds.
+
+Usage: python benchmarks/bench_loadnsave_reads.py [--calls 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import loadnsave  # noqa: E402
+
+GUILD_COUNTS = (10, 100, 1000, 10000)
+
+
+def _document(guilds):
+    return {str(900000000000000000 + g): {f"word{w}": "🐙" for w in range(20)} for g in range(guilds)}
+
+
+async def _per_call_us(read, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        reactions = await read()
+        reactions.get("900000000000000001")
+    return (time.perf_counter() - started) / calls * 1_000_000
+
+
+async def _run(calls):
+    print(f"{'guilds':>7} {'copy (us/msg)':>14} {'view (us/msg)':>14} {'speedup':>8}")
+    for guilds in GUILD_COUNTS:
+        loadnsave._SMART_REACT_CACHE = _document(guilds)
+        loadnsave._VIEWS.clear()
+        copying = await _per_call_us(loadnsave.smartreact_load, calls)
+        viewing = await _per_call_us(lambda: loadnsave.load_view('smart_react.json'), calls)
+        print(f"{guilds:>7} {copying:>14.2f} {viewing:>14.2f} {copying / viewing:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20000, help='reads per measurement')
+    args = parser.parse_args()
+    asyncio.run(_run(args.calls))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Micro-benchmark for smart-reaction word matching.
+
+Compares the per-word scan on_message used to do (lower the message and test
+`word in content` once per configured word) with SmartReactionMatcher's
+single regex pass, for guilds with an increasing number of trigger words.
+
+Usage: python benchmarks/bench_smartreaction_match.py [--messages 5000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from commands.smartreaction import SmartReactionMatcher  # noqa: E402
+
+WORD_COUNTS = (10, 100, 500, 2000)
+VOCABULARY = ("cthulhu", "shoggoth", "arkham", "miskatonic", "innsmouth", "dagon",
+              "necronomicon", "yog", "sothoth", "hastur", "byakhee", "tekeli")
+
+
+def _words(count, rng):
+    return {f"{rng.choice(VOCABULARY)}{i}": "🐙" for i in range(count)}
+
+
+def _messages(count, words, rng):
+    pool = list(words)
+    messages = []
+    for _ in range(count):
+        filler = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(5, 40)))
+        if rng.random() < 0.2:
+            filler += " " + rng.choice(pool).upper()
+        messages.append(filler)
+    return messages
+
+
+def _per_message_us(match, messages):
+    started = time.perf_counter()
+    for content in messages:
+        match(content)
+    return (time.perf_counter() - started) / len(messages) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=5000, help='messages per measurement')
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    print(f"{'words':>6} {'per-word (us/msg)':>18} {'matcher (us/msg)':>17} {'speedup':>8}")
+    for count in WORD_COUNTS:
+        words = _words(count, rng)
+        messages = _messages(args.messages, words, rng)
+        matcher = SmartReactionMatcher(words)
+
+        def naive(content):
+            return [(w, e) for w, e in words.items() if w.lower() in content.lower()]
+
+        old = _per_message_us(naive, messages)
+        new = _per_message_us(matcher.matches, messages)
+        print(f"{count:>6} {old:>18.2f} {new:>17.2f} {old / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
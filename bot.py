@@ -1,22 +1,28 @@
 import discord
 from discord.ext import commands
 import asyncio
+import importlib.abc
+import importlib.machinery
 import os
-from loadnsave import load_settings, load_server_stats
+import sys
+import time
+from loadnsave import load_settings, resolve_prefixes, write_behind_flusher, add_save_listener, DEFAULT_WRITE_BEHIND_INTERVAL, DATA_FOLDER
 from dashboard.app import app
+from render_service import RenderService, DEFAULT_MAX_PAGES
+from render_cache import RenderCache, DEFAULT_MAX_BYTES as DEFAULT_RENDER_CACHE_BYTES
 from hypercorn.asyncio import serve
 from hypercorn.config import Config
 
+_PROCESS_START = time.perf_counter()
+
 # Load the settings
 settings = load_settings()
 # Token printing removed for security
 
-# Function to get the bot's prefix dynamically from the JSON file or mentions
+# Function to get the bot's prefix dynamically from the JSON file or mentions.
+# The per-guild prefix list is memoized in loadnsave, so this is a dict hit.
 async def get_prefix(bot, message):
-    server_prefixes = await load_server_stats()
-    server_id = str(message.guild.id) if message.guild else None
-    server_prefix = server_prefixes.get(server_id, "!") if server_id else "!"
-    return commands.when_mentioned_or(server_prefix)(bot, message)
+    return await resolve_prefixes(message.guild.id if message.guild else None, bot.user.id)
 
 # Create a bot instance and pass it to the CustomHelpCommand constructor
 bot = commands.Bot(command_prefix=get_prefix,
@@ -26,6 +32,20 @@ bot = commands.Bot(command_prefix=get_prefix,
 
 # Global list to track failed loads
 bot.failed_extensions = []
+# Per-extension load timings, filled in by load() and shown in the owner DM and /api/status
+bot.startup_report = {}
+# One warm headless browser shared by the poster, character sheet and karma card renders,
+# with finished posters/sheets kept on disk so identical requests skip the browser
+render_cache = RenderCache(
+    os.path.join(DATA_FOLDER, "render_cache"),
+    max_bytes=settings.get("render_cache_mb", DEFAULT_RENDER_CACHE_BYTES // (1024 * 1024)) * 1024 * 1024,
+)
+add_save_listener('player_stats.json', render_cache.forget_changed_characters)
+bot.render_service = RenderService(
+    max_pages=settings.get("render_max_pages", DEFAULT_MAX_PAGES),
+    port=settings.get("dashboard_port", 5000),
+    cache=render_cache,
+)
 
 UPDATE_HEALTH_MARKER = "update_health.marker"  # must match updater.py's copy of this filename
 ROLLBACK_NOTICE_FILE = "rollback_notice.txt"   # must match updater.py's copy of this filename
@@ -81,6 +101,18 @@ async def on_ready():
 
     _write_health_marker()
 
+    # on_ready fires again after reconnects; only the first one is time-to-ready.
+    if bot.startup_report and bot.startup_report.get("ready_ms") is None:
+        bot.startup_report["ready_ms"] = round((time.perf_counter() - _PROCESS_START) * 1000)
+        print(_format_startup_report(bot.startup_report))
+        if settings.get("startup_report_dm", False) and not bot.failed_extensions:
+            owner = await _get_owner(bot)
+            if owner:
+                try:
+                    await owner.send(_format_startup_report(bot.startup_report))
+                except Exception as e:
+                    print(f"Failed to send startup report to owner: {e}")
+
     if hasattr(bot, 'failed_extensions') and bot.failed_extensions:
         try:
             owner = await _get_owner(bot)
@@ -89,6 +121,7 @@ async def on_ready():
                 error_message = "**⚠️ Startup Issues:**\nThe following extensions failed to load:\n\n"
                 for filename, error in bot.failed_extensions:
                     error_message += f"**{filename}**:\n`{error}`\n\n"
+                error_message += _format_startup_report(bot.startup_report)
 
                 # Send DM (chunk if necessary)
                 if len(error_message) > 2000:
@@ -105,26 +138,107 @@ async def on_ready():
 
     await _send_rollback_notice_if_present(bot)
 
+class _ExtensionImportTimer(importlib.abc.MetaPathFinder):
+    """Times each extension's module body, so the startup report can tell
+    import cost apart from setup(bot) cost. Only installed while load() runs."""
+
+    def __init__(self, names):
+        self.names = set(names)
+        self.import_ms = {}
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in self.names:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+        if spec is None or spec.loader is None:
+            return spec
+        exec_module = spec.loader.exec_module
+
+        def timed_exec_module(module):
+            started = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                self.import_ms[fullname] = (time.perf_counter() - started) * 1000
+
+        spec.loader.exec_module = timed_exec_module
+        return spec
+
+
+def _extension_names(folder='./commands'):
+    return sorted(f[:-3] for f in os.listdir(folder) if f.endswith('.py') and not f.startswith('_'))
+
+
+async def _load_extension_timed(name, timer):
+    entry = {"name": name, "status": "loaded"}
+    started = time.perf_counter()
+    try:
+        await bot.load_extension(f"commands.{name}")
+        print(f"{name} is now LOADED! Yeah Baby!")
+    except commands.errors.NoEntryPointError:
+        print(f"Warning: {name}.py has no 'setup' function. Skipping.")
+        entry["status"] = "skipped"
+    except Exception as e:
+        print(f"Failed to load extension {name}.py: {e}")
+        bot.failed_extensions.append((f"{name}.py", str(e)))
+        entry["status"] = "failed"
+        entry["error"] = str(e)
+    total_ms = (time.perf_counter() - started) * 1000
+    import_ms = timer.import_ms.get(f"commands.{name}", 0.0)
+    # setup_ms is wall clock: it includes time other extensions spent running
+    # while this one's setup()/cog_load awaited.
+    entry["import_ms"] = round(import_ms, 1)
+    entry["setup_ms"] = round(max(total_ms - import_ms, 0.0), 1)
+    entry["total_ms"] = round(total_ms, 1)
+    return entry
+
+
 # Loading cogs!
 async def load():
-  # in folder commands
-  for filename in os.listdir('./commands'):
-    # all files ending with .py
-    if filename.endswith('.py') and not filename.startswith('_'):
-      # load as extensions
-      try:
-        await bot.load_extension(f"commands.{filename[:-3]}")
-        print(f"{filename[:-3]} is now LOADED! Yeah Baby!")
-      except commands.errors.NoEntryPointError:
-        print(f"Warning: {filename} has no 'setup' function. Skipping.")
-      except Exception as e:
-        print(f"Failed to load extension {filename}: {e}")
-        bot.failed_extensions.append((filename, str(e)))
+    """Load every commands/*.py extension concurrently and record timings.
+
+    Module bodies still run one at a time, but any setup() or cog_load that
+    awaits (data files, views, tasks) overlaps with the others instead of
+    holding up the rest of the folder."""
+    names = _extension_names()
+    timer = _ExtensionImportTimer(f"commands.{name}" for name in names)
+    sys.meta_path.insert(0, timer)
+    started = time.perf_counter()
+    try:
+        entries = await asyncio.gather(*(_load_extension_timed(name, timer) for name in names))
+    finally:
+        sys.meta_path.remove(timer)
+
+    bot.startup_report = {
+        "extensions": sorted(entries, key=lambda e: e["total_ms"], reverse=True),
+        "loaded": sum(1 for e in entries if e["status"] == "loaded"),
+        "failed": sum(1 for e in entries if e["status"] == "failed"),
+        "load_ms": round((time.perf_counter() - started) * 1000),
+        "ready_ms": None,
+    }
+
+
+def _format_startup_report(report, slowest=5):
+    """One short Discord-ready summary of bot.startup_report."""
+    if not report:
+        return ""
+    ready = f", ready after {report['ready_ms'] / 1000:.1f}s" if report.get("ready_ms") is not None else ""
+    lines = [f"**⏱️ Startup:** {report['loaded']} extensions loaded in {report['load_ms']} ms{ready}."]
+    for entry in report["extensions"][:slowest]:
+        lines.append(
+            f"`{entry['name']}` {entry['total_ms']:.0f} ms "
+            f"(import {entry['import_ms']:.0f} / setup {entry['setup_ms']:.0f})"
+        )
+    return "\n".join(lines)
 
 async def main():
   async with bot:
     await load()
 
+    # Coalesces mark_dirty() writes; flushes one last time when cancelled below.
+    flush_interval = settings.get("write_behind_interval", DEFAULT_WRITE_BEHIND_INTERVAL)
+    flusher_task = asyncio.create_task(write_behind_flusher(flush_interval))
+
     server_task = None
     # Start Dashboard if enabled
     if settings.get("enable_dashboard", False):
@@ -153,6 +267,15 @@ async def main():
                 pass
             print("Dashboard stopped.")
 
+        flusher_task.cancel()
+        try:
+            await flusher_task
+        except asyncio.CancelledError:
+            pass
+        print("Pending data flushed.")
+
+        await bot.render_service.close()
+
 if __name__ == "__main__":
     asyncio.run(main())
 
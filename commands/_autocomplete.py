@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from rapidfuzz import process, fuzz
+
+CACHE_TTL = 30
+MAX_CACHED_QUERIES = 1024
+# Scores for the best NARROW_POOL candidates are kept per query. When the user
+# types one more character only those are rescored, but only if the pool holds
+# the whole list. A top-N cut of WRatio scores is not a superset of the matches
+# for a longer query: a one-letter query ties hundreds of choices at 100, and a
+# choice that scored 0 can match once the new character is typed.
+NARROW_POOL = 250
+THREAD_THRESHOLD = 1000
+# Discord drops autocomplete responses after 3 seconds.
+RESPONSE_BUDGET = 2.0
+
+
+class _Result:
+    __slots__ = ("choices", "pool", "complete", "expires")
+
+    def __init__(self, choices, pool, complete, expires):
+        self.choices = choices
+        self.pool = pool  # [(index, score)] best first, at most NARROW_POOL long
+        self.complete = complete  # the pool holds every candidate that was scored
+        self.expires = expires
+
+
+class AutocompleteEngine:
+    """Fuzzy search for autocomplete and option lookups.
+
+    Results are cached for `ttl` seconds per (user, command, query) in an LRU
+    of `max_entries`, and are only reused while the caller passes the same
+    choice list (same object, or an equal one). A query that extends a cached
+    query of the same user and command rescores only that query's pool when
+    the pool holds every choice, and the full list otherwise.
+    Scoring more than `thread_threshold` choices runs in a worker thread, and
+    if it has not finished within `budget` seconds a plain substring match is
+    returned instead so Discord still gets an answer.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, max_entries=MAX_CACHED_QUERIES, pool_size=NARROW_POOL,
+                 thread_threshold=THREAD_THRESHOLD, budget=RESPONSE_BUDGET):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.pool_size = pool_size
+        self.thread_threshold = thread_threshold
+        self.budget = budget
+        self._cache = OrderedDict()  # (user, command, query) -> _Result
+        self.stats = {"hits": 0, "narrowed": 0, "full": 0, "threaded": 0, "timeouts": 0}
+
+    def _lookup(self, key, choices, now):
+        result = self._cache.get(key)
+        if result is None:
+            return None
+        if result.expires < now or not (result.choices is choices or result.choices == choices):
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _score(self, query, choices, candidates):
+        if candidates is None:
+            matches = process.extract(query, choices, scorer=fuzz.WRatio, processor=None, limit=self.pool_size)
+        else:
+            matches = process.extract(query, {i: choices[i] for i, _ in candidates},
+                                      scorer=fuzz.WRatio, processor=None, limit=self.pool_size)
+        return [(i, score) for _, score, i in matches]
+
+    async def search(self, user_id, command, query, choices, limit=25, score_cutoff=None):
+        """Returns up to `limit` (index into `choices`, score) pairs, best first.
+
+        `query` is compared to `choices` as given; callers that want
+        case-insensitive matching pass preprocessed choices and query.
+        """
+        now = time.monotonic()
+        key = (user_id, command, query)
+        result = self._lookup(key, choices, now)
+        if result is not None:
+            self.stats["hits"] += 1
+        else:
+            candidates = None
+            for end in range(len(query) - 1, 0, -1):
+                previous = self._lookup((user_id, command, query[:end]), choices, now)
+                if previous is not None:
+                    if previous.complete:
+                        candidates = previous.pool
+                    break
+
+            size = len(choices) if candidates is None else len(candidates)
+            self.stats["full" if candidates is None else "narrowed"] += 1
+            if size > self.thread_threshold:
+                self.stats["threaded"] += 1
+                try:
+                    pool = await asyncio.wait_for(asyncio.to_thread(self._score, query, choices, candidates), self.budget)
+                except asyncio.TimeoutError:
+                    self.stats["timeouts"] += 1
+                    return self._substring_matches(query, choices, limit)
+            else:
+                pool = self._score(query, choices, candidates)
+
+            complete = len(pool) == size
+            result = _Result(choices, pool, complete, now + self.ttl)
+            self._cache[key] = result
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        matches = result.pool[:limit]
+        if score_cutoff is not None:
+            matches = [(i, score) for i, score in matches if score >= score_cutoff]
+        return matches
+
+    @staticmethod
+    def _substring_matches(query, choices, limit):
+        needle = query.lower()
+        return [(i, 100.0) for i, choice in enumerate(choices) if needle in choice.lower()][:limit]
+
+    def clear(self):
+        self._cache.clear()
+
+
+# Shared by every cog's autocomplete handlers.
+engine = AutocompleteEngine()
@@ -0,0 +1,86 @@
+import re
+from collections import OrderedDict
+
+from rapidfuzz import process, fuzz, utils
+
+PULP_TALENT_PATTERN = re.compile(r'\*\*(.*?)\*\*:\s*(.*)')
+
+# Infodata documents are replaced wholesale when the dashboard saves them, so
+# an index stays valid for as long as its document object is the cached one.
+# A few more slots than there are codex categories keeps every live index
+# while letting ones for replaced documents fall out.
+MAX_INDEXES = 32
+_INDEXES = OrderedDict()  # (id(data), data_key, flatten_pulp) -> (data, CodexIndex)
+
+
+def entry_key_for(data_key):
+    """Key of the per-item dict in list documents: "monsters" -> "monster_entry"."""
+    if data_key == "deities":
+        return "deity_entry"
+    return data_key[:-1] + "_entry"
+
+
+class CodexIndex:
+    """Name lookup tables for one codex category.
+
+    `entries` maps each name to the dict the embeds are built from (the first
+    one wins if a name repeats), `names` is the sorted name list, `by_lower`
+    resolves case-insensitive exact matches, and `processed` is `choices` run
+    through `utils.default_process` once here rather than on every query.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.names = sorted(entries)
+        self.by_lower = {}
+        for name in entries:
+            self.by_lower.setdefault(name.lower(), name)
+        self.choices = list(entries)
+        self.processed = [utils.default_process(name) for name in self.choices]
+
+    def get(self, name):
+        return self.entries.get(name)
+
+    def exact(self, query):
+        return self.by_lower.get(query.lower())
+
+    def search(self, query, limit, score_cutoff=None):
+        """Best fuzzy matches for `query`, best first."""
+        matches = process.extract(
+            utils.default_process(query), self.processed,
+            scorer=fuzz.WRatio, processor=None, limit=limit, score_cutoff=score_cutoff
+        )
+        return [self.choices[i] for _, _, i in matches]
+
+
+def _build(data, data_key, flatten_pulp):
+    entries = {}
+    if flatten_pulp:
+        for category, talents in data.items():
+            for t_str in talents:
+                match = PULP_TALENT_PATTERN.match(t_str)
+                if match and match.group(1) not in entries:
+                    entries[match.group(1)] = {"name": match.group(1), "description": match.group(2), "category": category}
+    elif data_key:
+        entry_key = entry_key_for(data_key)
+        for item in data.get(data_key, []):
+            entry = item.get(entry_key)
+            if entry and entry.get('name') and entry['name'] not in entries:
+                entries[entry['name']] = entry
+    elif isinstance(data, dict):
+        entries = data
+    return CodexIndex(entries)
+
+
+def get_index(data, data_key=None, flatten_pulp=False):
+    """Returns the index for a loaded infodata document, building it on first use."""
+    key = (id(data), data_key, flatten_pulp)
+    cached = _INDEXES.get(key)
+    if cached:
+        _INDEXES.move_to_end(key)
+        return cached[1]
+    index = _build(data, data_key, flatten_pulp)
+    _INDEXES[key] = (data, index)
+    while len(_INDEXES) > MAX_INDEXES:
+        _INDEXES.popitem(last=False)
+    return index
@@ -1,8 +1,8 @@
 import discord
 import random
-import re
 import urllib.parse
 
+from commands._codex_index import get_index
 from loadnsave import (
     load_monsters_data, load_deities_data, load_spells_data,
     load_archetype_data, load_pulp_talents_data, load_madness_insane_talent_data,
@@ -160,33 +160,13 @@ class OptionsView(discord.ui.View):
              return await interaction.response.send_message("This isn't for you!", ephemeral=True)
 
         data = await self.loader_func()
-        choices = []
-        if self.flatten_pulp:
-            # Pulp talents logic
-            pulp_map = {}
-            for category, talents in data.items():
-                for t_str in talents:
-                    match = re.match(r'\*\*(.*?)\*\*:\s*(.*)', t_str)
-                    if match:
-                         pulp_map[match.group(1)] = match.group(1)
-            choices = list(pulp_map.keys())
-        elif self.data_key:
-             items = data.get(self.data_key, [])
-             entry_key = self.type_slug + "_entry"
-             for item in items:
-                entry = item.get(entry_key)
-                if entry and entry.get('name'):
-                    choices.append(entry['name'])
+        names = get_index(data, self.data_key, self.flatten_pulp).names
+        if self.type_slug == "invention":
+            # For inventions, include the count
+            choices = [f"{k} ({len(data[k])} entries)" for k in names]
         else:
-             # For inventions, include the count
-             if self.type_slug == "invention":
-                 choices = []
-                 for k, v in data.items():
-                     choices.append(f"{k} ({len(v)} entries)")
-             else:
-                 choices = list(data.keys())
-
-        choices.sort()
+            choices = list(names)
+
         view = PaginatedListView(
             self.user, choices, self.title,
             data=data, cog=self.cog, type_slug=self.type_slug,
@@ -207,22 +187,7 @@ class OptionsView(discord.ui.View):
 
         try:
             data = await self.loader_func()
-            choices = []
-            if self.flatten_pulp:
-                for category, talents in data.items():
-                    for t_str in talents:
-                        match = re.match(r'\*\*(.*?)\*\*:\s*(.*)', t_str)
-                        if match:
-                            choices.append(match.group(1))
-            elif self.data_key:
-                items = data.get(self.data_key, [])
-                entry_key = self.type_slug + "_entry"
-                for item in items:
-                    entry = item.get(entry_key)
-                    if entry and entry.get('name'):
-                        choices.append(entry['name'])
-            else:
-                choices = list(data.keys())
+            choices = get_index(data, self.data_key, self.flatten_pulp).names
 
             if not choices:
                 await interaction.edit_original_response(content="No entries found.", embed=None, view=None)
@@ -354,38 +319,12 @@ class CodexView(discord.ui.View):
 
         try:
             data = await loader()
-            choices = []
-            if flatten_pulp:
-                pulp_map = {}
-                for category, talents in data.items():
-                    for t_str in talents:
-                        match = re.match(r'\*\*(.*?)\*\*:\s*(.*)', t_str)
-                        if match:
-                            pulp_map[match.group(1)] = match.group(1)
-                choices = list(pulp_map.keys())
-            elif data_key:
-                items = data.get(data_key, [])
-                if data_key == "monsters":
-                    entry_key = "monster_entry"
-                elif data_key == "spells":
-                    entry_key = "spell_entry"
-                elif data_key == "deities":
-                    entry_key = "deity_entry"
-                else:
-                    entry_key = data_key[:-1] + "_entry"
-
-                for item in items:
-                    entry = item.get(entry_key)
-                    if entry and entry.get('name'):
-                        choices.append(entry['name'])
+            names = get_index(data, data_key, flatten_pulp).names
+            if type_slug == "invention":
+                choices = [f"{k} ({len(data[k])} entries)" for k in names]
             else:
-                if type_slug == "invention":
-                    for k, v in data.items():
-                        choices.append(f"{k} ({len(v)} entries)")
-                else:
-                    choices = list(data.keys())
+                choices = list(names)
 
-            choices.sort()
             print(f"[Codex] _launch_list '{title}': {len(choices)} choices, data type={type(data).__name__}, data_key={data_key}")
 
             if not choices:
@@ -0,0 +1,62 @@
+import asyncio
+
+
+class DrainQueue:
+    """Pending work grouped by key, each key drained by its own task.
+
+    put(key, item_key, item) holds at most one item per item key; putting
+    again before it runs replaces it. Every key (a channel, a guild) gets a
+    task that awaits `process(key, item_key, item)` for its items one at a
+    time in the order they were first put, so different keys run
+    concurrently while one key never has two requests in flight. With
+    `ready_at(item)` (an event-loop time) the task waits until the oldest
+    item is due before taking it, leaving it replaceable until then.
+    """
+
+    def __init__(self, process, ready_at=None):
+        self.process = process
+        self.ready_at = ready_at
+        self._pending = {}  # key -> {item key: item}
+        self._drainers = {}  # key -> task
+
+    def get(self, key, item_key):
+        return self._pending.get(key, {}).get(item_key)
+
+    def put(self, key, item_key, item):
+        """Queues `item`; returns True if it replaced one still pending."""
+        pending = self._pending.setdefault(key, {})
+        replaced = item_key in pending
+        pending[item_key] = item
+        if key not in self._drainers:
+            self._drainers[key] = asyncio.create_task(self._drain(key))
+        return replaced
+
+    async def _drain(self, key):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending.get(key):
+                pending = self._pending[key]
+                item_key = next(iter(pending))
+                if self.ready_at:
+                    delay = self.ready_at(pending[item_key]) - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        continue
+                item = pending.pop(item_key)
+                await self.process(key, item_key, item)
+        finally:
+            # After close() a new task may already own this key.
+            if self._drainers.get(key) is asyncio.current_task():
+                self._pending.pop(key, None)
+                self._drainers.pop(key, None)
+
+    async def join(self):
+        """Wait until every queued item has been processed."""
+        while self._drainers:
+            await asyncio.gather(*list(self._drainers.values()), return_exceptions=True)
+
+    def close(self):
+        for task in self._drainers.values():
+            task.cancel()
+        self._drainers.clear()
+        self._pending.clear()
@@ -0,0 +1,74 @@
+import asyncio
+from collections import OrderedDict
+
+import discord
+
+from commands._drain_queue import DrainQueue
+
+
+class EditScheduler:
+    """Coalescing queue of message edits.
+
+    submit() records at most one pending edit per message; submitting again
+    before it runs only replaces the render callback, so a burst of state
+    changes costs one edit. Discord rate-limits message edits per channel, so
+    edits go through a DrainQueue keyed by channel: one edit at a time per
+    channel, while different channels run concurrently (at most
+    `max_concurrency` requests in flight overall).
+
+    `render()` is called just before sending and returns `(signature, build)`:
+    if the signature equals the one last sent for that message the edit is
+    skipped, otherwise `await message.edit(**build())` is sent. `on_missing`
+    is called with the message when Discord reports it deleted. Signatures
+    are kept for the `max_tracked` most recently edited messages, so panels
+    that are abandoned rather than deleted don't accumulate.
+    """
+
+    def __init__(self, max_concurrency=8, on_missing=None, max_tracked=256):
+        self.on_missing = on_missing
+        self.max_tracked = max_tracked
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._queue = DrainQueue(self._drain_one)  # keyed by channel id, then message id
+        self._sent = OrderedDict()  # message id -> signature of the last edit sent, LRU
+        self.stats = {"submitted": 0, "coalesced": 0, "skipped": 0, "edits": 0, "errors": 0}
+
+    def submit(self, message, render):
+        self.stats["submitted"] += 1
+        if self._queue.put(message.channel.id, message.id, (message, render)):
+            self.stats["coalesced"] += 1
+
+    def forget(self, message):
+        """Drop what is known about `message`, e.g. after editing it directly."""
+        self._sent.pop(message.id, None)
+
+    async def _drain_one(self, channel_id, message_id, item):
+        message, render = item
+        async with self._slots:
+            await self._edit(message, render)
+
+    async def _edit(self, message, render):
+        try:
+            signature, build = render()
+            if signature is not None and self._sent.get(message.id) == signature:
+                self.stats["skipped"] += 1
+                return
+            await message.edit(**build())
+            self._sent[message.id] = signature
+            self._sent.move_to_end(message.id)
+            while len(self._sent) > self.max_tracked:
+                self._sent.popitem(last=False)
+            self.stats["edits"] += 1
+        except discord.NotFound:
+            self._sent.pop(message.id, None)
+            if self.on_missing:
+                self.on_missing(message)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Error editing message {message.id}: {e}")
+
+    async def join(self):
+        """Wait until every submitted edit has been sent or skipped."""
+        await self._queue.join()
+
+    def close(self):
+        self._queue.close()
@@ -0,0 +1,65 @@
+class GuildRoleIndex:
+    """Role lookups for one guild, kept current by GamerRoles' role and member listeners.
+
+    `by_name` maps each role name to the ids of roles with that name, and
+    `by_game` maps the part after the first space ("🎮 Chess" -> "Chess") the
+    same way, so finding a game's role never scans `guild.roles`. `counts`
+    tallies members per role; a role's count is seeded from `role.members`
+    the first time it is asked for and then moved by member updates.
+    """
+
+    def __init__(self, guild):
+        self.by_name = {}
+        self.by_game = {}
+        self.counts = {}
+        for role in guild.roles:
+            self.add(role)
+
+    def add(self, role):
+        self.by_name.setdefault(role.name, set()).add(role.id)
+        if " " in role.name:
+            self.by_game.setdefault(role.name.split(" ", 1)[1], set()).add(role.id)
+
+    def remove(self, role):
+        """Forgets `role` as it was named; pass the `before` role on renames."""
+        for table, key in ((self.by_name, role.name), (self.by_game, role.name.split(" ", 1)[-1])):
+            ids = table.get(key)
+            if ids:
+                ids.discard(role.id)
+                if not ids:
+                    del table[key]
+
+    def named(self, guild, name):
+        """The lowest role called `name`, as discord.utils.get(guild.roles, name=...) would find."""
+        roles = [guild.get_role(role_id) for role_id in self.by_name.get(name, ())]
+        roles = [r for r in roles if r]
+        return min(roles, key=lambda r: r.position) if roles else None
+
+    def managed_for_game(self, guild, game, managed_roles):
+        """The first of `managed_roles` named "<emoji> <game>"."""
+        ids = self.by_game.get(game)
+        if not ids:
+            return None
+        for r_id in managed_roles:
+            if int(r_id) in ids:
+                role = guild.get_role(int(r_id))
+                if role:
+                    return role
+        return None
+
+    def count(self, role):
+        if role.id not in self.counts:
+            self.counts[role.id] = len(role.members)
+        return self.counts[role.id]
+
+    def members_changed(self, before_roles, after_roles):
+        before_ids = {r.id for r in before_roles}
+        after_ids = {r.id for r in after_roles}
+        for role_id in before_ids ^ after_ids:
+            if role_id in self.counts:
+                self.counts[role_id] += 1 if role_id in after_ids else -1
+
+    def member_left(self, roles):
+        for role in roles:
+            if role.id in self.counts:
+                self.counts[role.id] -= 1
@@ -0,0 +1,52 @@
+from bisect import bisect_left, insort
+
+
+class LeaderboardIndex:
+    """Per-guild karma standings, kept sorted as votes come in.
+
+    Each guild's entries are (-score, user_id) tuples in a sorted list, so a
+    vote moves one entry (two bisects) instead of re-sorting the guild for
+    every /leaderboard or dashboard request. An index is tied to the guild's
+    dict in karma_stats.json's cache; when that dict is replaced (a
+    recalculation, a reload after invalidate_data_cache) or its size no
+    longer matches, the index is rebuilt on the next read.
+    """
+
+    def __init__(self):
+        self._guilds = {}  # guild_id (str) -> (guild stats dict, sorted entries)
+
+    def _entries(self, guild_id, guild_stats):
+        cached = self._guilds.get(guild_id)
+        if cached is not None and cached[0] is guild_stats and len(cached[1]) == len(guild_stats):
+            return cached[1]
+        entries = sorted((-score, user_id) for user_id, score in guild_stats.items())
+        self._guilds[guild_id] = (guild_stats, entries)
+        return entries
+
+    def update(self, guild_id, guild_stats, user_id, old_score, new_score):
+        """Move `user_id` from `old_score` (None if new) to `new_score`."""
+        cached = self._guilds.get(guild_id)
+        if cached is None or cached[0] is not guild_stats:
+            return  # built lazily on the next read
+        entries = cached[1]
+        if old_score is not None:
+            i = bisect_left(entries, (-old_score, user_id))
+            if i < len(entries) and entries[i] == (-old_score, user_id):
+                del entries[i]
+            else:
+                self._guilds.pop(guild_id, None)
+                return
+        insort(entries, (-new_score, user_id))
+
+    def top(self, guild_id, guild_stats, limit=None):
+        """[(user_id, score), ...] best first; all members when `limit` is None."""
+        entries = self._entries(guild_id, guild_stats)
+        if limit is not None:
+            entries = entries[:limit]
+        return [(user_id, -neg_score) for neg_score, user_id in entries]
+
+    def forget(self, guild_id=None):
+        if guild_id is None:
+            self._guilds.clear()
+        else:
+            self._guilds.pop(str(guild_id), None)
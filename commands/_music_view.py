@@ -99,81 +99,88 @@ class MusicView(View):
     # ── Embed ────────────────────────────────────────────────────────────────
 
     def get_embed(self) -> discord.Embed:
-        track = self.cog.current_track.get(self.guild_id)
-        queue = self.cog.queue.get(self.guild_id, [])
-
-        is_active = track and not track.finished
-
-        if is_active:
-            color = discord.Color.yellow() if track.paused else discord.Color.green()
+        return dashboard_embed(self.cog, self.guild_id)
+
+
+def dashboard_embed(cog, guild_id) -> discord.Embed:
+    """The dashboard embed for a guild; needs no MusicView, so a refresh can
+    compare it with what is already shown before building buttons."""
+    guild_id = str(guild_id)
+    track = cog.current_track.get(guild_id)
+    queue = cog.queue.get(guild_id, [])
+
+    is_active = track and not track.finished
+
+    if is_active:
+        color = discord.Color.yellow() if track.paused else discord.Color.green()
+    else:
+        color = discord.Color.greyple()
+
+    embed = discord.Embed(color=color)
+
+    if is_active:
+        meta = track.metadata
+        title = meta.get('title', 'Unknown')
+        orig_url = meta.get('original_url', '')
+        thumbnail = meta.get('thumbnail', '')
+        duration = meta.get('duration')
+        req = meta.get('requested_by', 'Unknown')
+        _lm = cog.loop_mode.get(guild_id, "off")
+        loop_icon = {"off": "", "track": "🔂 ", "queue": "🔁 "}.get(_lm, "")
+        status = "⏸️ Paused" if track.paused else "▶️ Now Playing"
+
+        embed.title = f"{status} — {loop_icon}{title}"
+        if orig_url:
+            embed.url = orig_url
+        if thumbnail:
+            embed.set_thumbnail(url=thumbnail)
+
+        lines = [f"**Requested by:** {req}"]
+
+        if duration and duration > 0:
+            elapsed = track.elapsed
+            bar = _progress_bar(elapsed, duration)
+            lines.append(
+                f"`{_fmt_duration(elapsed)}` `{bar}` `{_fmt_duration(duration)}`"
+            )
         else:
-            color = discord.Color.greyple()
-
-        embed = discord.Embed(color=color)
-
-        if is_active:
-            meta = track.metadata
-            title = meta.get('title', 'Unknown')
-            orig_url = meta.get('original_url', '')
-            thumbnail = meta.get('thumbnail', '')
-            duration = meta.get('duration')
-            req = meta.get('requested_by', 'Unknown')
-            _lm = self.cog.loop_mode.get(self.guild_id, "off")
-            loop_icon = {"off": "", "track": "🔂 ", "queue": "🔁 "}.get(_lm, "")
-            status = "⏸️ Paused" if track.paused else "▶️ Now Playing"
-
-            embed.title = f"{status} — {loop_icon}{title}"
-            if orig_url:
-                embed.url = orig_url
-            if thumbnail:
-                embed.set_thumbnail(url=thumbnail)
-
-            lines = [f"**Requested by:** {req}"]
-
-            if duration and duration > 0:
-                elapsed = track.elapsed
-                bar = _progress_bar(elapsed, duration)
-                lines.append(
-                    f"`{_fmt_duration(elapsed)}` `{bar}` `{_fmt_duration(duration)}`"
-                )
+            # Livestream or unknown duration
+            lines.append("🔴 **Live**" if not duration else "")
+
+        vol_pct = _vol_to_pct(track.volume)
+        lines.append(f"**Volume:** {vol_pct}%")
+
+        embed.description = "\n".join(l for l in lines if l)
+    else:
+        embed.title = "🔇 No Music Playing"
+        embed.description = "Use `/play` to add songs to the queue."
+
+    if queue:
+        q_lines = []
+        for i, song in enumerate(queue[:10], 1):
+            t = song.get('title', 'Unknown')
+            if len(t) > 45:
+                t = t[:42] + "…"
+            t_esc = t.replace('[', '(').replace(']', ')')
+            dur = song.get('duration')
+            dur_str = f" `{_fmt_duration(dur)}`" if dur else ""
+            url = song.get('original_url', '')
+            if url:
+                q_lines.append(f"`{i}.` [{t_esc}]({url}){dur_str}")
             else:
-                # Livestream or unknown duration
-                lines.append("🔴 **Live**" if not duration else "")
+                q_lines.append(f"`{i}.` {t_esc}{dur_str}")
 
-            vol_pct = _vol_to_pct(track.volume)
-            lines.append(f"**Volume:** {vol_pct}%")
+        if len(queue) > 10:
+            q_lines.append(f"*…and {len(queue) - 10} more*")
 
-            embed.description = "\n".join(l for l in lines if l)
-        else:
-            embed.title = "🔇 No Music Playing"
-            embed.description = "Use `/play` to add songs to the queue."
-
-        if queue:
-            q_lines = []
-            for i, song in enumerate(queue[:10], 1):
-                t = song.get('title', 'Unknown')
-                if len(t) > 45:
-                    t = t[:42] + "…"
-                t_esc = t.replace('[', '(').replace(']', ')')
-                dur = song.get('duration')
-                dur_str = f" `{_fmt_duration(dur)}`" if dur else ""
-                url = song.get('original_url', '')
-                if url:
-                    q_lines.append(f"`{i}.` [{t_esc}]({url}){dur_str}")
-                else:
-                    q_lines.append(f"`{i}.` {t_esc}{dur_str}")
-
-            if len(queue) > 10:
-                q_lines.append(f"*…and {len(queue) - 10} more*")
-
-            total_dur = sum(s.get('duration', 0) or 0 for s in queue)
-            field_title = f"📚 Queue — {len(queue)} song{'s' if len(queue) != 1 else ''}"
-            if total_dur:
-                field_title += f" · {_fmt_duration(total_dur)}"
-
-            embed.add_field(name=field_title, value="\n".join(q_lines), inline=False)
-        else:
-            if is_active:
-                embed.set_footer(text="Queue empty · /play to add more")
+        total_dur = sum(s.get('duration', 0) or 0 for s in queue)
+        field_title = f"📚 Queue — {len(queue)} song{'s' if len(queue) != 1 else ''}"
+        if total_dur:
+            field_title += f" · {_fmt_duration(total_dur)}"
+
+        embed.add_field(name=field_title, value="\n".join(q_lines), inline=False)
+    else:
+        if is_active:
+            embed.set_footer(text="Queue empty · /play to add more")
 
-        return embed
+    return embed
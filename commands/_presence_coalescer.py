@@ -0,0 +1,75 @@
+import asyncio
+
+from commands._drain_queue import DrainQueue
+from commands._rate_budget import RateBudget
+
+
+class PresenceCoalescer:
+    """Settles members' game changes before they are applied.
+
+    observe() records a member's change from one game to another; further
+    changes within `settle` seconds of the first only replace the target
+    game. When the window closes, `apply(guild, member, old_game, new_game)`
+    is awaited with the game the member had before the window and the last
+    one seen, unless those are equal (the member switched away and back), in
+    which case the change is suppressed. Changes wait in a DrainQueue keyed
+    by guild, so each guild applies one change at a time; `apply` paces its
+    role requests with the guild's `budget(guild_id)` so bursts stay within
+    Discord's limits.
+
+    `stats[guild_id]` counts observed events, events coalesced into a pending
+    change, and changes suppressed, applied or failed.
+    """
+
+    def __init__(self, apply, settle, rate, burst=None):
+        self.apply = apply
+        self.settle = settle
+        self.rate = rate
+        self.burst = burst
+        # guild id -> {member id: [guild, member, old_game, new_game, due]}. Every
+        # change gets the same window, so insertion order is due order.
+        self._queue = DrainQueue(self._apply_one, ready_at=lambda entry: entry[4])
+        self._budgets = {}  # guild id -> RateBudget
+        self.stats = {}
+
+    def budget(self, guild_id):
+        """The RateBudget shared by every role request for `guild_id`."""
+        budget = self._budgets.get(guild_id)
+        if budget is None:
+            budget = self._budgets[guild_id] = RateBudget(self.rate, self.burst)
+        return budget
+
+    def _stats(self, guild_id):
+        return self.stats.setdefault(guild_id, {"observed": 0, "coalesced": 0, "suppressed": 0, "applied": 0, "errors": 0})
+
+    def observe(self, guild, member, old_game, new_game):
+        stats = self._stats(guild.id)
+        stats["observed"] += 1
+        entry = self._queue.get(guild.id, member.id)
+        if entry:
+            stats["coalesced"] += 1
+            entry[1] = member
+            entry[3] = new_game
+        else:
+            due = asyncio.get_running_loop().time() + self.settle
+            self._queue.put(guild.id, member.id, [guild, member, old_game, new_game, due])
+
+    async def _apply_one(self, guild_id, member_id, entry):
+        guild, member, old_game, new_game, _ = entry
+        stats = self._stats(guild_id)
+        if old_game == new_game:
+            stats["suppressed"] += 1
+            return
+        try:
+            await self.apply(guild, member, old_game, new_game)
+            stats["applied"] += 1
+        except Exception as e:
+            stats["errors"] += 1
+            print(f"Gamer Roles: failed to update {member} in {guild.name}: {e}")
+
+    async def join(self):
+        """Wait until every observed change has been applied or suppressed."""
+        await self._queue.join()
+
+    def close(self):
+        self._queue.close()
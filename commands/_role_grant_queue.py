@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+import discord
+
+from commands._drain_queue import DrainQueue
+from commands._rate_budget import RateBudget
+
+
+class RoleGrantQueue:
+    """Per-guild queue of role grants and removals.
+
+    submit() records that a member should (or should no longer) have a role;
+    a later submit for the same member and role before it runs replaces the
+    first, so a quick react/unreact costs at most one request. Changes wait in
+    a DrainQueue keyed by guild and are paced by a per-guild RateBudget.
+
+    A change is skipped without a request when the member's cached roles
+    already reflect it and agree with what the queue last sent for that
+    member and role. add_roles/remove_roles don't update the cache, so until
+    the member update arrives the cache alone would skip an unreact that
+    follows a grant. The last `max_tracked` sent changes are remembered.
+    """
+
+    def __init__(self, rate, burst=None, max_tracked=1024):
+        self.rate = rate
+        self.burst = burst
+        self.max_tracked = max_tracked
+        self._queue = DrainQueue(self._apply_one)  # guild id -> {(member id, role id): (guild, grant)}
+        self._budgets = {}  # guild id -> RateBudget
+        self._sent = OrderedDict()  # (guild id, member id, role id) -> grant last sent
+        self.stats = {"submitted": 0, "coalesced": 0, "granted": 0, "removed": 0, "skipped": 0, "errors": 0}
+
+    def submit(self, guild, member_id, role_id, grant):
+        self.stats["submitted"] += 1
+        if self._queue.put(guild.id, (member_id, role_id), (guild, grant)):
+            self.stats["coalesced"] += 1
+
+    async def _apply_one(self, guild_id, key, item):
+        guild, grant = item
+        member, role = guild.get_member(key[0]), guild.get_role(key[1])
+        sent_key = (guild_id, *key)
+        if not member or not role or ((role in member.roles) == grant and self._sent.get(sent_key, grant) == grant):
+            self.stats["skipped"] += 1
+            return
+        budget = self._budgets.get(guild_id)
+        if budget is None:
+            budget = self._budgets[guild_id] = RateBudget(self.rate, self.burst)
+        await budget.acquire()
+        self._sent.pop(sent_key, None)
+        try:
+            if grant:
+                await member.add_roles(role)
+                self.stats["granted"] += 1
+            else:
+                await member.remove_roles(role)
+                self.stats["removed"] += 1
+        except discord.Forbidden:
+            # Bot doesn't have permission to manage this role
+            self.stats["errors"] += 1
+            return
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Reaction Roles: failed to update {member} in {guild.name}: {e}")
+            return
+        self._sent[sent_key] = grant
+        while len(self._sent) > self.max_tracked:
+            self._sent.popitem(last=False)
+
+    async def join(self):
+        """Wait until every submitted change has been sent or skipped."""
+        await self._queue.join()
+
+    def close(self):
+        self._queue.close()
@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from loadnsave import autoroom_load, autoroom_save
+from loadnsave import autoroom_load, autoroom_save, load_view, edit_data
 from ._autoroom_view import RoomControlView
 
 class Autoroom(commands.Cog):
@@ -116,7 +116,7 @@ class Autoroom(commands.Cog):
   async def on_voice_state_update(self, member, before, after):
       server_id = str(member.guild.id)
       user_id = str(member.id)
-      autorooms = await autoroom_load()
+      autorooms = await load_view('autorooms.json')
   
       if server_id not in autorooms:
           return
@@ -142,9 +142,10 @@ class Autoroom(commands.Cog):
 
                   try:
                       new_channel = await guild.create_voice_channel(new_channel_name, category=category, overwrites=overwrites)
-                      autorooms[server_id][user_id] = new_channel.id
+                      async with edit_data('autorooms.json') as data:
+                          data[server_id][user_id] = new_channel.id
+                      autorooms = await load_view('autorooms.json')
                       await member.move_to(new_channel)
-                      await autoroom_save(autorooms)
 
                       # Send Dashboard
                       embed = discord.Embed(
@@ -174,8 +175,8 @@ class Autoroom(commands.Cog):
                   await created_channel.delete()
               except:
                   pass # Already deleted?
-              del autorooms[server_id][user_id]
-              await autoroom_save(autorooms)
+              async with edit_data('autorooms.json') as data:
+                  data[server_id].pop(user_id, None)
 
   @commands.Cog.listener()
   async def on_ready(self):
@@ -2,7 +2,6 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-from playwright.async_api import async_playwright
 import io
 import os
 import urllib.parse
@@ -15,99 +14,57 @@ from commands._codex_embeds import (
 )
 from commands._codex_views import RenderView, OptionsView, SelectionView, CodexView
 from loadnsave import (
-    load_monsters_data, load_deities_data, load_spells_data, load_settings,
+    load_monsters_data, load_deities_data, load_spells_data,
     load_archetype_data, load_pulp_talents_data, load_madness_insane_talent_data,
     load_manias_data, load_phobias_data, load_poisons_data, load_skills_data,
     load_inventions_data, load_years_data, load_weapons_data, load_occupations_data,
     load_player_stats, save_player_stats
 )
-from rapidfuzz import process, fuzz
+from commands._autocomplete import engine as autocomplete
+from commands._codex_index import get_index
+from rapidfuzz import utils
 from dashboard.file_utils import sanitize_filename
+from render_service import RenderError
+
 
 class Codex(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.help_category = "Codex"
-        self.playwright = None
-        self.browser = None
 
     async def cog_load(self):
-        """Initialize Playwright and Browser on Cog Load."""
-        try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch()
-            print("Codex: Playwright browser launched.")
-        except Exception as e:
-            print(f"Codex: Failed to launch Playwright browser: {e}")
-
-    async def cog_unload(self):
-        """Clean up Playwright resources on Cog Unload."""
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
-        print("Codex: Playwright browser closed.")
-
-    async def _get_browser(self):
-        """Ensure a valid browser instance is available."""
-        if self.browser and self.browser.is_connected():
-            return self.browser
-
-        # Re-launch if not connected
-        if self.playwright:
-            await self.playwright.stop()
-
-        try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch()
-            return self.browser
-        except Exception as e:
-            print(f"Codex: Failed to re-launch browser: {e}")
-            raise e
-
-    async def _get_autocomplete_choices(self, current: str, loader_func, data_key=None, flatten_pulp=False, keys_only=False, is_invention=False):
-        """Helper to generate autocomplete choices using RapidFuzz."""
+        # Build the name indexes now rather than on the first keystroke; a
+        # dashboard edit swaps in a new document and its index is rebuilt on use.
+        for loader_func, data_key, flatten_pulp in (
+            (load_monsters_data, "monsters", False), (load_spells_data, "spells", False),
+            (load_deities_data, "deities", False), (load_pulp_talents_data, None, True),
+            (load_archetype_data, None, False), (load_madness_insane_talent_data, None, False),
+            (load_manias_data, None, False), (load_phobias_data, None, False),
+            (load_poisons_data, None, False), (load_skills_data, None, False),
+            (load_inventions_data, None, False), (load_years_data, None, False),
+            (load_weapons_data, None, False), (load_occupations_data, None, False),
+        ):
+            get_index(await loader_func(), data_key, flatten_pulp)
+
+    async def _get_autocomplete_choices(self, interaction: discord.Interaction, current: str, loader_func, data_key=None, flatten_pulp=False, keys_only=False, is_invention=False):
+        """Helper to generate autocomplete choices through the shared autocomplete engine."""
         data = await loader_func()
-        raw_choices = []
-
-        if flatten_pulp:
-             pulp_map = {}
-             for category, talents in data.items():
-                 for t_str in talents:
-                     match = re.match(r'\*\*(.*?)\*\*:\s*(.*)', t_str)
-                     if match:
-                          pulp_map[match.group(1)] = match.group(1)
-             raw_choices = list(pulp_map.keys())
-        elif data_key:
-             items = data.get(data_key, [])
-             if data_key == "monsters": entry_key = "monster_entry"
-             elif data_key == "spells": entry_key = "spell_entry"
-             elif data_key == "deities": entry_key = "deity_entry"
-             else: entry_key = data_key[:-1] + "_entry"
-
-             for item in items:
-                entry = item.get(entry_key)
-                if entry and entry.get('name'):
-                    raw_choices.append(entry['name'])
-        elif keys_only or is_invention:
-             raw_choices = list(data.keys())
-        else:
-             raw_choices = list(data.keys())
+        index = get_index(data, data_key, flatten_pulp)
 
         if not current:
             # Return first 25 sorted alphabetically
-            sorted_choices = sorted(raw_choices)[:25]
+            sorted_choices = index.names[:25]
             if is_invention:
                 return [app_commands.Choice(name=f"{c} ({len(data.get(c, []))} entries)", value=c) for c in sorted_choices]
             return [app_commands.Choice(name=c[:100], value=c[:100]) for c in sorted_choices]
 
-        # Use rapidfuzz to find best matches
-        matches = process.extract(current, raw_choices, scorer=fuzz.WRatio, limit=25)
+        matches = await autocomplete.search(
+            interaction.user.id, interaction.command.name, utils.default_process(current), index.processed, limit=25
+        )
 
         results = []
-        for m in matches:
-            name = m[0]
-            value = m[0]
+        for i, _ in matches:
+            name = value = index.choices[i]
             if is_invention:
                 name = f"{value} ({len(data.get(value, []))} entries)"
             results.append(app_commands.Choice(name=name[:100], value=value[:100]))
@@ -135,35 +92,7 @@ class Codex(commands.Cog):
 
     def _get_entry_data(self, data, name, type_slug, data_key=None, flatten_pulp=False, keys_only=False):
         """Extracts the specific data dictionary for the named entry."""
-        if flatten_pulp:
-             for category, talents in data.items():
-                 for t_str in talents:
-                     match = re.match(r'\*\*(.*?)\*\*:\s*(.*)', t_str)
-                     if match:
-                          t_name = match.group(1)
-                          if t_name == name:
-                              return {"name": t_name, "description": match.group(2), "category": category}
-        elif data_key:
-             items = data.get(data_key, [])
-             entry_key = type_slug + "_entry"
-             if type_slug == "monster": entry_key = "monster_entry"
-             elif type_slug == "spell": entry_key = "spell_entry"
-             elif type_slug == "deity": entry_key = "deity_entry"
-
-             for item in items:
-                entry = item.get(entry_key)
-                if entry and entry.get('name') == name:
-                    return entry
-        elif keys_only:
-             # keys_only implies the data is Dict[Name, Info] or List[Name]
-             if isinstance(data, dict):
-                 return data.get(name)
-        elif type_slug == "invention": # Inventions are Dict[decade, list]
-             return data.get(name)
-        else:
-             # Default dict lookup
-             return data.get(name)
-        return None
+        return get_index(data, data_key, flatten_pulp).get(name)
 
     async def _display_entry(self, interaction: discord.Interaction, name, type_slug, data, ephemeral=False):
         """Generates an Embed and sends it with a view to show the poster."""
@@ -214,39 +143,20 @@ class Codex(commands.Cog):
         # Send a placeholder if using followup, but deferred implies loading state on client side usually.
         # But if we are called from a button that deferred, we are good.
 
-        page = None
         try:
-            settings = load_settings()
-            port = settings.get('dashboard_port', 5000)
-            full_url = f"http://127.0.0.1:{port}{url}"
-
-            browser = await self._get_browser()
-            page = await browser.new_page(viewport={'width': 1100, 'height': 1200})
-
-            try:
-                response = await page.goto(full_url, timeout=10000)
-            except Exception as e:
-                error_text = f"Error: Failed to load internal dashboard URL. Is the dashboard running?"
-                await interaction.followup.send(error_text, ephemeral=True)
-                print(f"Codex Navigation Error: {e}")
-                return
-
-            if not response or not response.ok:
-                status = response.status if response else "Unknown"
-                error_text = f"Error: Failed to find {type_name} '{name}' (Status: {status})."
-                await interaction.followup.send(error_text, ephemeral=True)
-                return
-
-            try:
-                element = await page.wait_for_selector('.coc-sheet, .origin-sheet', timeout=5000)
-            except:
-                element = None
-
-            if not element:
-                screenshot_bytes = await page.screenshot(full_page=True, omit_background=True)
+            screenshot_bytes = await self.bot.render_service.render(
+                url, '.coc-sheet, .origin-sheet', (1100, 1200), full_page=True, omit_background=True
+            )
+        except RenderError as e:
+            if e.status is not None:
+                error_text = f"Error: Failed to find {type_name} '{name}' (Status: {e.status})."
             else:
-                screenshot_bytes = await element.screenshot(omit_background=True)
+                error_text = f"Error: {e}"
+            await interaction.followup.send(error_text, ephemeral=True)
+            print(f"Codex Render Error: {e}")
+            return
 
+        try:
             file = discord.File(io.BytesIO(screenshot_bytes), filename=f"{name.replace(' ', '_')}_{type_name}.png")
 
             await interaction.followup.send(content=f"Here is the poster for **{name}**:", file=file, ephemeral=ephemeral)
@@ -255,30 +165,14 @@ class Codex(commands.Cog):
             error_msg = f"An error occurred while generating the image: {e}"
             await interaction.followup.send(error_msg, ephemeral=True)
             print(f"Codex Error: {e}")
-        finally:
-            if page:
-                try:
-                    await page.close()
-                except:
-                    pass
-
-    def _find_matches(self, query, choices):
-        """Find matches using RapidFuzz."""
-        query_lower = query.lower()
-        exact_match = None
-
-        # Check for exact match first (case-insensitive)
-        for choice in choices:
-            if choice.lower() == query_lower:
-                exact_match = choice
-                break
 
+    def _find_matches(self, query, index):
+        """Find matches in a CodexIndex: a case-insensitive exact match wins outright."""
+        exact_match = index.exact(query)
         if exact_match:
             return [exact_match]
 
-        # Use RapidFuzz for fuzzy matching
-        matches = process.extract(query, choices, scorer=fuzz.WRatio, limit=5, score_cutoff=60)
-        return [m[0] for m in matches]
+        return index.search(query, limit=5, score_cutoff=60)
 
     async def _handle_no_arg_lookup(self, interaction: discord.Interaction, loader_func, type_slug, data_key=None, flatten_pulp=False, keys_only=False, title=None):
         if not title:
@@ -297,34 +191,9 @@ class Codex(commands.Cog):
         # We assume command handler deferred already if needed, or we use response.send_message
 
         data = await loader_func()
+        index = get_index(data, data_key, flatten_pulp)
 
-        choices = []
-        if flatten_pulp:
-            pulp_map = {}
-            for category, talents in data.items():
-                for t_str in talents:
-                    match = re.match(r'\*\*(.*?)\*\*:\s*(.*)', t_str)
-                    if match:
-                        t_name = match.group(1)
-                        pulp_map[t_name] = t_name
-            choices = list(pulp_map.keys())
-        elif data_key:
-            items = data.get(data_key, [])
-            entry_key = type_slug + "_entry"
-            if type_slug == "monster": entry_key = "monster_entry"
-            elif type_slug == "spell": entry_key = "spell_entry"
-            elif type_slug == "deity": entry_key = "deity_entry"
-
-            for item in items:
-                entry = item.get(entry_key)
-                if entry and entry.get('name'):
-                    choices.append(entry['name'])
-        elif keys_only:
-            choices = list(data.keys())
-        else:
-            choices = list(data.keys())
-
-        matches = self._find_matches(name, choices)
+        matches = self._find_matches(name, index)
 
         kwargs = {"ephemeral": True}
 
@@ -337,7 +206,7 @@ class Codex(commands.Cog):
 
         if len(matches) == 1:
             target_name = matches[0]
-            entry_data = self._get_entry_data(data, target_name, type_slug, data_key, flatten_pulp, keys_only)
+            entry_data = index.get(target_name)
 
             if entry_data:
                 await self._display_entry(interaction, target_name, type_slug, entry_data, ephemeral=True)
@@ -377,7 +246,7 @@ class Codex(commands.Cog):
 
     @monster.autocomplete('name')
     async def monster_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_monsters_data, data_key="monsters")
+        return await self._get_autocomplete_choices(interaction, current, load_monsters_data, data_key="monsters")
 
     @app_commands.command(description="✨ Displays a spell.")
     async def spell(self, interaction: discord.Interaction, name: str = None):
@@ -389,7 +258,7 @@ class Codex(commands.Cog):
 
     @spell.autocomplete('name')
     async def spell_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_spells_data, data_key="spells")
+        return await self._get_autocomplete_choices(interaction, current, load_spells_data, data_key="spells")
 
     @app_commands.command(description="⚡ Displays a deity sheet.")
     async def deity(self, interaction: discord.Interaction, name: str = None):
@@ -401,7 +270,7 @@ class Codex(commands.Cog):
 
     @deity.autocomplete('name')
     async def deity_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_deities_data, data_key="deities")
+        return await self._get_autocomplete_choices(interaction, current, load_deities_data, data_key="deities")
 
     @app_commands.command(description="📔 Opens the Codex to view lists of all entries.")
     async def codex(self, interaction: discord.Interaction):
@@ -425,7 +294,7 @@ class Codex(commands.Cog):
 
     @archetype.autocomplete('name')
     async def archetype_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_archetype_data, keys_only=True)
+        return await self._get_autocomplete_choices(interaction, current, load_archetype_data, keys_only=True)
 
     @app_commands.command(name="talent", description="🌟 Displays a Pulp Talent.")
     async def talent(self, interaction: discord.Interaction, name: str = None):
@@ -437,7 +306,7 @@ class Codex(commands.Cog):
 
     @talent.autocomplete('name')
     async def talent_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_pulp_talents_data, flatten_pulp=True)
+        return await self._get_autocomplete_choices(interaction, current, load_pulp_talents_data, flatten_pulp=True)
 
     @app_commands.command(name="insane", description="👁️ Displays an Insane Talent.")
     async def insane(self, interaction: discord.Interaction, name: str = None):
@@ -449,7 +318,7 @@ class Codex(commands.Cog):
 
     @insane.autocomplete('name')
     async def insane_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_madness_insane_talent_data, keys_only=True)
+        return await self._get_autocomplete_choices(interaction, current, load_madness_insane_talent_data, keys_only=True)
 
     @app_commands.command(description="🌪️ Displays a Mania.")
     async def mania(self, interaction: discord.Interaction, name: str = None):
@@ -461,7 +330,7 @@ class Codex(commands.Cog):
 
     @mania.autocomplete('name')
     async def mania_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_manias_data, keys_only=True)
+        return await self._get_autocomplete_choices(interaction, current, load_manias_data, keys_only=True)
 
     @app_commands.command(description="😱 Displays a Phobia.")
     async def phobia(self, interaction: discord.Interaction, name: str = None):
@@ -473,7 +342,7 @@ class Codex(commands.Cog):
 
     @phobia.autocomplete('name')
     async def phobia_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_phobias_data, keys_only=True)
+        return await self._get_autocomplete_choices(interaction, current, load_phobias_data, keys_only=True)
 
     @app_commands.command(name="poison", description="🧪 Displays a Poison.")
     async def poison(self, interaction: discord.Interaction, name: str = None):
@@ -485,7 +354,7 @@ class Codex(commands.Cog):
 
     @poison.autocomplete('name')
     async def poison_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_poisons_data, keys_only=True)
+        return await self._get_autocomplete_choices(interaction, current, load_poisons_data, keys_only=True)
 
     @app_commands.command(name="skill", description="📚 Displays a Skill description.")
     async def skill(self, interaction: discord.Interaction, name: str = None):
@@ -497,7 +366,7 @@ class Codex(commands.Cog):
 
     @skill.autocomplete('name')
     async def skill_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_skills_data, keys_only=True)
+        return await self._get_autocomplete_choices(interaction, current, load_skills_data, keys_only=True)
 
     @app_commands.command(name="invention", description="💡 Displays Inventions for a specific decade (e.g., 1920s).")
     async def invention(self, interaction: discord.Interaction, decade: str = None):
@@ -520,7 +389,7 @@ class Codex(commands.Cog):
 
     @invention.autocomplete('decade')
     async def invention_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_inventions_data, is_invention=True)
+        return await self._get_autocomplete_choices(interaction, current, load_inventions_data, is_invention=True)
 
     @app_commands.command(name="year", description="📅 Displays events for a specific year (e.g., 1920).")
     async def year(self, interaction: discord.Interaction, year: str = None):
@@ -532,7 +401,7 @@ class Codex(commands.Cog):
 
     @year.autocomplete('year')
     async def year_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_years_data, keys_only=True)
+        return await self._get_autocomplete_choices(interaction, current, load_years_data, keys_only=True)
 
     @app_commands.command(name="weapon", description="🔫 Displays a weapon.")
     async def weapon(self, interaction: discord.Interaction, name: str = None):
@@ -544,7 +413,7 @@ class Codex(commands.Cog):
 
     @weapon.autocomplete('name')
     async def weapon_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_weapons_data, keys_only=True)
+        return await self._get_autocomplete_choices(interaction, current, load_weapons_data, keys_only=True)
 
     @app_commands.command(name="occupation", description="🕵️ Displays an occupation.")
     async def occupation(self, interaction: discord.Interaction, name: str = None):
@@ -556,7 +425,7 @@ class Codex(commands.Cog):
 
     @occupation.autocomplete('name')
     async def occupation_autocomplete(self, interaction: discord.Interaction, current: str):
-        return await self._get_autocomplete_choices(current, load_occupations_data, keys_only=True)
+        return await self._get_autocomplete_choices(interaction, current, load_occupations_data, keys_only=True)
 
 async def setup(bot):
     await bot.add_cog(Codex(bot))
@@ -2,12 +2,30 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 from datetime import datetime, timedelta
+import asyncio
+import time
 import pytz
+from commands._rate_budget import RateBudget
 from loadnsave import load_deleter_data, save_deleter_data
 
+# Discord only bulk-deletes messages younger than 14 days; keep a margin so a
+# message can't age past the limit between listing and deleting it.
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+BULK_DELETE_BATCH = 100
+# Shared by every channel sweep: delete requests (bulk or single) per second.
+DELETE_REQUESTS_PER_SECOND = 4
+CHANNEL_CONCURRENCY = 4
+
+
 class Deleter(commands.Cog, name="deleter"):
     def __init__(self, bot):
         self.bot = bot
+        # channel id -> snowflake at or below which every message is already
+        # gone, so the next sweep only lists messages newer than it.
+        self._watermarks = {}
+        self.channel_stats = {}  # channel id (str) -> counters of the latest sweeps
+        self._budget = RateBudget(DELETE_REQUESTS_PER_SECOND)
+        self._channel_slots = asyncio.Semaphore(CHANNEL_CONCURRENCY)
         self.autodelete_task.start()
 
     def cog_unload(self):
@@ -100,20 +118,86 @@ class Deleter(commands.Cog, name="deleter"):
 
     @tasks.loop(minutes=5)
     async def autodelete_task(self):
+        await self.sweep_all()
+
+    async def sweep_all(self):
+        """Sweep every configured channel concurrently."""
         deleter_data = await load_deleter_data()
         now = datetime.now(pytz.utc)
 
+        sweeps = []
         for channel_id, seconds in deleter_data.items():
             try:
                 channel = self.bot.get_channel(int(channel_id))
                 if channel:
-                    threshold_time = now - timedelta(seconds=seconds)
-                    try:
-                        await channel.purge(limit=None, before=threshold_time)
-                    except Exception:
-                        pass # Ignore errors during purge to keep loop running
+                    sweeps.append(self._sweep_limited(channel, seconds, now))
             except Exception as e:
                 print(f"Error in autodelete task: {e}")
+        await asyncio.gather(*sweeps)
+
+    async def _sweep_limited(self, channel, seconds, now):
+        async with self._channel_slots:
+            await self.sweep_channel(channel, seconds, now)
+
+    async def sweep_channel(self, channel, seconds, now):
+        """Delete the messages in `channel` older than `seconds`.
+
+        Only messages between the channel's watermark and the threshold are
+        listed, oldest first: old ones are deleted one by one, the ones young
+        enough for bulk deletion in batches of 100. The watermark follows each
+        deletion, so a sweep cut short by an error resumes where it stopped."""
+        stats = self.channel_stats.setdefault(str(channel.id), {
+            "runs": 0, "total_deleted": 0, "bulk_requests": 0, "single_deletes": 0, "errors": 0,
+        })
+        started = time.perf_counter()
+        threshold = now - timedelta(seconds=seconds)
+        bulk_cutoff = now - BULK_DELETE_MAX_AGE
+        watermark = self._watermarks.get(channel.id)
+        after = discord.Object(id=watermark) if watermark else None
+
+        deleted = 0
+        batch = []
+        try:
+            async for message in channel.history(limit=None, before=threshold, after=after, oldest_first=True):
+                if message.created_at >= bulk_cutoff:
+                    batch.append(message)
+                    if len(batch) == BULK_DELETE_BATCH:
+                        deleted += await self._delete_batch(channel, batch, stats)
+                        batch = []
+                    continue
+                await self._budget.acquire()
+                try:
+                    await message.delete()
+                except discord.NotFound:
+                    pass
+                stats["single_deletes"] += 1
+                deleted += 1
+                self._watermarks[channel.id] = message.id
+            if batch:
+                deleted += await self._delete_batch(channel, batch, stats)
+            # Everything listed was before the threshold, so no message at or
+            # below the first snowflake of that millisecond is left.
+            self._watermarks[channel.id] = discord.utils.time_snowflake(threshold) - 1
+            stats["last_error"] = None
+        except Exception as e:
+            stats["errors"] += 1
+            stats["last_error"] = str(e)
+            print(f"Error auto-deleting in channel {channel.id}: {e}")
+        finally:
+            stats["runs"] += 1
+            stats["incremental"] = after is not None
+            stats["last_run"] = now.timestamp()
+            stats["last_duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            stats["last_deleted"] = deleted
+            stats["total_deleted"] += deleted
+        return deleted
+
+    async def _delete_batch(self, channel, batch, stats):
+        await self._budget.acquire()
+        await channel.delete_messages(batch)
+        stats["bulk_requests"] += 1
+        self._watermarks[channel.id] = batch[-1].id
+        return len(batch)
 
     @autodelete_task.before_loop
     async def before_autodelete_task(self):
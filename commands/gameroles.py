@@ -3,7 +3,18 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Select
 import asyncio
-from loadnsave import load_gamerole_settings, save_gamerole_settings
+from commands._gamerole_index import GuildRoleIndex
+from commands._presence_coalescer import PresenceCoalescer
+from loadnsave import load_gamerole_settings, save_gamerole_settings, mark_dirty
+
+# Seconds between a presence change and the hoisting pass it triggers; changes
+# inside the window share one pass.
+HOIST_DEBOUNCE = 30
+# A member's game changes within this many seconds are applied as one change.
+PRESENCE_SETTLE_SECONDS = 10
+# Per guild: role edits per second, and the burst allowed before pacing.
+ROLE_EDITS_PER_SECOND = 2
+ROLE_EDIT_BURST = 5
 
 # Color presets
 COLOR_PRESETS = {
@@ -46,6 +57,55 @@ class GamerRoles(commands.Cog):
         self.hoist_lock = asyncio.Lock()
         self.settings_cache = {}
         self.cache_lock = asyncio.Lock()
+        self.role_indexes = {}  # guild id -> GuildRoleIndex, built on first use
+        self._hoist_pending = {}  # guild id -> debounced update_hoisting task
+        self.presence = PresenceCoalescer(
+            self.apply_game_change, PRESENCE_SETTLE_SECONDS, ROLE_EDITS_PER_SECOND, ROLE_EDIT_BURST
+        )
+
+    def cog_unload(self):
+        self.presence.close()
+        for task in self._hoist_pending.values():
+            task.cancel()
+        self._hoist_pending.clear()
+
+    def get_role_index(self, guild):
+        index = self.role_indexes.get(guild.id)
+        if index is None:
+            index = self.role_indexes[guild.id] = GuildRoleIndex(guild)
+        return index
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        index = self.role_indexes.get(role.guild.id)
+        if index:
+            index.add(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        index = self.role_indexes.get(after.guild.id)
+        if index and before.name != after.name:
+            index.remove(before)
+            index.add(after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        index = self.role_indexes.get(role.guild.id)
+        if index:
+            index.remove(role)
+            index.counts.pop(role.id, None)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        index = self.role_indexes.get(after.guild.id)
+        if index and before.roles != after.roles:
+            index.members_changed(before.roles, after.roles)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        index = self.role_indexes.get(member.guild.id)
+        if index:
+            index.member_left(member.roles)
 
     async def ensure_cache(self):
         if not self.settings_cache:
@@ -105,6 +165,15 @@ class GamerRoles(commands.Cog):
             emoji_text = "\n".join([f"{k}: {v}" for k, v in activity_emojis.items()])
             embed.add_field(name="Activity Emojis", value=emoji_text, inline=False)
 
+        presence = self.presence.stats.get(interaction.guild.id)
+        if presence:
+            embed.add_field(
+                name="Presence Changes",
+                value=f"{presence['applied']} applied, {presence['suppressed']} suppressed, "
+                      f"{presence['coalesced']} coalesced, {presence['errors']} failed",
+                inline=False
+            )
+
         await interaction.response.send_message(embed=embed)
 
     @gamerole_group.command(name="ignore", description="🚫 Adds an activity to the ignore list.")
@@ -212,28 +281,15 @@ class GamerRoles(commands.Cog):
         if settings is None:
             settings = await self.get_settings(guild.id)
 
-        # 1. Exact current
-        target_name = self.get_role_name_from_settings(settings, activity_name)
-        role = discord.utils.get(guild.roles, name=target_name)
-        if role: return role
+        index = self.get_role_index(guild)
 
-        # 2. Default
-        default_name = f"🎮 {activity_name}"
-        role = discord.utils.get(guild.roles, name=default_name)
-        if role: return role
-
-        # 3. Raw
-        role = discord.utils.get(guild.roles, name=activity_name)
-        if role: return role
+        # 1. Exact current, 2. Default, 3. Raw
+        for name in (self.get_role_name_from_settings(settings, activity_name), f"🎮 {activity_name}", activity_name):
+            role = index.named(guild, name)
+            if role: return role
 
         # 4. Managed Suffix (fallback)
-        managed_ids = settings.get("managed_roles", [])
-        for r_id in managed_ids:
-            r = guild.get_role(int(r_id))
-            if r and r.name.endswith(f" {activity_name}"):
-                return r
-
-        return None
+        return index.managed_for_game(guild, activity_name, settings.get("managed_roles", []))
 
     async def update_hoisting(self, guild, managed_roles):
         """Updates the hoisting status of managed roles."""
@@ -244,7 +300,8 @@ class GamerRoles(commands.Cog):
                 role = guild.get_role(int(r_id))
                 if role:
                     roles.append(role)
-            roles.sort(key=lambda r: len(r.members), reverse=True)
+            index = self.get_role_index(guild)
+            roles.sort(key=index.count, reverse=True)
             top_5 = roles[:5]
             others = roles[5:]
             for role in top_5:
@@ -256,6 +313,18 @@ class GamerRoles(commands.Cog):
                     try: await role.edit(hoist=False, reason="Gamer Roles: Not Top 5")
                     except: pass
 
+    def schedule_hoisting(self, guild):
+        """Runs update_hoisting for `guild` once HOIST_DEBOUNCE seconds from the first request."""
+        if guild.id not in self._hoist_pending:
+            self._hoist_pending[guild.id] = asyncio.create_task(self._hoist_later(guild))
+
+    async def _hoist_later(self, guild):
+        await asyncio.sleep(HOIST_DEBOUNCE)
+        # Requests made while this pass runs get a pass of their own.
+        self._hoist_pending.pop(guild.id, None)
+        settings = await self.get_settings(guild.id)
+        await self.update_hoisting(guild, settings.get("managed_roles", []))
+
     @commands.Cog.listener()
     async def on_presence_update(self, before, after):
         if before.guild is None: return
@@ -266,10 +335,6 @@ class GamerRoles(commands.Cog):
             return
 
         ignored = settings.get("ignored_activities", ["Custom Status"])
-        color_hex = settings.get("color", "#0000FF")
-        color_int = int(color_hex[1:], 16)
-
-        managed_roles = set(settings.get("managed_roles", []))
 
         def get_game_name(activities):
             for act in activities:
@@ -284,7 +349,20 @@ class GamerRoles(commands.Cog):
         if old_game == new_game:
             return
 
+        self.presence.observe(guild, after, old_game, new_game)
+
+    async def apply_game_change(self, guild, member, old_game, new_game):
+        """Moves `member` from `old_game`'s role to `new_game`'s once the change has settled."""
+        settings = await self.get_settings(guild.id)
+        if not settings.get("enabled", False):
+            return
+
+        color_hex = settings.get("color", "#0000FF")
+        color_int = int(color_hex[1:], 16)
+
+        managed_roles = set(settings.get("managed_roles", []))
         settings_changed = False
+        add_role = remove_role = None
 
         # Handle New Game (Add Role)
         if new_game:
@@ -300,6 +378,7 @@ class GamerRoles(commands.Cog):
                         mentionable=False,
                         reason="Gamer Role: Auto Assignment"
                     )
+                    self.get_role_index(guild).add(role)
                 except discord.Forbidden:
                     print(f"Missing permissions to create role in {guild.name}")
                     role = None
@@ -316,31 +395,42 @@ class GamerRoles(commands.Cog):
                     managed_roles.add(str(role.id))
                     settings_changed = True
 
-                if role not in after.roles:
-                    try:
-                        await after.add_roles(role, reason="Gamer Role: Started playing")
-                    except discord.Forbidden:
-                        pass
+                if role not in member.roles:
+                    add_role = role
 
         # Handle Old Game (Remove Role)
+        old_role = None
         if old_game:
-            role = await self.find_role_for_game(guild, old_game, settings)
-            if role and role in after.roles:
+            old_role = await self.find_role_for_game(guild, old_game, settings)
+            if old_role and old_role in member.roles and old_role != add_role:
+                remove_role = old_role
+
+        # One role per request: a full member.edit(roles=...) would revert any
+        # role change made elsewhere that hasn't reached our cache yet.
+        budget = self.presence.budget(guild.id)
+        if add_role:
+            await budget.acquire()
+            try:
+                await member.add_roles(add_role, reason="Gamer Role: Started playing")
+            except discord.Forbidden:
+                pass
+        if remove_role:
+            await budget.acquire()
+            try:
+                await member.remove_roles(remove_role, reason="Gamer Role: Stopped playing")
+            except discord.Forbidden:
+                pass
+
+        # Check cleanup
+        if old_role and old_role != add_role and str(old_role.id) in managed_roles:
+            if self.get_role_index(guild).count(old_role) == 0:
                 try:
-                    await after.remove_roles(role, reason="Gamer Role: Stopped playing")
-                except discord.Forbidden:
+                    await old_role.delete(reason="Gamer Role: Unused")
+                    managed_roles.remove(str(old_role.id))
+                    settings_changed = True
+                except:
                     pass
 
-            # Check cleanup
-            if role and str(role.id) in managed_roles:
-                if len(role.members) == 0:
-                    try:
-                        await role.delete(reason="Gamer Role: Unused")
-                        managed_roles.remove(str(role.id))
-                        settings_changed = True
-                    except:
-                        pass
-
         if settings_changed:
             async with self.cache_lock:
                 await self.ensure_cache()
@@ -348,9 +438,9 @@ class GamerRoles(commands.Cog):
                     self.settings_cache[str(guild.id)] = {}
 
                 self.settings_cache[str(guild.id)]["managed_roles"] = list(managed_roles)
-                await save_gamerole_settings(self.settings_cache)
+                mark_dirty('gamerole_settings.json', guild.id)
 
-        asyncio.create_task(self.update_hoisting(guild, list(managed_roles)))
+        self.schedule_hoisting(guild)
 
     @gamerole_group.command(name="debug_trigger", description="🐞 Debug tool to simulate presence update.")
     @app_commands.checks.has_permissions(administrator=True)
@@ -1,17 +1,27 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from discord.ui import View, Button, Modal, TextInput
 import random
 import asyncio
+import heapq
 import re
 import math
 from datetime import datetime, timedelta, timezone
-from loadnsave import load_giveaway_data, save_giveaway_data, load_karma_stats
+from loadnsave import (
+    load_giveaway_data, load_giveaway_archive, load_karma_stats,
+    mark_dirty, add_save_listener, remove_save_listener,
+)
 
 KARMA_VERIFICATION_HALF_THRESHOLD = 100
 PERCENTAGE_TO_TICKETS_MULTIPLIER = 1000
 
+# Longest single sleep of the deadline scheduler, so a wall-clock jump can
+# delay an ending by at most this long.
+MAX_SCHEDULER_SLEEP = 3600
+# When an automatic ending fails (e.g. nobody has karma yet), try again after this.
+END_RETRY_SECONDS = 60
+
 def calculate_tickets(karma):
     """
     Calculates tickets based on karma.
@@ -95,7 +105,8 @@ class GiveawayCreationModal(Modal, title="Create Giveaway"):
                 "end_time": end_time
             }
 
-            await save_giveaway_data(data)
+            mark_dirty('giveaway_data.json', guild_id)
+            self.cog.schedule_giveaway(guild_id, str(message.id), end_time)
 
             # Confirm to user (edit original response)
             await interaction.edit_original_response(content=f"✅ Giveaway created! [Jump to message]({message.jump_url})")
@@ -119,7 +130,11 @@ class GiveawayView(View):
         data = await load_giveaway_data()
 
         if guild_id not in data or message_id not in data[guild_id]:
-            await interaction.response.send_message("This giveaway no longer exists.", ephemeral=True)
+            archive = await load_giveaway_archive()
+            if message_id in archive.get(guild_id, {}):
+                await interaction.response.send_message("This giveaway has ended.", ephemeral=True)
+            else:
+                await interaction.response.send_message("This giveaway no longer exists.", ephemeral=True)
             return
 
         giveaway = data[guild_id][message_id]
@@ -134,7 +149,7 @@ class GiveawayView(View):
 
         # Add user
         giveaway["participants"].append(user_id)
-        await save_giveaway_data(data)
+        mark_dirty('giveaway_data.json', guild_id)
 
         # Calculate potential tickets
         karma_stats = await load_karma_stats()
@@ -149,42 +164,108 @@ class GiveawayView(View):
 class Giveaway(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Min-heap of (wake_at, guild_id, message_id) for the active
+        # giveaways that have an end time. Ended giveaways live in
+        # giveaway_archive.json and are never indexed. Entries whose
+        # giveaway was ended by hand are dropped when they surface.
+        self._deadlines = []
+        self._indexed = None  # giveaway_data.json document the heap was built from
+        self._wakeup = asyncio.Event()
+        self._scheduler_task = None
 
     # Register persistent view
     async def cog_load(self):
         self.bot.add_view(GiveawayView())
-        self.check_giveaways.start()
+        await self._archive_ended()
+        self._index(await load_giveaway_data())
+        add_save_listener('giveaway_data.json', self._index)
+        self._scheduler_task = asyncio.create_task(self._run_scheduler())
 
     async def cog_unload(self):
-        self.check_giveaways.cancel()
-
-    @tasks.loop(seconds=60)
-    async def check_giveaways(self):
-        try:
-            data = await load_giveaway_data()
-            now = datetime.now(timezone.utc).timestamp()
-
-            # Create a list of targets to avoid modification during iteration issues, though we call a separate function
-            targets = []
-            for guild_id, giveaways in data.items():
-                for message_id, gw in giveaways.items():
-                    end_time = gw.get("end_time")
-                    if gw["status"] == "active" and isinstance(end_time, (int, float)):
-                        if now >= end_time:
-                            targets.append((guild_id, message_id))
-
-            for guild_id, message_id in targets:
-                try:
-                    await self.api_end_giveaway(guild_id, message_id, requester=None)
-                except Exception as inner_e:
-                    print(f"Error ending giveaway {message_id} in guild {guild_id}: {inner_e}")
-
-        except Exception as e:
-            print(f"Error in check_giveaways loop: {e}")
+        remove_save_listener('giveaway_data.json', self._index)
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
 
-    @check_giveaways.before_loop
-    async def before_check_giveaways(self):
+    async def _archive_ended(self):
+        """Move giveaways that ended before the archive existed out of
+        giveaway_data.json."""
+        data = await load_giveaway_data()
+        for guild_id, giveaways in list(data.items()):
+            ended = [m for m, gw in giveaways.items() if gw.get("status") != "active"]
+            for message_id in ended:
+                await self._archive(data, guild_id, message_id)
+
+    async def _archive(self, data, guild_id, message_id):
+        archive = await load_giveaway_archive()
+        giveaways = data[guild_id]
+        archive.setdefault(guild_id, {})[message_id] = giveaways.pop(message_id)
+        if not giveaways:
+            del data[guild_id]
+        mark_dirty('giveaway_data.json', guild_id)
+        mark_dirty('giveaway_archive.json', guild_id)
+
+    def _index(self, data):
+        """Rebuild the deadline heap from the active document. Also the save
+        listener, so giveaways created by the dashboard are scheduled."""
+        self._indexed = data
+        self._deadlines = [
+            (gw["end_time"], guild_id, message_id)
+            for guild_id, giveaways in data.items()
+            for message_id, gw in giveaways.items()
+            if gw.get("status") == "active" and isinstance(gw.get("end_time"), (int, float))
+        ]
+        heapq.heapify(self._deadlines)
+        self._wakeup.set()
+
+    def schedule_giveaway(self, guild_id, message_id, end_time):
+        if not isinstance(end_time, (int, float)):
+            return  # runs until ended by hand
+        if not self._deadlines or end_time < self._deadlines[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._deadlines, (end_time, str(guild_id), str(message_id)))
+
+    async def _run_scheduler(self):
+        """Sleep until the next giveaway deadline (or an earlier giveaway is
+        scheduled), end everything that is due, repeat."""
         await self.bot.wait_until_ready()
+        while True:
+            try:
+                await self._end_due()
+            except Exception as e:
+                print(f"Error in giveaway scheduler: {e}")
+            self._wakeup.clear()
+            timeout = None
+            if self._deadlines:
+                delay = self._deadlines[0][0] - datetime.now(timezone.utc).timestamp()
+                timeout = min(max(delay, 0), MAX_SCHEDULER_SLEEP)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _end_due(self):
+        data = await load_giveaway_data()
+        if data is not self._indexed:
+            self._index(data)
+        now = datetime.now(timezone.utc).timestamp()
+
+        targets = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, guild_id, message_id = heapq.heappop(self._deadlines)
+            gw = data.get(guild_id, {}).get(message_id)
+            if gw is None or gw.get("status") != "active" or (guild_id, message_id) in targets:
+                continue  # ended by hand since it was scheduled
+            targets.append((guild_id, message_id))
+
+        for guild_id, message_id in targets:
+            try:
+                success, msg = await self.api_end_giveaway(guild_id, message_id, requester=None)
+            except Exception as inner_e:
+                success, msg = False, inner_e
+            if not success and message_id in data.get(guild_id, {}):
+                print(f"Error ending giveaway {message_id} in guild {guild_id}: {msg}")
+                heapq.heappush(self._deadlines, (now + END_RETRY_SECONDS, guild_id, message_id))
+        return targets
 
     def parse_duration(self, duration_str):
         if not duration_str or duration_str.lower() in ["forever", "none", "no"]:
@@ -276,7 +357,7 @@ class Giveaway(commands.Cog):
 
     @reroll_giveaway.autocomplete('message_link_or_id')
     async def reroll_autocomplete(self, interaction: discord.Interaction, current: str):
-        data = await load_giveaway_data()
+        data = await load_giveaway_archive()
         guild_id = str(interaction.guild_id)
 
         if guild_id not in data:
@@ -349,6 +430,14 @@ class Giveaway(commands.Cog):
 
     # --- API Methods (Used by Dashboard and Commands) ---
 
+    async def _find_giveaway(self, data, guild_id, message_id):
+        """The giveaway from the active document, else from the archive."""
+        gw = data.get(guild_id, {}).get(message_id)
+        if gw is None:
+            archive = await load_giveaway_archive()
+            gw = archive.get(guild_id, {}).get(message_id)
+        return gw
+
     async def api_end_giveaway(self, guild_id: str, message_id: str, requester=None):
         """
         Ends the giveaway and returns (Success, Message).
@@ -358,11 +447,10 @@ class Giveaway(commands.Cog):
         guild_id = str(guild_id)
         message_id = str(message_id)
 
-        if guild_id not in data or message_id not in data[guild_id]:
+        gw = await self._find_giveaway(data, guild_id, message_id)
+        if gw is None:
             return False, "Giveaway not found."
 
-        gw = data[guild_id][message_id]
-
         # Check permissions
         if requester:
             is_admin = requester.guild_permissions.administrator
@@ -377,7 +465,7 @@ class Giveaway(commands.Cog):
         participants = gw["participants"]
         if not participants:
             gw["status"] = "ended"
-            await save_giveaway_data(data)
+            await self._archive(data, guild_id, message_id)
             return True, "Giveaway ended. No participants."
 
         winner_id = await self.pick_winner(guild_id, participants)
@@ -387,7 +475,7 @@ class Giveaway(commands.Cog):
 
         gw["status"] = "ended"
         gw["winner_id"] = winner_id
-        await save_giveaway_data(data)
+        await self._archive(data, guild_id, message_id)
 
         # Notify
         guild = self.bot.get_guild(int(guild_id))
@@ -424,11 +512,10 @@ class Giveaway(commands.Cog):
         guild_id = str(guild_id)
         message_id = str(message_id)
 
-        if guild_id not in data or message_id not in data[guild_id]:
+        gw = await self._find_giveaway(data, guild_id, message_id)
+        if gw is None:
             return False, "Giveaway not found."
 
-        gw = data[guild_id][message_id]
-
         if requester:
             is_admin = requester.guild_permissions.administrator
             is_creator = str(requester.id) == str(gw["creator_id"])
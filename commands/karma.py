@@ -4,16 +4,37 @@ from discord import app_commands
 import asyncio
 import io
 import urllib.parse
-from playwright.async_api import async_playwright
-from loadnsave import load_karma_settings, load_karma_stats, save_karma_stats, load_settings
+from collections import OrderedDict
+from loadnsave import load_karma_settings, get_karma_channel_settings, load_karma_stats, save_karma_stats, mark_dirty, load_entity
+from render_service import RenderError
 from commands._karma_views import KarmaSetupChannelView, LeaderboardView, KarmaRoleSetupMainView
+from commands._karma_leaderboard import LeaderboardIndex
+
+# Votes on the same member within this window share one role recalculation
+ROLE_UPDATE_DEBOUNCE_SECONDS = 3.0
+# message_id -> author_id entries kept for karma-channel messages
+AUTHOR_CACHE_SIZE = 5000
 
 class Karma(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.leaderboard_index = LeaderboardIndex()
+        self.role_update_delay = ROLE_UPDATE_DEBOUNCE_SECONDS
+        self._pending_role_updates = {}  # (guild_id, user_id) -> task
+        self.role_update_stats = {"votes": 0, "role_checks": 0}
+        self._message_authors = OrderedDict()  # message_id -> author_id, least recently used first
+        self.author_cache_stats = {
+            "lookups": 0,
+            "hits_local": 0,
+            "hits_gateway": 0,
+            "hits_client_cache": 0,
+            "rest_fetches": 0,
+        }
 
     def cog_unload(self):
-        pass
+        for task in self._pending_role_updates.values():
+            task.cancel()
+        self._pending_role_updates.clear()
 
     # Karma Actions Context Menu is deprecated due to 5 globally context menus limit.
     # We will just rely on the slash commands `/karma` and `/memelevel` instead.
@@ -48,31 +69,12 @@ class Karma(commands.Cog):
         return "Unranked"
 
     async def generate_notification_image(self, guild_id, user_id, rank_name, change_type):
-        settings = load_settings()
-        port = settings.get('dashboard_port', 5000)
-
         encoded_rank = urllib.parse.quote(rank_name)
-        url = f"http://127.0.0.1:{port}/render/karma/{guild_id}/{user_id}?rank={encoded_rank}&type={change_type}"
+        path = f"/render/karma/{guild_id}/{user_id}?rank={encoded_rank}&type={change_type}"
 
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch()
-                try:
-                    page = await browser.new_page(viewport={'width': 800, 'height': 400})
-                    await page.goto(url, timeout=10000)
-
-                    try:
-                        element = await page.wait_for_selector('.karma-card', timeout=5000)
-                    except:
-                        element = None
-
-                    if element:
-                        return await element.screenshot()
-                    else:
-                        return await page.screenshot()
-                finally:
-                    await browser.close()
-        except Exception as e:
+            return await self.bot.render_service.render(path, '.karma-card', (800, 400))
+        except RenderError as e:
             print(f"Error generating karma image: {e}")
             return None
 
@@ -84,20 +86,48 @@ class Karma(commands.Cog):
         if guild_id not in stats:
             stats[guild_id] = {}
 
-        current_karma = stats[guild_id].get(user_id, 0)
-        stats[guild_id][user_id] = current_karma + amount
-        await save_karma_stats(stats)
+        guild_stats = stats[guild_id]
+        previous = guild_stats.get(user_id)
+        current_karma = (previous or 0) + amount
+        guild_stats[user_id] = current_karma
+        mark_dirty('karma_stats.json', guild_id)
+        self.leaderboard_index.update(guild_id, guild_stats, user_id, previous, current_karma)
 
-        # Trigger role update
-        guild = self.bot.get_guild(int(guild_id))
-        if guild:
-            member = guild.get_member(int(user_id))
-            if member:
-                settings = await self.get_guild_settings(guild_id)
-                if settings:
-                    await self.update_karma_roles(member, stats[guild_id][user_id], settings)
+        self.role_update_stats["votes"] += 1
+        self._schedule_role_update(guild_id, user_id)
+
+        return current_karma
+
+    def _schedule_role_update(self, guild_id, user_id):
+        """Recalculate the member's threshold role once the debounce window
+        closes; further votes inside the window ride along."""
+        key = (guild_id, user_id)
+        if key not in self._pending_role_updates:
+            self._pending_role_updates[key] = asyncio.create_task(self._debounced_role_update(guild_id, user_id))
 
-        return stats[guild_id][user_id]
+    async def _debounced_role_update(self, guild_id, user_id):
+        try:
+            await asyncio.sleep(self.role_update_delay)
+        finally:
+            # Votes arriving while the role API call is in flight start a new window.
+            self._pending_role_updates.pop((guild_id, user_id), None)
+
+        try:
+            guild = self.bot.get_guild(int(guild_id))
+            if not guild:
+                return
+            member = guild.get_member(int(user_id))
+            if not member:
+                return
+            settings = await self.get_guild_settings(guild_id)
+            if not settings:
+                return
+            stats = await load_karma_stats()
+            karma = stats.get(guild_id, {}).get(user_id, 0)
+            self.role_update_stats["role_checks"] += 1
+            await self.update_karma_roles(member, karma, settings)
+        except Exception as e:
+            print(f"Error applying karma roles for {user_id} in {guild_id}: {e}")
 
     async def update_karma_roles(self, member, karma, settings):
         """
@@ -334,8 +364,7 @@ class Karma(commands.Cog):
         if guild_id not in stats:
             return []
 
-        # Sort users by karma (descending)
-        sorted_users = sorted(stats[guild_id].items(), key=lambda item: item[1], reverse=True)
+        sorted_users = self.leaderboard_index.top(guild_id, stats[guild_id])
 
         results = []
         guild = self.bot.get_guild(int(guild_id))
@@ -400,11 +429,7 @@ class Karma(commands.Cog):
         await self._send_karma_response(interaction, user)
 
     async def _send_karma_response(self, interaction: discord.Interaction, user: discord.User):
-        stats = await load_karma_stats()
-        guild_id = str(interaction.guild_id)
-        user_id = str(user.id)
-
-        karma_score = stats.get(guild_id, {}).get(user_id, 0)
+        karma_score = await load_entity('karma_stats.json', interaction.guild_id, user.id, default=0)
 
         await interaction.response.send_message(f"{user.display_name} has {karma_score} karma.", ephemeral=True)
 
@@ -457,8 +482,7 @@ class Karma(commands.Cog):
             await interaction.response.send_message("No karma stats found for this server.", ephemeral=True)
             return
 
-        # Sort users by karma (descending)
-        sorted_users = sorted(stats[guild_id].items(), key=lambda item: item[1], reverse=True)
+        sorted_users = self.leaderboard_index.top(guild_id, stats[guild_id])
 
         view = LeaderboardView(interaction, sorted_users)
         embed = view.get_embed()
@@ -474,19 +498,69 @@ class Karma(commands.Cog):
         view = KarmaRoleSetupMainView(self.bot, interaction.user)
         await interaction.response.send_message("Select an option to manage Karma Roles:", view=view, ephemeral=True)
 
+    def _remember_author(self, message_id, author_id):
+        cache = self._message_authors
+        cache[message_id] = author_id
+        cache.move_to_end(message_id)
+        while len(cache) > AUTHOR_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    async def _resolve_author_id(self, channel, payload):
+        """Author of the reacted-to message, or None if it no longer exists.
+
+        Tries, in order: our own cache (filled by on_message in the karma
+        channel), the author id the gateway sends with reaction-add events,
+        and discord.py's message cache; only then fetch_message.
+        """
+        stats = self.author_cache_stats
+        stats["lookups"] += 1
+
+        author_id = self._message_authors.get(payload.message_id)
+        if author_id is not None:
+            self._message_authors.move_to_end(payload.message_id)
+            stats["hits_local"] += 1
+            return author_id
+
+        author_id = getattr(payload, "message_author_id", None)
+        if isinstance(author_id, int):
+            stats["hits_gateway"] += 1
+            self._remember_author(payload.message_id, author_id)
+            return author_id
+
+        cached = discord.utils.get(self.bot.cached_messages, id=payload.message_id)
+        if cached is not None:
+            stats["hits_client_cache"] += 1
+            self._remember_author(payload.message_id, cached.author.id)
+            return cached.author.id
+
+        stats["rest_fetches"] += 1
+        try:
+            message = await channel.fetch_message(payload.message_id)
+        except discord.NotFound:
+            return None
+        self._remember_author(payload.message_id, message.author.id)
+        return message.author.id
+
+    def author_cache_metrics(self):
+        """Author-resolution counters for /api/status."""
+        stats = dict(self.author_cache_stats)
+        hits = stats["hits_local"] + stats["hits_gateway"] + stats["hits_client_cache"]
+        stats["cached_authors"] = len(self._message_authors)
+        stats["rest_calls_avoided"] = hits
+        stats["hit_rate"] = round(hits / stats["lookups"], 3) if stats["lookups"] else None
+        stats.update(self.role_update_stats)
+        return stats
+
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
         if payload.user_id == self.bot.user.id:
             return
 
-        settings = await self.get_guild_settings(payload.guild_id)
+        settings = await get_karma_channel_settings(payload.guild_id, payload.channel_id)
         if not settings:
             return
 
-        if payload.channel_id != settings.get("channel_id"):
-            return
-
-        # Fetch the message to check the author
+        # Resolve the message author (cache first) to check for self-votes
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
             return
@@ -495,17 +569,16 @@ class Karma(commands.Cog):
         if not channel:
             return
 
-        try:
-            message = await channel.fetch_message(payload.message_id)
-        except discord.NotFound:
+        author_id = await self._resolve_author_id(channel, payload)
+        if author_id is None:
             return
 
         # Prevent self-voting
-        if message.author.id == payload.user_id:
+        if author_id == payload.user_id:
             try:
                 user = guild.get_member(payload.user_id)
                 if user:
-                    await message.remove_reaction(payload.emoji, user)
+                    await channel.get_partial_message(payload.message_id).remove_reaction(payload.emoji, user)
             except discord.Forbidden:
                 pass
             return
@@ -519,18 +592,26 @@ class Karma(commands.Cog):
             change = -1
 
         if change != 0:
-            await self.update_karma(payload.guild_id, message.author.id, change)
+            await self.update_karma(payload.guild_id, author_id, change)
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
         if payload.user_id == self.bot.user.id:
             return
 
-        settings = await self.get_guild_settings(payload.guild_id)
+        settings = await get_karma_channel_settings(payload.guild_id, payload.channel_id)
         if not settings:
             return
 
-        if payload.channel_id != settings.get("channel_id"):
+        emoji_str = str(payload.emoji)
+
+        change = 0
+        if emoji_str == settings.get("upvote_emoji"):
+            change = -1 # Revert upvote
+        elif emoji_str == settings.get("downvote_emoji"):
+            change = 1 # Revert downvote
+
+        if change == 0:
             return
 
         guild = self.bot.get_guild(payload.guild_id)
@@ -538,24 +619,11 @@ class Karma(commands.Cog):
         channel = guild.get_channel(payload.channel_id)
         if not channel: return
 
-        try:
-            message = await channel.fetch_message(payload.message_id)
-        except discord.NotFound:
-            return
-
-        if message.author.id == payload.user_id:
+        author_id = await self._resolve_author_id(channel, payload)
+        if author_id is None or author_id == payload.user_id:
             return
 
-        emoji_str = str(payload.emoji)
-
-        change = 0
-        if emoji_str == settings.get("upvote_emoji"):
-            change = -1 # Revert upvote
-        elif emoji_str == settings.get("downvote_emoji"):
-            change = 1 # Revert downvote
-
-        if change != 0:
-            await self.update_karma(payload.guild_id, message.author.id, change)
+        await self.update_karma(payload.guild_id, author_id, change)
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -565,16 +633,16 @@ class Karma(commands.Cog):
         if not message.guild:
             return
 
-        settings = await self.get_guild_settings(message.guild.id)
+        settings = await get_karma_channel_settings(message.guild.id, message.channel.id)
         if not settings:
             return
 
-        if message.channel.id == settings.get("channel_id"):
-            try:
-                await message.add_reaction(settings.get("upvote_emoji"))
-                await message.add_reaction(settings.get("downvote_emoji"))
-            except discord.HTTPException:
-                pass
+        self._remember_author(message.id, message.author.id)
+        try:
+            await message.add_reaction(settings.get("upvote_emoji"))
+            await message.add_reaction(settings.get("downvote_emoji"))
+        except discord.HTTPException:
+            pass
 
 async def setup(bot):
     await bot.add_cog(Karma(bot))
@@ -1,11 +1,12 @@
 import datetime
+import json
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 import asyncio
 import os
 import time
-import yt_dlp
+from lazy_imports import lazy_import
 import random
 from functools import partial
 from dashboard.state import guild_mixers, server_volumes
@@ -15,7 +16,10 @@ from loadnsave import (
     load_server_volumes, save_server_volumes,
     load_music_favorites, save_music_favorites,
 )
-from commands._music_view import MusicView, _fmt_duration, _pct_to_vol, _vol_to_pct
+from commands._music_view import MusicView, dashboard_embed, _fmt_duration, _pct_to_vol, _vol_to_pct
+from commands._edit_scheduler import EditScheduler
+
+yt_dlp = lazy_import("yt_dlp")
 
 # ── yt-dlp options ────────────────────────────────────────────────────────────
 
@@ -174,7 +178,7 @@ class MusicLookupError(Exception):
     caller sends str(exc) to the user unmodified, with no '❌ Unexpected error' prefix."""
 
 
-def _format_download_error(e: yt_dlp.utils.DownloadError) -> tuple[str | None, discord.Embed | None, discord.ui.View | None, bool]:
+def _format_download_error(e: "yt_dlp.utils.DownloadError") -> tuple[str | None, discord.Embed | None, discord.ui.View | None, bool]:
     """Map a yt-dlp DownloadError to (content, embed, view, ephemeral) for an interaction
     response/followup/message-edit — matches /play's DownloadError branches exactly."""
     err = str(e)
@@ -295,6 +299,10 @@ class Music(commands.Cog):
         # guild_id (str) → "off" | "track" | "queue"
         self.loop_mode: dict[str, str] = {}
 
+        # Background dashboard edits: one pending edit per message, channels
+        # edited concurrently, unchanged dashboards skipped.
+        self._dashboard_edits = EditScheduler(on_missing=self._drop_dashboard)
+
         self.bot.music_cog = self
 
         self._idle_disconnect.start()
@@ -303,6 +311,7 @@ class Music(commands.Cog):
     def cog_unload(self):
         self._idle_disconnect.cancel()
         self._refresh_dashboards.cancel()
+        self._dashboard_edits.close()
 
     # ── Background tasks ──────────────────────────────────────────────────────
 
@@ -347,18 +356,7 @@ class Music(commands.Cog):
                 continue
             if not track.metadata.get('duration'):
                 continue
-            try:
-                view = MusicView(self, guild_id)
-                embed = view.get_embed()
-                await msg.edit(embed=embed, view=view)
-            except discord.NotFound:
-                self.dashboard_messages.pop(guild_id, None)
-            except discord.HTTPException:
-                pass
-            except Exception:
-                pass
-            # Small delay between guilds to stay under rate limits
-            await asyncio.sleep(0.5)
+            self._schedule_dashboard_edit(guild_id, msg)
 
     @_refresh_dashboards.before_loop
     async def _before_refresh(self):
@@ -412,6 +410,7 @@ class Music(commands.Cog):
         embed = view.get_embed()
 
         if old_msg:
+            self._dashboard_edits.forget(old_msg)
             try:
                 await old_msg.edit(embed=embed, view=view)
             except discord.NotFound:
@@ -620,18 +619,30 @@ class Music(commands.Cog):
         await self._update_dashboard_for_guild(guild_id)
 
     async def _update_dashboard_for_guild(self, guild_id: str):
-        """Edit the existing dashboard message if one exists."""
+        """Queue an edit of the existing dashboard message if one exists."""
         msg = self.dashboard_messages.get(guild_id)
-        if not msg:
-            return
-        try:
-            view = MusicView(self, guild_id)
-            embed = view.get_embed()
-            await msg.edit(embed=embed, view=view)
-        except discord.NotFound:
-            self.dashboard_messages.pop(guild_id, None)
-        except Exception:
-            pass
+        if msg:
+            self._schedule_dashboard_edit(guild_id, msg)
+
+    def _schedule_dashboard_edit(self, guild_id: str, msg: discord.Message):
+        """Hand the dashboard to the edit scheduler; it is rendered when the
+        edit actually runs, so coalesced updates always show the latest state."""
+        def render():
+            embed = dashboard_embed(self, guild_id)
+            track = self.current_track.get(guild_id)
+            buttons = (
+                bool(track and not track.finished), bool(track and track.paused),
+                self.loop_mode.get(guild_id, "off"), len(self.queue.get(guild_id, [])),
+            )
+            signature = (json.dumps(embed.to_dict(), sort_keys=True, default=str), buttons)
+            return signature, lambda: {"embed": embed, "view": MusicView(self, guild_id)}
+        self._dashboard_edits.submit(msg, render)
+
+    def _drop_dashboard(self, msg: discord.Message):
+        """EditScheduler callback: the dashboard message was deleted."""
+        for guild_id, dashboard in list(self.dashboard_messages.items()):
+            if dashboard is msg:
+                self.dashboard_messages.pop(guild_id, None)
 
     async def _seek(self, guild_id: str, target_seconds: float) -> discord.Embed:
         """Seek the currently playing track to target_seconds (already resolved to absolute
@@ -665,6 +676,7 @@ class Music(commands.Cog):
         embed = view.get_embed()
 
         if msg:
+            self._dashboard_edits.forget(msg)
             try:
                 await msg.edit(embed=embed, view=view)
                 if interaction and not interaction.response.is_done():
@@ -2,12 +2,14 @@ import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 import aiohttp
-from bs4 import BeautifulSoup
+from lazy_imports import lazy_import
 import datetime
 import asyncio
 import logging
 from loadnsave import load_pogo_settings, save_pogo_settings, load_pogo_events, save_pogo_events
 
+bs4 = lazy_import("bs4")
+
 logger = logging.getLogger("commands.pogo")
 
 class PokemonGo(commands.Cog):
@@ -59,7 +61,7 @@ class PokemonGo(commands.Cog):
         self.weekly_summary_task.cancel()
 
     def _parse_leekduck_html(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = bs4.BeautifulSoup(html, 'html.parser')
         events = []
 
         # LeekDuck uses data attributes for sorting and dates
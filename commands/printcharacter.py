@@ -2,9 +2,9 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-from playwright.async_api import async_playwright
 import io
-from loadnsave import load_player_stats, load_settings
+from loadnsave import load_player_stats
+from render_service import RenderError
 
 class PrintCharacter(commands.Cog):
     def __init__(self, bot):
@@ -55,53 +55,22 @@ class PrintCharacter(commands.Cog):
         # Notify user we are working on it
         msg = await interaction.followup.send(f"Generating character sheet for {user.display_name}... 🖼️", wait=True)
 
-        # Get dashboard port
-        settings = load_settings()
-        port = settings.get('dashboard_port', 5000)
-
-        # Local URL
-        url = f"http://127.0.0.1:{port}/render/character/{guild_id}/{user_id}"
-
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch()
-                try:
-                    # Set viewport size to ensure good resolution/layout if needed,
-                    # though we screenshot the element.
-                    page = await browser.new_page(viewport={'width': 1000, 'height': 1200})
-
-                    # Navigate
-                    try:
-                        response = await page.goto(url, timeout=10000) # 10s timeout
-                    except Exception as e:
-                        await msg.edit(content=f"Error: Failed to load internal dashboard URL. Is the dashboard running?")
-                        print(f"PrintCharacter Navigation Error: {e}")
-                        return
-
-                    if not response or not response.ok:
-                        status = response.status if response else "Unknown"
-                        await msg.edit(content=f"Error: Failed to load character sheet (Status: {status}).")
-                        return
-
-                    # Wait for element to be visible
-                    try:
-                        element = await page.wait_for_selector('.coc-sheet', timeout=5000)
-                    except:
-                        element = None
-
-                    if not element:
-                        # Fallback to full page if element not found
-                        screenshot_bytes = await page.screenshot(full_page=True)
-                    else:
-                        screenshot_bytes = await element.screenshot()
-
-                    # Send
-                    file = discord.File(io.BytesIO(screenshot_bytes), filename=f"{user.display_name}_sheet.png")
-                    await interaction.followup.send(content=f"Here is the character sheet for {user.mention}:", file=file)
-                    await msg.delete()
-                finally:
-                    await browser.close()
+            screenshot_bytes = await self.bot.render_service.render(
+                f"/render/character/{guild_id}/{user_id}", '.coc-sheet', (1000, 1200), full_page=True
+            )
+        except RenderError as e:
+            if e.status is not None:
+                await msg.edit(content=f"Error: Failed to load character sheet (Status: {e.status}).")
+            else:
+                await msg.edit(content=f"Error: {e}")
+            print(f"PrintCharacter Render Error: {e}")
+            return
 
+        try:
+            file = discord.File(io.BytesIO(screenshot_bytes), filename=f"{user.display_name}_sheet.png")
+            await interaction.followup.send(content=f"Here is the character sheet for {user.mention}:", file=file)
+            await msg.delete()
         except Exception as e:
             try:
                 await msg.edit(content=f"An error occurred while generating the image: {e}")
@@ -2,11 +2,51 @@ import re
 import discord
 from discord.ext import commands
 from discord import app_commands
-from loadnsave import load_reaction_roles, save_reaction_roles
+from commands._role_grant_queue import RoleGrantQueue
+from loadnsave import load_reaction_roles, save_reaction_roles, add_save_listener, remove_save_listener
+
+# Per guild: role grants/removals per second, and the burst allowed before pacing.
+ROLE_GRANTS_PER_SECOND = 2
+ROLE_GRANT_BURST = 10
 
 class ReactionRoles(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Compiled from reaction_roles.json: (message id, emoji) -> role id,
+        # plus the set of message ids so other reactions are dropped at once.
+        self.routes = {}
+        self.routed_messages = set()
+        self._routed = None  # the document the table was compiled from
+        self.grants = RoleGrantQueue(ROLE_GRANTS_PER_SECOND, ROLE_GRANT_BURST)
+
+    async def cog_load(self):
+        self.compile_routes(await load_reaction_roles())
+        add_save_listener('reaction_roles.json', self.compile_routes)
+
+    def cog_unload(self):
+        remove_save_listener('reaction_roles.json', self.compile_routes)
+        self.grants.close()
+
+    def compile_routes(self, data):
+        routes = {}
+        for messages in data.values():
+            for message_id, message_data in messages.items():
+                # Old format is a bare {emoji: role_id} dict
+                roles = message_data["roles"] if "roles" in message_data else message_data
+                for emoji_str, role_id in roles.items():
+                    try:
+                        routes[(int(message_id), emoji_str)] = int(role_id)
+                    except (TypeError, ValueError):
+                        pass
+        self.routes = routes
+        self.routed_messages = {message_id for message_id, _ in routes}
+        self._routed = data
+
+    async def _current_routes(self):
+        """Recompiles the table if the document was reloaded behind our back."""
+        data = await load_reaction_roles()
+        if data is not self._routed:
+            self.compile_routes(data)
 
     async def add_reaction_role(self, guild_id, message_id, emoji_str, role_id, channel_id=None):
         data = await load_reaction_roles()
@@ -135,64 +175,27 @@ class ReactionRoles(commands.Cog):
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
-        if payload.user_id == self.bot.user.id:
-            return
-
-        data = await load_reaction_roles()
-        guild_id = str(payload.guild_id)
-        message_id = str(payload.message_id)
-        emoji_str = str(payload.emoji)
-
-        if guild_id in data and message_id in data[guild_id]:
-            message_data = data[guild_id][message_id]
-            roles = {}
-            if "roles" in message_data:
-                roles = message_data["roles"]
-            else:
-                roles = message_data
-
-            if emoji_str in roles:
-                role_id = int(roles[emoji_str])
-                guild = self.bot.get_guild(payload.guild_id)
-                if guild:
-                    role = guild.get_role(role_id)
-                    member = guild.get_member(payload.user_id)
-                    if role and member:
-                        try:
-                            await member.add_roles(role)
-                        except discord.Forbidden:
-                            # Bot doesn't have permission to add role
-                            pass
+        await self._route(payload, grant=True)
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
+        await self._route(payload, grant=False)
+
+    async def _route(self, payload, grant):
         if payload.user_id == self.bot.user.id:
             return
 
-        data = await load_reaction_roles()
-        guild_id = str(payload.guild_id)
-        message_id = str(payload.message_id)
-        emoji_str = str(payload.emoji)
-
-        if guild_id in data and message_id in data[guild_id]:
-            message_data = data[guild_id][message_id]
-            roles = {}
-            if "roles" in message_data:
-                roles = message_data["roles"]
-            else:
-                roles = message_data
-
-            if emoji_str in roles:
-                role_id = int(roles[emoji_str])
-                guild = self.bot.get_guild(payload.guild_id)
-                if guild:
-                    role = guild.get_role(role_id)
-                    member = guild.get_member(payload.user_id)
-                    if role and member:
-                        try:
-                            await member.remove_roles(role)
-                        except discord.Forbidden:
-                            pass
+        await self._current_routes()
+        if payload.message_id not in self.routed_messages:
+            return
+
+        role_id = self.routes.get((payload.message_id, str(payload.emoji)))
+        if role_id is None:
+            return
+
+        guild = self.bot.get_guild(payload.guild_id)
+        if guild:
+            self.grants.submit(guild, payload.user_id, role_id, grant)
 
 async def setup(bot):
     await bot.add_cog(ReactionRoles(bot))
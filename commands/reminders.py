@@ -1,11 +1,18 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from discord import ui
 import asyncio
+import heapq
+import itertools
 import re
 from datetime import datetime, timedelta, timezone
-from loadnsave import load_reminder_data, save_reminder_data
+from loadnsave import load_reminder_data, mark_dirty, add_save_listener, remove_save_listener
+
+# Longest single sleep of the scheduler. Sleeps are measured on the event
+# loop's monotonic clock, so this bounds how late a reminder can be after the
+# wall clock jumps (NTP step, host suspend).
+MAX_SCHEDULER_SLEEP = 3600
 
 class ReminderDeleteSelect(ui.Select):
     def __init__(self, reminders):
@@ -144,9 +151,17 @@ class ReminderContextMenuModal(discord.ui.Modal, title="Set Reminder"):
 class Reminders(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.reminders = {} # guild_id -> list of reminders
+        self.reminders = {} # guild_id -> list of reminders (the live reminder_data.json document)
         self.help_category = "Player"
 
+        # Min-heap of (due_timestamp, seq, guild_id, reminder). Deleting a
+        # reminder leaves its entry behind; _fire_due() skips entries whose
+        # reminder is no longer in the document.
+        self._schedule = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._scheduler_task = None
+
         # Register Context Menu
         self.ctx_menu = app_commands.ContextMenu(
             name='⏰ Remind Me',
@@ -156,49 +171,93 @@ class Reminders(commands.Cog):
         self.bot.tree.add_command(self.ctx_menu)
 
     async def cog_load(self):
-        self.reminders = await load_reminder_data()
-        self.check_reminders.start()
+        self._adopt(await load_reminder_data())
+        add_save_listener('reminder_data.json', self._adopt)
+        self._scheduler_task = asyncio.create_task(self._run_scheduler())
 
     def cog_unload(self):
-        self.check_reminders.cancel()
+        remove_save_listener('reminder_data.json', self._adopt)
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
         self.bot.tree.remove_command(self.ctx_menu.name, type=self.ctx_menu.type)
 
     async def remind_me_context(self, interaction: discord.Interaction, message: discord.Message):
         modal = ReminderContextMenuModal(self, message)
         await interaction.response.send_modal(modal)
 
-    @tasks.loop(seconds=30)
-    async def check_reminders(self):
-        # Current UTC timestamp
+    def _adopt(self, data):
+        """Take `data` as the reminder document and rebuild the schedule.
+        Also the save listener, so a save_reminder_data() elsewhere is seen."""
+        self.reminders = data
+        self._schedule = [
+            (r['due_timestamp'], next(self._seq), guild_id, r)
+            for guild_id, items in data.items() for r in items
+        ]
+        heapq.heapify(self._schedule)
+        self._wakeup.set()
+
+    async def _document(self):
+        """The live reminder document, re-adopted if it was reloaded."""
+        data = await load_reminder_data()
+        if data is not self.reminders:
+            self._adopt(data)
+        return data
+
+    def _schedule_reminder(self, guild_id, reminder):
+        due = reminder['due_timestamp']
+        if not self._schedule or due < self._schedule[0][0]:
+            self._wakeup.set()  # earlier than what the scheduler sleeps for
+        heapq.heappush(self._schedule, (due, next(self._seq), guild_id, reminder))
+
+    async def _run_scheduler(self):
+        """Sleep until the earliest reminder is due (or a new earlier one is
+        scheduled), deliver everything due, repeat."""
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                await self._fire_due()
+            except Exception as e:
+                print(f"Reminder scheduler error: {e}")
+            self._wakeup.clear()
+            timeout = None
+            if self._schedule:
+                delay = self._schedule[0][0] - datetime.now(timezone.utc).timestamp()
+                timeout = min(max(delay, 0), MAX_SCHEDULER_SLEEP)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire_due(self):
+        """Remove every due reminder from the document, mark only the guilds
+        they came from dirty, then deliver them concurrently."""
+        data = await self._document()
         now = datetime.now(timezone.utc).timestamp()
-        changed = False
-
-        # Iterate copy of keys to avoid modification issues
-        for guild_id in list(self.reminders.keys()):
-            items = self.reminders[guild_id]
-            to_remove = []
-
-            for reminder in items:
-                if reminder['due_timestamp'] <= now:
-                    # Trigger reminder
-                    await self.send_reminder(reminder)
-                    to_remove.append(reminder)
-                    changed = True
 
-            if to_remove:
-                # Remove triggered reminders from list
-                self.reminders[guild_id] = [r for r in items if r not in to_remove]
-
-                # Cleanup empty guilds
-                if not self.reminders[guild_id]:
-                    del self.reminders[guild_id]
-
-        if changed:
-            await save_reminder_data(self.reminders)
+        due_by_guild = {}
+        while self._schedule and self._schedule[0][0] <= now:
+            _, _, guild_id, reminder = heapq.heappop(self._schedule)
+            due_by_guild.setdefault(guild_id, []).append(reminder)
+
+        fired = []
+        for guild_id, candidates in due_by_guild.items():
+            items = data.get(guild_id, [])
+            live = {id(r) for r in items}
+            due = [r for r in candidates if id(r) in live]
+            if not due:
+                continue  # deleted before they came due
+            due_ids = {id(r) for r in due}
+            remaining = [r for r in items if id(r) not in due_ids]
+            if remaining:
+                data[guild_id] = remaining
+            else:
+                del data[guild_id]
+            mark_dirty('reminder_data.json', guild_id)
+            fired.extend(due)
 
-    @check_reminders.before_loop
-    async def before_check_reminders(self):
-        await self.bot.wait_until_ready()
+        if fired:
+            await asyncio.gather(*(self.send_reminder(r) for r in fired))
+        return fired
 
     async def send_reminder(self, reminder):
         try:
@@ -370,9 +429,7 @@ class Reminders(commands.Cog):
     # API Methods
     async def create_reminder_api(self, guild_id, channel_id, user_id, message, seconds):
         due_time = datetime.now(timezone.utc).timestamp() + seconds
-
-        if str(guild_id) not in self.reminders:
-            self.reminders[str(guild_id)] = []
+        data = await self._document()
 
         reminder = {
             "id": str(int(datetime.now(timezone.utc).timestamp() * 1000)),
@@ -383,18 +440,21 @@ class Reminders(commands.Cog):
             "created_at": datetime.now(timezone.utc).timestamp()
         }
 
-        self.reminders[str(guild_id)].append(reminder)
-        await save_reminder_data(self.reminders)
+        data.setdefault(str(guild_id), []).append(reminder)
+        mark_dirty('reminder_data.json', guild_id)
+        self._schedule_reminder(str(guild_id), reminder)
 
         return True, reminder
 
     async def delete_reminder_api(self, guild_id, reminder_id):
-        if str(guild_id) in self.reminders:
-            original_len = len(self.reminders[str(guild_id)])
-            self.reminders[str(guild_id)] = [r for r in self.reminders[str(guild_id)] if r.get('id') != reminder_id]
-
-            if len(self.reminders[str(guild_id)]) < original_len:
-                await save_reminder_data(self.reminders)
+        data = await self._document()
+        if str(guild_id) in data:
+            original_len = len(data[str(guild_id)])
+            data[str(guild_id)] = [r for r in data[str(guild_id)] if r.get('id') != reminder_id]
+
+            if len(data[str(guild_id)]) < original_len:
+                # The heap entry stays behind and is skipped when it comes due.
+                mark_dirty('reminder_data.json', guild_id)
                 return True, "Deleted"
 
         return False, "Not found"
@@ -6,13 +6,14 @@ from discord import app_commands
 from discord.ui import View
 from loadnsave import (
     load_player_stats,
-    save_player_stats,
+    load_entity,
+    mark_dirty,
     load_session_data,
     save_session_data,
     load_luck_stats,
     load_skills_data,
     load_skill_sound_settings,
-    load_server_volumes
+    load_view
 )
 from emojis import get_health_bar
 from support_functions import session_success, MockContext
@@ -154,13 +155,11 @@ class Roll(commands.Cog):
         server_id = str(interaction.guild_id)
         target_id = str(member.id)
 
-        player_stats = await load_player_stats()
+        char_data = await load_entity('player_stats.json', server_id, target_id)
 
-        if server_id not in player_stats or target_id not in player_stats[server_id]:
+        if char_data is None:
             return await interaction.followup.send(f"{member.display_name} has no investigator.", ephemeral=True)
 
-        char_data = player_stats[server_id][target_id]
-
         view = View(timeout=60)
         view.add_item(QuickSkillSelect(char_data, server_id, target_id))
 
@@ -377,7 +376,7 @@ class Roll(commands.Cog):
                                      if vc.is_playing(): vc.stop()
                                      source = discord.PCMVolumeTransformer(mixer, volume=1.0)
                                      vc.play(source)
-                                 volumes = await load_server_volumes()
+                                 volumes = await load_view('server_volumes.json')
                                  vol_data = volumes.get(server_id, {'music': 1.0, 'soundboard': 0.5})
                                  sb_vol = vol_data.get('soundboard', 0.5)
                                  mixer.add_track(full_path, volume=sb_vol, loop=False, metadata={'type': 'soundboard', 'trigger': 'roll'})
@@ -415,7 +414,8 @@ class Roll(commands.Cog):
             embed = discord.Embed(description=description, color=color)
             view.message = await send_msg(embed=embed, view=view)
             await view.wait()
-            await save_player_stats(player_stats)
+            # Only a luck spend changes the sheet here; let the flusher coalesce it.
+            mark_dirty('player_stats.json', server_id)
 
             if view.success:
                  session_data = await load_session_data()
@@ -442,12 +442,10 @@ class Roll(commands.Cog):
     async def skill_autocomplete(self, interaction: discord.Interaction, current: str):
         server_id = str(interaction.guild_id)
         user_id = str(interaction.user.id)
-        player_stats = await load_player_stats()
+        stats = await load_entity('player_stats.json', server_id, user_id)
 
-        if server_id not in player_stats or user_id not in player_stats[server_id]:
+        if stats is None:
             return [app_commands.Choice(name="No character found — use /newinvestigator", value="")]
-
-        stats = player_stats[server_id][user_id]
         ignored_keys = {
             "NAME", "Name", "Residence", "Occupation", "Game Mode",
             "Archetype", "Archetype Info", "Backstory", "Custom Emojis",
@@ -476,11 +474,10 @@ class Roll(commands.Cog):
     async def roll_autocomplete(self, interaction: discord.Interaction, current: str):
         server_id = str(interaction.guild_id)
         user_id = str(interaction.user.id)
-        player_stats = await load_player_stats()
+        stats = await load_entity('player_stats.json', server_id, user_id)
 
         choices = []
-        if server_id in player_stats and user_id in player_stats[server_id]:
-            stats = player_stats[server_id][user_id]
+        if stats is not None:
             valid_stats = []
             # Keys to exclude from rolling
             ignored_keys = [
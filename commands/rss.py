@@ -1,13 +1,22 @@
 import re
+import hashlib
 import datetime
 import discord
-import feedparser
 import asyncio
 from discord.ext import commands, tasks
 from discord import app_commands
 from discord.ui import View, Select, Modal, TextInput, Button
 from loadnsave import load_rss_data, save_rss_data
-from rss_utils import get_youtube_rss_url
+from rss_utils import get_youtube_rss_url, FeedFetcher, FeedScheduler
+
+# How often the cog checks which feeds are due; each feed's own interval is
+# decided by FeedScheduler.
+SCHEDULER_TICK_SECONDS = 30
+
+# Each subscription remembers short hashes of the entry IDs it has already
+# seen, newest first; never fewer than the feed currently carries.
+SEEN_WINDOW = 200
+SEEN_KEY_LENGTH = 16
 
 # Predefined colors for the selector
 COLORS = {
@@ -48,15 +57,15 @@ class RSSLinkModal(Modal, title="RSS Setup - Step 1"):
 
         # Validate Link
         try:
-            rss_link = await get_youtube_rss_url(link)
+            rss_link = await get_youtube_rss_url(link, session=self.cog.fetcher.get_session())
             if rss_link:
                 link = rss_link
         except Exception:
             pass
 
         # Test parse
-        feed = await self.cog.bot.loop.run_in_executor(None, feedparser.parse, link)
-        if not feed.entries and (not hasattr(feed, 'feed') or not feed.feed.get('title')):
+        feed = await self.cog.fetch_feed(link)
+        if feed is None or not feed.entries and (not hasattr(feed, 'feed') or not feed.feed.get('title')):
              await interaction.response.send_message("❌ Could not parse RSS feed or feed is invalid/empty. Please check the link.", ephemeral=True)
              return
 
@@ -213,16 +222,21 @@ class rss(commands.Cog):
 
   def __init__(self, bot):
     self.bot = bot
+    # One aiohttp session + feedparser pool shared by every poll and command.
+    self.fetcher = FeedFetcher()
+    self.scheduler = FeedScheduler()
     self.check_rss_feed.start()
 
+  async def cog_unload(self):
+      self.check_rss_feed.cancel()
+      await self.fetcher.close()
+
   async def fetch_feed(self, link):
-      """Helper to fetch a single feed safely."""
-      try:
-          feed = await self.bot.loop.run_in_executor(None, feedparser.parse, link)
-          return link, feed
-      except Exception as e:
-          print(f"Error fetching feed {link}: {e}")
-          return link, None
+      """Fetch and parse a single feed unconditionally; None on failure."""
+      result = await self.fetcher.fetch(link)
+      if result["error"]:
+          print(f"Error fetching feed {link}: {result['error']}")
+      return result["feed"]
 
   def get_entry_id(self, entry):
       # Try id (guid), then link, then title
@@ -255,15 +269,16 @@ class rss(commands.Cog):
                   return enclosure['href']
       return None
 
-  def _create_rss_embed(self, entry, feed_title, color_hex):
-      # Parse color
+  def _parse_color(self, color_hex):
       try:
           if color_hex.startswith('#'):
-              color_val = int(color_hex[1:], 16)
-          else:
-              color_val = int(color_hex, 16)
+              return int(color_hex[1:], 16)
+          return int(color_hex, 16)
       except:
-          color_val = 0x2E8B57 # Default SeaGreen
+          return 0x2E8B57 # Default SeaGreen
+
+  def _create_rss_embed(self, entry, feed_title, color_hex):
+      color_val = self._parse_color(color_hex)
 
       # Strip HTML from summary for description
       raw_summary = getattr(entry, 'summary', None) or getattr(entry, 'description', None) or ''
@@ -301,13 +316,13 @@ class rss(commands.Cog):
       await interaction.response.defer()
       try:
           # Check for YouTube RSS
-          rss_link = await get_youtube_rss_url(link)
+          rss_link = await get_youtube_rss_url(link, session=self.fetcher.get_session())
           if rss_link:
               link = rss_link
 
           # Parse the RSS feed
-          feed = await self.bot.loop.run_in_executor(None, feedparser.parse, link)
-          if not feed.entries and (not hasattr(feed, 'feed') or not feed.feed.get('title')):
+          feed = await self.fetch_feed(link)
+          if feed is None or not feed.entries and (not hasattr(feed, 'feed') or not feed.feed.get('title')):
               await interaction.followup.send("❌ No items found in the RSS feed or invalid link.", ephemeral=True)
               return
 
@@ -373,7 +388,130 @@ class rss(commands.Cog):
       modal = RSSLinkModal(self)
       await interaction.response.send_modal(modal)
 
-  @tasks.loop(minutes=5)
+  async def _apply_feed_updates(self, rss_data, feed_cache):
+      """Run one fan-out stage per changed feed, all feeds concurrently.
+
+      Returns (links that had new entries, whether rss_data was modified)."""
+      subs_by_link = {}
+      for subscriptions in rss_data.values():
+          for subscription in subscriptions:
+              if subscription.get("link") in feed_cache:
+                  subs_by_link.setdefault(subscription["link"], []).append(subscription)
+
+      outcomes = await asyncio.gather(*(
+          self._process_feed(link, feed_cache[link], subs) for link, subs in subs_by_link.items()
+      ))
+      posted_links = {link for link, (had_new, _) in zip(subs_by_link, outcomes) if had_new}
+      data_changed = any(changed for _, changed in outcomes)
+      return posted_links, data_changed
+
+  def _entry_key(self, entry):
+      return hashlib.sha1(str(self.get_entry_id(entry)).encode('utf-8')).hexdigest()[:SEEN_KEY_LENGTH]
+
+  def _legacy_new_entries(self, subscription, keyed):
+      """New entries for a subscription saved before seen_ids existed, using
+      its single last_id / last_message marker one last time."""
+      last_id = subscription.get("last_id")
+      last_message = subscription.get("last_message")
+      new_items = []
+      for key, entry in keyed:
+          if last_id is not None and self.get_entry_id(entry) == last_id:
+              return new_items
+          if last_id is None and last_message and entry.title == last_message:
+              return new_items
+          new_items.append((key, entry))
+      # Marker rolled off the feed: seed the window without posting, as before
+      return [] if (last_id is not None or last_message) else new_items
+
+  async def _send_entries(self, channel, embeds):
+      # Oldest first within a channel; channels run concurrently
+      for embed in embeds:
+          await channel.send(embed=embed)
+
+  async def _process_feed(self, link, result, subscriptions):
+      """Diff one feed against its subscriptions' seen-ID windows, build each
+      embed once and send it to every subscribed channel concurrently.
+
+      Returns (whether any subscription had new entries, whether any
+      subscription was modified)."""
+      feed = result["feed"]
+      if not feed.entries:
+          return False, False
+
+      keyed = [(self._entry_key(entry), entry) for entry in feed.entries]
+      feed_title = feed.feed.get('title', link)
+      window_size = max(SEEN_WINDOW, len(keyed))
+
+      # Subscriptions of a feed normally share one window, so this diffs once
+      diffs = {}
+      new_by_sub = []
+      for subscription in subscriptions:
+          seen = subscription.get("seen_ids")
+          if seen is None:
+              new_items = self._legacy_new_entries(subscription, keyed)
+          else:
+              window = tuple(seen)
+              if window not in diffs:
+                  seen_set = set(window)
+                  diffs[window] = [(key, entry) for key, entry in keyed if key not in seen_set]
+              new_items = diffs[window]
+          new_by_sub.append(new_items)
+
+      # Each entry's embed is built once; other accent colors are cheap copies.
+      # Every channel wanting the same (entry, color) is sent the same object.
+      base_embeds = {}
+      embeds = {}
+      def embed_for(key, entry, color):
+          if (key, color) not in embeds:
+              if key not in base_embeds:
+                  base_embeds[key] = embeds[(key, color)] = self._create_rss_embed(entry, feed_title, color)
+              else:
+                  embed = base_embeds[key].copy()
+                  embed.colour = self._parse_color(color)
+                  embeds[(key, color)] = embed
+          return embeds[(key, color)]
+
+      sends = []
+      for subscription, new_items in zip(subscriptions, new_by_sub):
+          channel = self.bot.get_channel(subscription["channel_id"]) if new_items else None
+          if channel:
+              color = subscription.get("color", "#2E8B57")
+              batch = [embed_for(key, entry, color) for key, entry in reversed(new_items)]
+              sends.append(self._send_entries(channel, batch))
+          else:
+              sends.append(None)
+      pending = [send for send in sends if send is not None]
+      outcomes = iter(await asyncio.gather(*pending, return_exceptions=True))
+
+      had_new = any(new_by_sub)
+      changed = False
+      latest = feed.entries[0]
+      for subscription, new_items, send in zip(subscriptions, new_by_sub, sends):
+          outcome = next(outcomes) if send is not None else None
+          if isinstance(outcome, Exception):
+              # Leave this subscription's window alone so it retries next poll
+              print(f"An error occurred while processing RSS feed {link} for channel {subscription['channel_id']}: {outcome}")
+              continue
+
+          seen = subscription.get("seen_ids") or []
+          seen_set = set(seen)
+          fresh = [key for key, _ in keyed if key not in seen_set]
+          window = (fresh + seen)[:window_size]
+          updates = {
+              "seen_ids": window,
+              "last_message": latest.title,
+              "last_id": self.get_entry_id(latest),
+              # Remember validators only once this subscription is up to date
+              "etag": result["etag"],
+              "last_modified": result["last_modified"],
+          }
+          for field, value in updates.items():
+              if subscription.get(field) != value:
+                  subscription[field] = value
+                  changed = True
+      return had_new, changed
+
+  @tasks.loop(seconds=SCHEDULER_TICK_SECONDS)
   async def check_rss_feed(self):
       # Load RSS data
       try:
@@ -384,81 +522,46 @@ class rss(commands.Cog):
 
       data_changed = False
 
-      # 1. Collect all unique links
-      unique_links = set()
+      # 1. Collect unique links with the ETag/Last-Modified their subscriptions
+      # were last updated from. If subscriptions disagree (one failed to post
+      # last time), fetch unconditionally so none of them misses entries.
+      validators = {}
       for subs in rss_data.values():
           for sub in subs:
-              if sub.get("link"):
-                  unique_links.add(sub["link"])
-
-      if not unique_links:
+              link = sub.get("link")
+              if link:
+                  pair = (sub.get("etag"), sub.get("last_modified"))
+                  validators[link] = pair if validators.get(link, pair) == pair else (None, None)
+
+      # 2. Only poll the feeds whose adaptive interval has elapsed
+      self.scheduler.sync(validators)
+      links = self.scheduler.pop_due()
+      if not links:
           return
 
-      # 2. Fetch all feeds concurrently
-      fetch_tasks = [self.fetch_feed(link) for link in unique_links]
-      results = await asyncio.gather(*fetch_tasks)
-
-      # Create a cache: link -> feed object
-      feed_cache = {link: feed for link, feed in results if feed}
-
-      # 3. Iterate through subscriptions and apply updates using cache
-      for server_id, subscriptions in rss_data.items():
-          for subscription in subscriptions:
-              link = subscription["link"]
-              feed = feed_cache.get(link)
-
-              # If feed failed to fetch, skip
-              if not feed or not feed.entries:
-                  continue
-
-              channel_id = subscription["channel_id"]
-              last_message = subscription.get("last_message")
-              last_id = subscription.get("last_id")
-              color = subscription.get("color", "#2E8B57")
+      # 3. Conditional GETs on the shared session; 304s are never parsed.
+      # Every popped link is handed back to the scheduler, even if this tick fails.
+      results = {}
+      posted_links = set()
+      try:
+          fetched = await asyncio.gather(*(self.fetcher.fetch(link, *validators[link]) for link in links))
+          results = dict(zip(links, fetched))
+
+          # Create a cache: link -> fetch result, for feeds that changed
+          feed_cache = {}
+          for link, result in results.items():
+              if result["error"]:
+                  print(f"Error fetching feed {link}: {result['error']}")
+              elif result["feed"] is not None:
+                  feed_cache[link] = result
+
+          # 4. Apply updates to every subscription of a changed feed
+          posted_links, data_changed = await self._apply_feed_updates(rss_data, feed_cache)
+      finally:
+          for link in links:
+              result = results.get(link, {"status": None, "feed": None, "error": "tick aborted", "elapsed_ms": 0.0})
+              self.scheduler.record(link, result, has_new=link in posted_links)
 
-              try:
-                  new_items = []
-                  found_last = False
-
-                  for entry in feed.entries:
-                      entry_id = self.get_entry_id(entry)
-
-                      # Check against last_id
-                      if last_id is not None and entry_id == last_id:
-                          found_last = True
-                          break
-
-                      # Fallback to title check if last_id is missing (legacy data)
-                      if last_id is None and last_message and entry.title == last_message:
-                          found_last = True
-                          break
-
-                      new_items.append(entry)
-
-                  # If last_id not found in feed (entry rolled off), just update marker silently
-                  if not found_last and (last_id is not None or last_message):
-                      latest = feed.entries[0]
-                      subscription["last_message"] = latest.title
-                      subscription["last_id"] = self.get_entry_id(latest)
-                      data_changed = True
-                  elif new_items:
-                      channel = self.bot.get_channel(channel_id)
-                      if channel:
-                          feed_title = feed.feed.get('title', link)
-                          # Send oldest new item first
-                          for entry in reversed(new_items):
-                              embed = self._create_rss_embed(entry, feed_title, color)
-                              await channel.send(embed=embed)
-
-                      # Update markers
-                      latest = feed.entries[0]
-                      subscription["last_message"] = latest.title
-                      subscription["last_id"] = self.get_entry_id(latest)
-                      data_changed = True
-
-              except Exception as e:
-                  print(f"An error occurred while processing RSS feed {link} for channel {channel_id}: {e}")
-  
       if data_changed:
           await save_rss_data(rss_data)
   
@@ -1,12 +1,91 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from loadnsave import smartreact_load, smartreact_save
+from loadnsave import load_view, edit_data, add_save_listener, remove_save_listener
 import io
+import re
+
+
+def _trie_pattern(words):
+    """Regex matching any of `words`, factored by common prefix so the engine
+    branches on one character at a time instead of trying every word in turn.
+    Optional tails are greedy, so the longest word wins."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class SmartReactionMatcher:
+    """Finds every trigger word contained in a message with one regex scan.
+
+    The pattern is a lookahead over all words, shaped like a trie, so at each
+    position it reports the longest word starting there. Shorter words
+    hidden inside a reported one ("cat" in "cats") come from a table built
+    with the matcher, which keeps the old "every word that is a substring of
+    the message" behaviour.
+    """
+
+    def __init__(self, reactions):
+        self.reactions = dict(reactions)
+        self._order = {word: i for i, word in enumerate(self.reactions)}
+        by_lowered = {}
+        for word in self.reactions:
+            by_lowered.setdefault(word.lower(), []).append(word)
+        self._always = by_lowered.pop("", [])
+        # lowered word -> configured words it contains (itself included)
+        self._contained = {
+            low: [word for other, words in by_lowered.items() if other in low for word in words]
+            for low in by_lowered
+        }
+        self._pattern = None
+        if by_lowered:
+            self._pattern = re.compile(f"(?=({_trie_pattern(by_lowered)}))")
+
+    def matches(self, content):
+        """(word, emoji) pairs for the words in `content`, in configuration order."""
+        found = set(self._always)
+        if self._pattern is not None:
+            for longest in set(self._pattern.findall(content.lower())):
+                found.update(self._contained[longest])
+        return [(word, self.reactions[word]) for word in sorted(found, key=self._order.__getitem__)]
+
 
 class smartreaction(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._matchers = {}  # server_id -> (that guild's reactions dict, matcher)
+
+    async def cog_load(self):
+        add_save_listener('smart_react.json', self._forget_matchers)
+
+    def cog_unload(self):
+        remove_save_listener('smart_react.json', self._forget_matchers)
+
+    def _forget_matchers(self, _saved=None):
+        self._matchers.clear()
+
+    def _matcher_for(self, server_id, guild_reactions):
+        """Compiled matcher for a guild, rebuilt after smartreact_save() (via
+        the save listener) or when an invalidation reloads the document."""
+        cached = self._matchers.get(server_id)
+        if cached is None or cached[0] is not guild_reactions:
+            cached = (guild_reactions, SmartReactionMatcher(guild_reactions))
+            self._matchers[server_id] = cached
+        return cached[1]
 
     group = app_commands.Group(name="smartreaction", description="💡 Manage smart reactions", guild_only=True)
 
@@ -19,15 +98,17 @@ class smartreaction(commands.Cog):
             return
 
         server_id = str(message.guild.id)
-        reactions = await smartreact_load()
+        reactions = await load_view('smart_react.json')
 
-        if server_id in reactions:
-            for word, emoji in reactions[server_id].items():
-                if word.lower() in message.content.lower():
-                    try:
-                        await message.add_reaction(emoji)
-                    except discord.HTTPException:
-                        pass # Ignore if emoji is invalid or bot has no permission
+        guild_reactions = reactions.get(server_id)
+        if not guild_reactions:
+            return
+
+        for word, emoji in self._matcher_for(server_id, guild_reactions).matches(message.content):
+            try:
+                await message.add_reaction(emoji)
+            except discord.HTTPException:
+                pass # Ignore if emoji is invalid or bot has no permission
 
     @group.command(name="add", description="➕ Add a new word-emoji pair for smart reactions.")
     @app_commands.describe(word="The word to trigger the reaction", emoji="The emoji to react with")
@@ -36,14 +117,10 @@ class smartreaction(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         server_id = str(interaction.guild.id)
-        reactions = await smartreact_load()
-
-        if server_id not in reactions:
-            reactions[server_id] = {}
-
         word_lower = word.lower()
-        reactions[server_id][word_lower] = emoji
-        await smartreact_save(reactions)
+
+        async with edit_data('smart_react.json') as reactions:
+            reactions.setdefault(server_id, {})[word_lower] = emoji
 
         await interaction.followup.send(f"Added reaction: '{word_lower}' -> {emoji}")
 
@@ -54,7 +131,7 @@ class smartreaction(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         server_id = str(interaction.guild.id)
-        reactions = await smartreact_load()
+        reactions = await load_view('smart_react.json')
 
         if server_id in reactions:
             word_lower = word.lower()
@@ -65,8 +142,8 @@ class smartreaction(commands.Cog):
                      await interaction.followup.send(f"The stored emoji for '{word_lower}' is {current_emoji}, but you provided {emoji}. Removal aborted.")
                      return
 
-                removed_emoji = reactions[server_id].pop(word_lower)
-                await smartreact_save(reactions)
+                async with edit_data('smart_react.json') as reactions:
+                    removed_emoji = reactions[server_id].pop(word_lower)
                 await interaction.followup.send(f"Removed reaction: '{word_lower}' -> {removed_emoji}")
             else:
                 await interaction.followup.send(f"No reaction found for the word: '{word_lower}'")
@@ -78,7 +155,7 @@ class smartreaction(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         server_id = str(interaction.guild.id)
-        reactions = await smartreact_load()
+        reactions = await load_view('smart_react.json')
 
         if server_id in reactions:
             reaction_list = reactions[server_id]
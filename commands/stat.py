@@ -4,9 +4,10 @@ import math
 from discord.ext import commands
 from discord import app_commands
 from discord.ui import View, Button
-from loadnsave import load_player_stats, save_player_stats, load_gamemode_stats
+from loadnsave import load_player_stats, save_player_stats, load_gamemode_stats, load_entity
 from emojis import get_stat_emoji
 from rapidfuzz import process, fuzz
+from commands._autocomplete import engine as autocomplete
 
 class LimitCheckView(View):
     def __init__(self, user, limit):
@@ -377,19 +378,18 @@ class stat(commands.Cog):
     async def stat_autocomplete(self, interaction: discord.Interaction, current: str):
         server_id = str(interaction.guild_id)
         user_id = str(interaction.user.id)
-        player_stats = await load_player_stats()
+        user_stats = await load_entity('player_stats.json', server_id, user_id)
 
-        if server_id not in player_stats or user_id not in player_stats[server_id]:
+        if user_stats is None:
             return []
 
-        user_stats = player_stats[server_id][user_id]
         choices = [f"{k} ({v})" for k, v in user_stats.items() if isinstance(v, (int, float))]
 
         if not current:
             return [app_commands.Choice(name=c, value=c) for c in sorted(choices)[:25]]
 
-        matches = process.extract(current, choices, scorer=fuzz.WRatio, limit=25)
-        return [app_commands.Choice(name=m[0], value=m[0]) for m in matches]
+        matches = await autocomplete.search(interaction.user.id, interaction.command.name, current, choices, limit=25)
+        return [app_commands.Choice(name=choices[i], value=choices[i]) for i, _ in matches]
 
 
 async def setup(bot):
@@ -4,7 +4,7 @@ from discord.ext import commands
 from discord.ui import View, Select, Button, Modal, TextInput
 from loadnsave import load_player_stats
 import random
-from rapidfuzz import process, fuzz
+from commands._autocomplete import engine as autocomplete
 
 # --- Helper Logic ---
 
@@ -101,10 +101,11 @@ class VersusSearchModal(Modal):
         choices = valid_keys
 
         # Fuzzy search
-        extract = process.extractOne(query, choices, scorer=fuzz.WRatio)
+        extract = await autocomplete.search(interaction.user.id, "versus-skill", query, choices, limit=1)
 
         if extract:
-            match_key, score, _ = extract
+            index, score = extract[0]
+            match_key = choices[index]
             if score > 60:
                 # Update View
                 if self.target == "self":
@@ -1,5 +1,5 @@
 import discord
-import struct
+import numpy as np
 import uuid
 import os
 import threading
@@ -12,21 +12,44 @@ SAMPLE_WIDTH = 2  # 16-bit signed PCM
 CHUNK_SIZE = 3840  # 20ms of stereo audio: 48000 * 0.02 * 2 channels * 2 bytes
 
 
-def _apply_volume(data: bytes, volume: float) -> bytes:
-    """Scale PCM samples by volume factor with clipping."""
-    n = len(data) // SAMPLE_WIDTH
-    fmt = f'<{n}h'
-    samples = struct.unpack(fmt, data[:n * SAMPLE_WIDTH])
-    return struct.pack(fmt, *(max(-32768, min(32767, int(s * volume))) for s in samples))
-
-
-def _mix_pcm(a: bytes, b: bytes) -> bytes:
-    """Sum two 16-bit PCM buffers with clipping."""
-    n = len(a) // SAMPLE_WIDTH
-    fmt = f'<{n}h'
-    sa = struct.unpack(fmt, a)
-    sb = struct.unpack(fmt, b)
-    return struct.pack(fmt, *(max(-32768, min(32767, x + y)) for x, y in zip(sa, sb)))
+class PcmMixer:
+    """Array-backed accumulator that mixes 16-bit PCM frames from many tracks.
+
+    Every track's frame is scaled by its volume and summed into one
+    preallocated int32 accumulator, which is clipped back to 16-bit in a
+    single pass when the frame is rendered. All intermediate buffers are
+    allocated once per mixer and reused for every 20ms frame.
+    """
+
+    def __init__(self, frame_size: int = CHUNK_SIZE):
+        self.frame_size = frame_size
+        self._samples = frame_size // SAMPLE_WIDTH
+        self._acc = np.zeros(self._samples, dtype=np.int32)
+        self._scaled = np.empty(self._samples, dtype=np.float32)
+        self._out = np.empty(self._samples, dtype='<i2')
+        self.sources = 0
+
+    def reset(self):
+        """Clear the accumulator before mixing a new frame."""
+        self._acc.fill(0)
+        self.sources = 0
+
+    def add(self, data: bytes, volume: float = 1.0):
+        """Accumulate one full frame of PCM, scaled by `volume`."""
+        samples = np.frombuffer(data, dtype='<i2', count=self._samples)
+        if volume == 1.0:
+            np.add(self._acc, samples, out=self._acc)
+        elif volume > 0.0:
+            # Truncate toward zero like int(sample * volume) did before.
+            np.multiply(samples, volume, out=self._scaled)
+            np.add(self._acc, self._scaled, out=self._acc, casting='unsafe')
+        self.sources += 1
+
+    def render(self) -> bytes:
+        """Clip the accumulated frame to 16-bit and return it as PCM bytes."""
+        np.clip(self._acc, -32768, 32767, out=self._acc)
+        np.copyto(self._out, self._acc, casting='unsafe')
+        return self._out.tobytes()
 
 
 class Track:
@@ -110,6 +133,7 @@ class Track:
         self._paused_since = now if self._paused else None
 
     def read(self) -> bytes:
+        """Return the next unscaled 20ms frame, padded to CHUNK_SIZE."""
         if self._paused:
             return b'\x00' * CHUNK_SIZE
 
@@ -150,7 +174,8 @@ class Track:
         if len(data) < CHUNK_SIZE:
             data += b'\x00' * (CHUNK_SIZE - len(data))
 
-        return _apply_volume(data, self.volume) if self.volume != 1.0 else data
+        # Volume is applied by the mixer while accumulating, not here.
+        return data
 
     def _mark_finished(self):
         self.finished = True
@@ -172,6 +197,7 @@ class MixingAudioSource(discord.AudioSource):
     def __init__(self):
         self.tracks: list[Track] = []
         self.lock = threading.Lock()
+        self._mixer = PcmMixer()
 
     def add_track(self, file_path, volume=0.5, loop=False, is_url=False,
                   metadata=None, before_options=None, options=None, on_finish=None) -> Track:
@@ -203,17 +229,21 @@ class MixingAudioSource(discord.AudioSource):
             return True
 
     def read(self) -> bytes:
-        mixed = bytearray(b'\x00' * CHUNK_SIZE)
         to_remove: set[Track] = set()
 
         with self.lock:
+            mixer = self._mixer
+            mixer.reset()
             for track in self.tracks:
                 if track.finished:
                     to_remove.add(track)
                     continue
+                if track.paused:
+                    # A paused track contributes silence; skip the read.
+                    continue
                 data = track.read()
                 if data and len(data) == CHUNK_SIZE:
-                    mixed = bytearray(_mix_pcm(bytes(mixed), data))
+                    mixer.add(data, track.volume)
                 if track.finished:
                     to_remove.add(track)
 
@@ -222,7 +252,7 @@ class MixingAudioSource(discord.AudioSource):
                 if track in self.tracks:
                     self.tracks.remove(track)
 
-        return bytes(mixed)
+            return mixer.render()
 
     def cleanup(self):
         with self.lock:
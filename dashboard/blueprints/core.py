@@ -8,7 +8,8 @@ from quart import Blueprint, request, jsonify, session, redirect, url_for, rende
 from dashboard.state import _APP_START, _failed_login_attempts, IMAGES_FOLDER, FONTS_FOLDER
 from dashboard.app import app, get_image_url, is_admin
 from ..file_utils import sanitize_filename, ALLOWED_IMAGE_EXTENSIONS
-from loadnsave import load_settings_async
+from loadnsave import load_settings_async, get_write_behind_stats
+from render_service import RenderService
 
 core_bp = Blueprint('core', __name__)
 
@@ -42,6 +43,33 @@ def record_login_failure(ip):
         _failed_login_attempts[ip] = []
     _failed_login_attempts[ip].append(now)
 
+def _startup_summary(bot, include_extensions=False):
+    """bot.startup_report from bot.py's load(); the per-extension timings (and
+    their error strings) are only shown to a logged-in admin."""
+    report = getattr(bot, "startup_report", None)
+    if not isinstance(report, dict) or not report:
+        return None
+    summary = {k: report.get(k) for k in ("loaded", "failed", "load_ms", "ready_ms")}
+    if include_extensions:
+        summary["extensions"] = report.get("extensions", [])
+    return summary
+
+def _render_summary(bot):
+    """Pool and queue counters of the shared headless-browser renderer, if the bot has one."""
+    service = getattr(bot, "render_service", None)
+    if not isinstance(service, RenderService):
+        return None
+    return service.snapshot()
+
+def _karma_summary(bot):
+    """Karma author-cache and role-debounce counters, if the Karma cog is loaded."""
+    cog = bot.get_cog("Karma") if bot is not None else None
+    metrics = getattr(cog, "author_cache_metrics", None)
+    if not callable(metrics):
+        return None
+    result = metrics()
+    return result if isinstance(result, dict) else None
+
 @core_bp.route('/api/status')
 async def bot_status():
     is_ready = app.bot is not None and app.bot.is_ready()
@@ -64,6 +92,10 @@ async def bot_status():
         "latency_ms": latency,
         "guilds": guilds,
         "memory_mb": mem_mb,
+        "persistence": get_write_behind_stats(),
+        "startup": _startup_summary(app.bot, include_extensions=is_admin()),
+        "render": _render_summary(app.bot),
+        "karma": _karma_summary(app.bot),
     })
 
 @core_bp.route('/fonts/<path:filename>')
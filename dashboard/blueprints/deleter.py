@@ -22,6 +22,11 @@ async def deleter_data():
     deleter_data = await load_deleter_data() # {"channel_id": seconds}
     guilds_data = []
 
+    # Per-channel counters of the cog's latest sweeps, if it is loaded
+    sweep_stats = getattr(app.bot.get_cog("deleter"), "channel_stats", None)
+    if not isinstance(sweep_stats, dict):
+        sweep_stats = {}
+
     for guild in app.bot.guilds:
         guild_id_str = str(guild.id)
 
@@ -36,7 +41,8 @@ async def deleter_data():
                  "id": str(channel.id),
                  "name": channel.name,
                  "is_active": is_active,
-                 "seconds": seconds
+                 "seconds": seconds,
+                 "sweep": sweep_stats.get(str(channel.id))
              })
 
         guilds_data.append({
@@ -3,7 +3,7 @@ from quart import Blueprint, request, jsonify, render_template, redirect, url_fo
 import discord
 
 from dashboard.app import app, is_admin
-from loadnsave import load_giveaway_data
+from loadnsave import load_giveaway_data, load_giveaway_archive
 
 giveaway_bp = Blueprint('giveaway', __name__)
 
@@ -22,6 +22,7 @@ async def giveaway_data():
         return jsonify({"guilds": []})
 
     data = await load_giveaway_data()
+    archive = await load_giveaway_archive()
     guilds_data = []
 
     for guild in app.bot.guilds:
@@ -34,8 +35,10 @@ async def giveaway_data():
 
         # Giveaways for this guild
         guild_giveaways = []
-        if guild_id_str in data:
-            for msg_id, gw in data[guild_id_str].items():
+        # Active giveaways plus the ended ones moved to the archive
+        entries = {**archive.get(guild_id_str, {}), **data.get(guild_id_str, {})}
+        if entries:
+            for msg_id, gw in entries.items():
                 try:
                     gw_copy = gw.copy()
                     gw_copy['message_id'] = msg_id
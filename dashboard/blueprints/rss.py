@@ -1,10 +1,12 @@
 import asyncio
-import feedparser
+from lazy_imports import lazy_import
 from quart import Blueprint, request, jsonify, redirect, url_for, render_template
 
 from dashboard.app import app, is_admin
 from loadnsave import load_rss_data, save_rss_data
-from rss_utils import get_youtube_rss_url
+from rss_utils import get_youtube_rss_url, FeedScheduler
+
+feedparser = lazy_import("feedparser")
 
 rss_bp = Blueprint('rss', __name__)
 
@@ -21,6 +23,13 @@ async def rss_data():
     rss_data = await load_rss_data()
     feeds = []
 
+    # Next-poll times and latency from the cog's adaptive scheduler, if it's running
+    schedule = {}
+    if app.bot:
+        scheduler = getattr(app.bot.get_cog('rss'), 'scheduler', None)
+        if isinstance(scheduler, FeedScheduler):
+            schedule = scheduler.snapshot()
+
     for guild_id, items in rss_data.items():
         guild = None
         if app.bot:
@@ -43,7 +52,8 @@ async def rss_data():
                 "channel_name": channel_name,
                 "link": item.get('link'),
                 "last_message": item.get('last_message', 'N/A'),
-                "color": item.get('color', '#2E8B57')
+                "color": item.get('color', '#2E8B57'),
+                "schedule": schedule.get(item.get('link'))
             })
 
     # Guilds for dropdown
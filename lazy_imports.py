@@ -0,0 +1,28 @@
+"""Deferred imports for heavy third-party modules.
+
+`yt_dlp = lazy_import("yt_dlp")` binds a real module object whose body only
+runs on first attribute access, so cogs that merely *reference* yt_dlp,
+playwright, feedparser or bs4 no longer pay for them at startup. Type hints
+naming a lazy module must be strings, or the hint itself triggers the load.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Return `name` from sys.modules, or a lazily executed module for it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    parent, _, child = name.rpartition('.')
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
@@ -1,8 +1,15 @@
 import json
 import aiofiles
+import asyncio
+import contextlib
+import copy
 import os
 import shutil
 import logging
+import time
+from types import MappingProxyType
+
+from sqlite_store import SQLITE_ENTITIES, DEFAULT_DB_FILENAME, SqliteStore
 
 logger = logging.getLogger("loadnsave")
 
@@ -39,15 +46,73 @@ async def _load_infodata_cached(filename):
 
 async def _save_json_file(folder, filename, data, ensure_ascii=True):
     """Helper function to asynchronously save JSON data to a file."""
-    if not os.path.exists(folder):
-        os.makedirs(folder)
-    file_path = os.path.join(folder, filename)
-    async with aiofiles.open(file_path, 'w', encoding='utf-8') as file:
-        await file.write(json.dumps(data, indent=4, ensure_ascii=ensure_ascii))
-
-    # Update cache if applicable
-    if folder == INFODATA_FOLDER:
-        _INFODATA_CACHE[filename] = data
+    # Serialized with the write-behind flusher so a flush that started earlier
+    # can never rename an older snapshot over this write.
+    async with _FLUSH_LOCK:
+        await _atomic_write_text(folder, filename, json.dumps(data, indent=4, ensure_ascii=ensure_ascii))
+
+        # Update cache if applicable
+        if folder == INFODATA_FOLDER:
+            _INFODATA_CACHE[filename] = data
+        elif folder == DATA_FOLDER:
+            # A full write supersedes any pending write-behind for this file.
+            _DIRTY.pop(filename, None)
+            _FRAGMENTS.pop(filename, None)
+
+# --- Storage Backend ---
+# player_stats, karma_stats, journal_data and giveaway_data can live in SQLite
+# (one row per guild/entity pair, see sqlite_store.py) instead of JSON when
+# config.json sets "storage_backend": "sqlite". Every other entity is JSON-only.
+_SQLITE_STORE = None
+
+def _sqlite_enabled(filename):
+    return filename in SQLITE_ENTITIES and load_settings().get("storage_backend", "json") == "sqlite"
+
+def _get_sqlite_store():
+    global _SQLITE_STORE
+    path = load_settings().get("sqlite_path") or os.path.join(DATA_FOLDER, DEFAULT_DB_FILENAME)
+    if _SQLITE_STORE is None or _SQLITE_STORE.path != path:
+        if _SQLITE_STORE is not None:
+            _SQLITE_STORE.close()
+        _SQLITE_STORE = SqliteStore(path)
+    return _SQLITE_STORE
+
+async def _load_document(filename):
+    """Load a whole data/ document from whichever backend holds it."""
+    if _sqlite_enabled(filename):
+        return await asyncio.to_thread(_get_sqlite_store().load_document, SQLITE_ENTITIES[filename])
+    return await _load_json_file(DATA_FOLDER, filename)
+
+async def _save_document(filename, data):
+    """Save a whole data/ document to whichever backend holds it."""
+    if not _sqlite_enabled(filename):
+        await _save_json_file(DATA_FOLDER, filename, data)
+        return
+    async with _FLUSH_LOCK:
+        await asyncio.to_thread(_get_sqlite_store().save_document, SQLITE_ENTITIES[filename], data)
+        _DIRTY.pop(filename, None)
+
+# --- Save Listeners ---
+# Modules that derive something from a data/ document (render_cache keeps
+# screenshots of character sheets) register a callback here; it runs with the
+# saved document after every save_X() of that file. Callbacks must be cheap
+# and synchronous.
+_SAVE_LISTENERS = {}
+
+def add_save_listener(filename, callback):
+    _SAVE_LISTENERS.setdefault(filename, []).append(callback)
+
+def remove_save_listener(filename, callback):
+    listeners = _SAVE_LISTENERS.get(filename, [])
+    if callback in listeners:
+        listeners.remove(callback)
+
+def _notify_saved(filename, data):
+    for callback in list(_SAVE_LISTENERS.get(filename, ())):
+        try:
+            callback(data)
+        except Exception as e:
+            logger.warning(f"Save listener for {filename} failed: {e}")
 
 # --- Player Stats ---
 _PLAYER_STATS_CACHE = None
@@ -57,7 +122,7 @@ async def load_player_stats():
     if _PLAYER_STATS_CACHE is not None:
         return _PLAYER_STATS_CACHE
 
-    data = await _load_json_file(DATA_FOLDER, 'player_stats.json')
+    data = await _load_document('player_stats.json')
     
     # --- Migration / Schema Enforcement ---
     updated = False
@@ -104,7 +169,8 @@ async def load_player_stats():
 async def save_player_stats(player_stats):
     global _PLAYER_STATS_CACHE
     _PLAYER_STATS_CACHE = player_stats
-    await _save_json_file(DATA_FOLDER, 'player_stats.json', player_stats)
+    await _save_document('player_stats.json', player_stats)
+    _notify_saved('player_stats.json', player_stats)
 
 # --- Settings ---
 _SETTINGS_CACHE = None
@@ -184,9 +250,39 @@ async def load_server_stats():
 
 async def save_server_stats(server_stats):
     global _SERVER_STATS_CACHE
-    _SERVER_STATS_CACHE = server_stats.copy()
+    _SERVER_STATS_CACHE = server_stats
+    invalidate_prefix_cache()
     await _save_json_file(DATA_FOLDER, 'server_stats.json', server_stats)
 
+# --- Command Prefixes ---
+# bot.get_prefix runs for every message the bot sees, so the full prefix list
+# (both mention forms plus the guild's prefix from server_stats.json) is built
+# once per guild and memoized here. save_server_stats() and
+# invalidate_data_cache('server_stats.json') clear it.
+DEFAULT_PREFIX = "!"
+_PREFIX_LIST_CACHE = {}
+
+def invalidate_prefix_cache(guild_id=None):
+    """Drop the memoized prefix list for one guild, or for every guild."""
+    if guild_id is None:
+        _PREFIX_LIST_CACHE.clear()
+    else:
+        _PREFIX_LIST_CACHE.pop(int(guild_id), None)
+
+async def resolve_prefixes(guild_id, bot_user_id):
+    """Return the prebuilt prefix list for a guild (None for DMs), matching
+    what commands.when_mentioned_or(prefix) would produce. Callers must not
+    mutate the returned list."""
+    prefixes = _PREFIX_LIST_CACHE.get(guild_id)
+    if prefixes is None:
+        prefix = DEFAULT_PREFIX
+        if guild_id is not None:
+            server_stats = await load_server_stats()
+            prefix = server_stats.get(str(guild_id), DEFAULT_PREFIX)
+        prefixes = [f'<@{bot_user_id}> ', f'<@!{bot_user_id}> ', prefix]
+        _PREFIX_LIST_CACHE[guild_id] = prefixes
+    return prefixes
+
 
 # --- Server Volumes ---
 _SERVER_VOLUMES_CACHE = None
@@ -215,6 +311,7 @@ async def smartreact_save(smart_react):
     global _SMART_REACT_CACHE
     _SMART_REACT_CACHE = smart_react.copy()
     await _save_json_file(DATA_FOLDER, 'smart_react.json', smart_react, ensure_ascii=False)
+    _notify_saved('smart_react.json', smart_react)
 
 # --- Auto Room ---
 _AUTOROOM_CACHE = None
@@ -369,6 +466,22 @@ async def save_rss_data(session_data):
     _RSS_DATA_CACHE = session_data
     await _save_json_file(DATA_FOLDER, 'rss_data.json', session_data)
 
+# --- YouTube Channel Cache ---
+# {normalized YouTube URL: {"channel_id": "UC..." or None, "resolved_at": epoch}},
+# maintained by rss_utils.get_youtube_rss_url.
+_YOUTUBE_CHANNEL_CACHE = None
+
+async def load_youtube_channel_cache():
+    global _YOUTUBE_CHANNEL_CACHE
+    if _YOUTUBE_CHANNEL_CACHE is None:
+        _YOUTUBE_CHANNEL_CACHE = await _load_json_file(DATA_FOLDER, 'youtube_channel_cache.json')
+    return _YOUTUBE_CHANNEL_CACHE
+
+async def save_youtube_channel_cache(cache_data):
+    global _YOUTUBE_CHANNEL_CACHE
+    _YOUTUBE_CHANNEL_CACHE = cache_data
+    await _save_json_file(DATA_FOLDER, 'youtube_channel_cache.json', cache_data)
+
 # --- Soundboard Settings ---
 _SOUNDBOARD_SETTINGS_CACHE = None
 
@@ -410,12 +523,13 @@ async def load_reminder_data():
     global _REMINDER_DATA_CACHE
     if _REMINDER_DATA_CACHE is None:
         _REMINDER_DATA_CACHE = await _load_json_file(DATA_FOLDER, 'reminder_data.json')
-    return _REMINDER_DATA_CACHE.copy()
+    return _REMINDER_DATA_CACHE
 
-async def save_reminder_data(session_data):
+async def save_reminder_data(data):
     global _REMINDER_DATA_CACHE
-    _REMINDER_DATA_CACHE = session_data.copy()
-    await _save_json_file(DATA_FOLDER, 'reminder_data.json', session_data)
+    _REMINDER_DATA_CACHE = data
+    await _save_json_file(DATA_FOLDER, 'reminder_data.json', data)
+    _notify_saved('reminder_data.json', data)
 
 # --- Game Data ---
 async def game_load_player_data():
@@ -459,17 +573,65 @@ async def save_gamemode_stats(server_stats):
     await _save_json_file(DATA_FOLDER, 'gamemode.json', server_stats)
 
 # --- Karma System ---
+# The karma cog checks its settings on every message and reaction in every
+# guild, so besides caching the document we keep a per-guild
+# {channel_id: settings} index; a message in any other channel is rejected
+# with two dict lookups. save_karma_settings() and
+# invalidate_data_cache('karma_settings.json') drop the index.
+_KARMA_SETTINGS_CACHE = None
+_KARMA_CHANNEL_INDEX = None
+
 async def load_karma_settings():
-    return await _load_json_file(DATA_FOLDER, 'karma_settings.json')
+    global _KARMA_SETTINGS_CACHE
+    if _KARMA_SETTINGS_CACHE is None:
+        _KARMA_SETTINGS_CACHE = await _load_json_file(DATA_FOLDER, 'karma_settings.json')
+    return _KARMA_SETTINGS_CACHE
 
 async def save_karma_settings(settings):
+    global _KARMA_SETTINGS_CACHE
+    _KARMA_SETTINGS_CACHE = settings
+    invalidate_karma_channel_index()
     await _save_json_file(DATA_FOLDER, 'karma_settings.json', settings)
 
+def invalidate_karma_channel_index():
+    """Rebuild the channel index from the cached settings on next lookup."""
+    global _KARMA_CHANNEL_INDEX
+    _KARMA_CHANNEL_INDEX = None
+
+def _build_karma_channel_index(settings):
+    index = {}
+    for guild_id, guild_settings in settings.items():
+        if not isinstance(guild_settings, dict) or not guild_settings.get("channel_id"):
+            continue
+        try:
+            channel_id = int(guild_settings["channel_id"])
+        except (TypeError, ValueError):
+            continue
+        index.setdefault(str(guild_id), {})[channel_id] = guild_settings
+    return index
+
+async def get_karma_channel_settings(guild_id, channel_id):
+    """Karma settings of `guild_id` if `channel_id` is its karma channel, else None."""
+    global _KARMA_CHANNEL_INDEX
+    if _KARMA_CHANNEL_INDEX is None:
+        _KARMA_CHANNEL_INDEX = _build_karma_channel_index(await load_karma_settings())
+    guild_channels = _KARMA_CHANNEL_INDEX.get(str(guild_id))
+    if not guild_channels:
+        return None
+    return guild_channels.get(int(channel_id))
+
+_KARMA_STATS_CACHE = None
+
 async def load_karma_stats():
-    return await _load_json_file(DATA_FOLDER, 'karma_stats.json')
+    global _KARMA_STATS_CACHE
+    if _KARMA_STATS_CACHE is None:
+        _KARMA_STATS_CACHE = await _load_document('karma_stats.json')
+    return _KARMA_STATS_CACHE
 
 async def save_karma_stats(stats):
-    await _save_json_file(DATA_FOLDER, 'karma_stats.json', stats)
+    global _KARMA_STATS_CACHE
+    _KARMA_STATS_CACHE = stats
+    await _save_document('karma_stats.json', stats)
 
 # --- Music Favorites ---
 async def load_music_favorites():
@@ -491,6 +653,7 @@ async def save_reaction_roles(roles_data):
     global _REACTION_ROLES_CACHE
     _REACTION_ROLES_CACHE = roles_data
     await _save_json_file(DATA_FOLDER, 'reaction_roles.json', roles_data)
+    _notify_saved('reaction_roles.json', roles_data)
 
 # --- Pokemon GO Data ---
 _POGO_SETTINGS_CACHE = None
@@ -524,13 +687,31 @@ _GIVEAWAY_DATA_CACHE = None
 async def load_giveaway_data():
     global _GIVEAWAY_DATA_CACHE
     if _GIVEAWAY_DATA_CACHE is None:
-        _GIVEAWAY_DATA_CACHE = await _load_json_file(DATA_FOLDER, 'giveaway_data.json')
+        _GIVEAWAY_DATA_CACHE = await _load_document('giveaway_data.json')
     return _GIVEAWAY_DATA_CACHE
 
 async def save_giveaway_data(data):
     global _GIVEAWAY_DATA_CACHE
     _GIVEAWAY_DATA_CACHE = data
-    await _save_json_file(DATA_FOLDER, 'giveaway_data.json', data)
+    await _save_document('giveaway_data.json', data)
+    _notify_saved('giveaway_data.json', data)
+
+# --- Giveaway Archive ---
+# Ended giveaways (guild -> message -> giveaway), moved out of
+# giveaway_data.json so the active document stays small. Same shape as
+# giveaway_data.json; reroll and history read from here.
+_GIVEAWAY_ARCHIVE_CACHE = None
+
+async def load_giveaway_archive():
+    global _GIVEAWAY_ARCHIVE_CACHE
+    if _GIVEAWAY_ARCHIVE_CACHE is None:
+        _GIVEAWAY_ARCHIVE_CACHE = await _load_document('giveaway_archive.json')
+    return _GIVEAWAY_ARCHIVE_CACHE
+
+async def save_giveaway_archive(data):
+    global _GIVEAWAY_ARCHIVE_CACHE
+    _GIVEAWAY_ARCHIVE_CACHE = data
+    await _save_document('giveaway_archive.json', data)
 
 # --- Polls Data ---
 _POLLS_DATA_CACHE = None
@@ -552,13 +733,13 @@ _JOURNAL_DATA_CACHE = None
 async def load_journal_data():
     global _JOURNAL_DATA_CACHE
     if _JOURNAL_DATA_CACHE is None:
-        _JOURNAL_DATA_CACHE = await _load_json_file(DATA_FOLDER, 'journal_data.json')
+        _JOURNAL_DATA_CACHE = await _load_document('journal_data.json')
     return _JOURNAL_DATA_CACHE
 
 async def save_journal_data(data):
     global _JOURNAL_DATA_CACHE
     _JOURNAL_DATA_CACHE = data
-    await _save_json_file(DATA_FOLDER, 'journal_data.json', data)
+    await _save_document('journal_data.json', data)
 
 # --- Gamer Roles Data ---
 _GAMEROLE_SETTINGS_CACHE = None
@@ -753,15 +934,19 @@ _DATA_CACHE_VAR_BY_FILENAME = {
     'chase_data.json': '_CHASE_DATA_CACHE',
     'deleter_data.json': '_DELETER_DATA_CACHE',
     'rss_data.json': '_RSS_DATA_CACHE',
+    'youtube_channel_cache.json': '_YOUTUBE_CHANNEL_CACHE',
     'soundboard_settings.json': '_SOUNDBOARD_SETTINGS_CACHE',
     'music_blacklist.json': '_MUSIC_BLACKLIST_CACHE',
     'reminder_data.json': '_REMINDER_DATA_CACHE',
     'retired_characters_data.json': '_RETIRED_CHARACTERS_CACHE',
     'gamemode.json': '_GAMEMODE_STATS_CACHE',
+    'karma_stats.json': '_KARMA_STATS_CACHE',
+    'karma_settings.json': '_KARMA_SETTINGS_CACHE',
     'reaction_roles.json': '_REACTION_ROLES_CACHE',
     'pogo_settings.json': '_POGO_SETTINGS_CACHE',
     'pogo_events.json': '_POGO_EVENTS_CACHE',
     'giveaway_data.json': '_GIVEAWAY_DATA_CACHE',
+    'giveaway_archive.json': '_GIVEAWAY_ARCHIVE_CACHE',
     'polls_data.json': '_POLLS_DATA_CACHE',
     'journal_data.json': '_JOURNAL_DATA_CACHE',
     'gamerole_settings.json': '_GAMEROLE_SETTINGS_CACHE',
@@ -775,7 +960,310 @@ def invalidate_data_cache(filename):
     """Reset the in-memory cache for a data/-folder entity, keyed by its JSON
     filename, so the next load_X() call re-reads the file from disk instead of
     serving a stale cached value. No-op for filenames with no registered cache
-    (e.g. entities that never cache, like karma_settings.json) or unknown names."""
+    (e.g. entities that never cache, like music_favorites.json) or unknown names."""
     var_name = _DATA_CACHE_VAR_BY_FILENAME.get(filename)
     if var_name is not None:
         globals()[var_name] = None
+    # Whoever bypassed save_X() just wrote the file, so any pending
+    # write-behind for it would clobber their change with stale data.
+    _DIRTY.pop(filename, None)
+    _FRAGMENTS.pop(filename, None)
+    _VIEWS.pop(filename, None)
+    if filename == 'server_stats.json':
+        invalidate_prefix_cache()
+    elif filename == 'karma_settings.json':
+        invalidate_karma_channel_index()
+
+
+
+# --- Read-Only Views and Explicit Edits ---
+# Several load_X() functions return _CACHE.copy() so callers can't corrupt the
+# cache by accident, which costs an allocation proportional to the number of
+# guilds on every call. Hot readers (per message, per voice-state event) should
+# use load_view() instead: it returns a cached read-only view of the document
+# with no copying. The view is shallow, so nested values must be treated as
+# read-only too. Writers use `async with edit_data(filename) as data:` which
+# hands out a private deep copy and commits it through save_X() on a clean exit
+# (an exception inside the block discards the edit).
+_VIEW_SOURCES = {
+    'server_volumes.json': ('load_server_volumes', 'save_server_volumes'),
+    'smart_react.json': ('smartreact_load', 'smartreact_save'),
+    'autorooms.json': ('autoroom_load', 'autoroom_save'),
+    'reminder_data.json': ('load_reminder_data', 'save_reminder_data'),
+    'music_blacklist.json': ('load_music_blacklist', 'save_music_blacklist'),
+    'luck_stats.json': ('load_luck_stats', 'save_luck_stats'),
+    'soundboard_settings.json': ('load_soundboard_settings', 'save_soundboard_settings'),
+    'skill_sound_settings.json': ('load_skill_sound_settings', 'save_skill_sound_settings'),
+}
+
+# filename -> (cache object the view was built from, view)
+_VIEWS = {}
+
+
+async def load_view(filename):
+    """Copy-free, read-only view of a cached data/ document.
+
+    Mappings come back as a types.MappingProxyType and lists as a tuple
+    snapshot. The same view object is returned until the cache is replaced by
+    a save or an invalidation."""
+    loader_name, _ = _VIEW_SOURCES[filename]
+    var_name = _DATA_CACHE_VAR_BY_FILENAME[filename]
+    cache = globals()[var_name]
+    if cache is None:
+        await globals()[loader_name]()
+        cache = globals()[var_name]
+    cached = _VIEWS.get(filename)
+    if cached is not None and cached[0] is cache:
+        return cached[1]
+    view = tuple(cache) if isinstance(cache, list) else MappingProxyType(cache)
+    _VIEWS[filename] = (cache, view)
+    return view
+
+
+@contextlib.asynccontextmanager
+async def edit_data(filename):
+    """Yield a private, mutable deep copy of a data/ document and commit it
+    with the entity's save_X() when the block exits without an exception."""
+    _, saver_name = _VIEW_SOURCES[filename]
+    await load_view(filename)
+    draft = copy.deepcopy(globals()[_DATA_CACHE_VAR_BY_FILENAME[filename]])
+    yield draft
+    await globals()[saver_name](draft)
+
+
+# --- Write-Behind Persistence ---
+# save_X() rewrites the whole multi-guild document on every call. Hot paths
+# (a karma vote, a luck spend after a roll) instead mutate the live object
+# returned by load_X() and call mark_dirty(filename, guild_id). A background
+# flusher (write_behind_flusher(), started by bot.py) coalesces every mark
+# received during one interval into a single atomic temp-file-plus-rename
+# write per file, and flush_dirty() runs once more on shutdown.
+#
+# Only entities whose load_X() hands out the cached object itself (not a
+# .copy()) can be marked dirty -- mutating a copy would never reach the
+# cache that the flusher serializes.
+WRITE_BEHIND_FILES = frozenset({
+    'player_stats.json',
+    'server_stats.json',
+    'session_data.json',
+    'karma_stats.json',
+    'rss_data.json',
+    'retired_characters_data.json',
+    'gamemode.json',
+    'reaction_roles.json',
+    'giveaway_data.json',
+    'giveaway_archive.json',
+    'polls_data.json',
+    'journal_data.json',
+    'gamerole_settings.json',
+    'enroll_settings.json',
+    'reminder_data.json',
+})
+DEFAULT_WRITE_BEHIND_INTERVAL = 5.0
+
+# filename -> set of dirty guild ids, or None when the whole document is dirty
+_DIRTY = {}
+# filename -> (id of the document object, {guild_id: serialized fragment})
+_FRAGMENTS = {}
+_FLUSH_LOCK = asyncio.Lock()
+_WRITE_BEHIND_STATS = {
+    "marks": 0,
+    "flushes": 0,
+    "files_written": 0,
+    "fragments_serialized": 0,
+    "fragments_reused": 0,
+    "bytes_written": 0,
+    "errors": 0,
+    "last_flush_ms": 0.0,
+    "max_flush_ms": 0.0,
+    "total_flush_ms": 0.0,
+}
+
+
+def mark_dirty(filename, guild_id=None):
+    """Schedule `filename` for the next write-behind flush.
+
+    Pass the guild whose entry was changed so only that guild's part of the
+    document is re-serialized; omit it when the change spans guilds or the
+    top level of the document."""
+    if filename not in WRITE_BEHIND_FILES:
+        raise ValueError(f"{filename} does not support write-behind persistence")
+    _WRITE_BEHIND_STATS["marks"] += 1
+    if guild_id is None:
+        _DIRTY[filename] = None
+        return
+    if filename in _DIRTY and _DIRTY[filename] is None:
+        return
+    _DIRTY.setdefault(filename, set()).add(str(guild_id))
+
+
+def has_pending_writes():
+    """True if any marked entity has not been flushed to disk yet."""
+    return bool(_DIRTY)
+
+
+def get_write_behind_stats():
+    """Snapshot of the write-behind counters, for the dashboard and logs."""
+    stats = dict(_WRITE_BEHIND_STATS)
+    stats["pending_files"] = len(_DIRTY)
+    stats["marks_coalesced"] = max(0, stats["marks"] - stats["files_written"] - stats["pending_files"])
+    stats["avg_flush_ms"] = (stats["total_flush_ms"] / stats["flushes"]) if stats["flushes"] else 0.0
+    return stats
+
+
+def _serialize_document(filename, data, dirty_guilds):
+    """Serialize `data` exactly like json.dumps(data, indent=4), re-encoding
+    only the guild entries in `dirty_guilds` (None means all of them) and
+    reusing cached fragments for every other guild."""
+    if not isinstance(data, dict) or not data or not all(isinstance(k, str) for k in data):
+        _FRAGMENTS.pop(filename, None)
+        _WRITE_BEHIND_STATS["fragments_serialized"] += 1
+        return json.dumps(data, indent=4)
+
+    doc_id, fragments = _FRAGMENTS.get(filename, (None, {}))
+    if doc_id != id(data):
+        # The cache was replaced by a full save/reload; nothing to reuse.
+        fragments = {}
+        dirty_guilds = None
+
+    new_fragments = {}
+    lines = []
+    for key, value in data.items():
+        fragment = fragments.get(key)
+        if fragment is None or dirty_guilds is None or key in dirty_guilds:
+            fragment = json.dumps(value, indent=4).replace('\n', '\n    ')
+            _WRITE_BEHIND_STATS["fragments_serialized"] += 1
+        else:
+            _WRITE_BEHIND_STATS["fragments_reused"] += 1
+        new_fragments[key] = fragment
+        lines.append(f"    {json.dumps(key)}: {fragment}")
+    _FRAGMENTS[filename] = (id(data), new_fragments)
+    return "{\n" + ",\n".join(lines) + "\n}"
+
+
+async def _atomic_write_text(folder, filename, text):
+    """Write `text` to a temp file next to the target, then rename it over the
+    target so a crash mid-write can never leave a truncated JSON file."""
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    file_path = os.path.join(folder, filename)
+    tmp_path = file_path + ".tmp"
+    async with aiofiles.open(tmp_path, 'w', encoding='utf-8') as file:
+        await file.write(text)
+    os.replace(tmp_path, file_path)
+
+
+async def _flush_to_sqlite(filename, data, dirty_guilds):
+    """Write only the dirty guilds' rows; returns the JSON that was stored so
+    the byte counters stay comparable with the JSON backend."""
+    store = _get_sqlite_store()
+    entity = SQLITE_ENTITIES[filename]
+    if dirty_guilds is None:
+        await asyncio.to_thread(store.save_document, entity, data)
+        return json.dumps(data)
+    guilds = {guild_id: data.get(guild_id) for guild_id in dirty_guilds}
+    await asyncio.to_thread(store.save_guilds, entity, guilds)
+    return json.dumps(guilds)
+
+
+async def flush_dirty():
+    """Write every entity marked dirty since the last flush. Returns the
+    number of files written."""
+    async with _FLUSH_LOCK:
+        if not _DIRTY:
+            return 0
+        pending = dict(_DIRTY)
+        _DIRTY.clear()
+        started = time.perf_counter()
+        written = 0
+        for filename, dirty_guilds in pending.items():
+            data = globals()[_DATA_CACHE_VAR_BY_FILENAME[filename]]
+            if data is None:
+                # Cache was invalidated after the mark; the file on disk is newer.
+                continue
+            try:
+                if _sqlite_enabled(filename):
+                    text = await _flush_to_sqlite(filename, data, dirty_guilds)
+                else:
+                    text = _serialize_document(filename, data, dirty_guilds)
+                    await _atomic_write_text(DATA_FOLDER, filename, text)
+            except Exception as e:
+                logger.error(f"Write-behind flush of {filename} failed: {e}")
+                _WRITE_BEHIND_STATS["errors"] += 1
+                # Keep it dirty so the next flush retries the whole document.
+                _DIRTY[filename] = None
+                _FRAGMENTS.pop(filename, None)
+                continue
+            written += 1
+            _WRITE_BEHIND_STATS["files_written"] += 1
+            _WRITE_BEHIND_STATS["bytes_written"] += len(text.encode('utf-8'))
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _WRITE_BEHIND_STATS["flushes"] += 1
+        _WRITE_BEHIND_STATS["last_flush_ms"] = elapsed_ms
+        _WRITE_BEHIND_STATS["total_flush_ms"] += elapsed_ms
+        _WRITE_BEHIND_STATS["max_flush_ms"] = max(_WRITE_BEHIND_STATS["max_flush_ms"], elapsed_ms)
+        return written
+
+
+async def write_behind_flusher(interval=DEFAULT_WRITE_BEHIND_INTERVAL):
+    """Background task: flush dirty entities every `interval` seconds, and
+    one final time when cancelled at shutdown."""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await flush_dirty()
+    finally:
+        await flush_dirty()
+
+
+
+# --- Single-Entity Access ---
+# Read or replace one (guild_id, entity_id) value without touching the rest of
+# the document. With the SQLite backend and a cold cache this is a single-row
+# query; otherwise it is served from (and kept consistent with) the cached
+# document. Note that load_player_stats()'s schema back-fill only runs on
+# whole-document loads. This is opt-in: once any caller uses load_X() the whole
+# document is cached, so memory still scales with the number of guilds.
+_ROW_ENTITY_LOADERS = {
+    'player_stats.json': load_player_stats,
+    'karma_stats.json': load_karma_stats,
+    'journal_data.json': load_journal_data,
+    'giveaway_data.json': load_giveaway_data,
+}
+
+async def load_entity(filename, guild_id, entity_id, default=None):
+    """Return one entity's value from a per-guild document, or `default`."""
+    guild_id, entity_id = str(guild_id), str(entity_id)
+    document = globals()[_DATA_CACHE_VAR_BY_FILENAME[filename]]
+    if document is None:
+        if _sqlite_enabled(filename):
+            value = await asyncio.to_thread(
+                _get_sqlite_store().get_row, SQLITE_ENTITIES[filename], guild_id, entity_id
+            )
+            return default if value is None else value
+        document = await _ROW_ENTITY_LOADERS[filename]()
+    guild = document.get(guild_id)
+    if not isinstance(guild, dict):
+        return default
+    return guild.get(entity_id, default)
+
+async def save_entity(filename, guild_id, entity_id, value):
+    """Replace one entity's value in a per-guild document.
+
+    SQLite writes that single row immediately; JSON marks the guild dirty for
+    the write-behind flusher."""
+    guild_id, entity_id = str(guild_id), str(entity_id)
+    document = globals()[_DATA_CACHE_VAR_BY_FILENAME[filename]]
+    if _sqlite_enabled(filename):
+        if document is not None:
+            document.setdefault(guild_id, {})[entity_id] = value
+        async with _FLUSH_LOCK:
+            await asyncio.to_thread(
+                _get_sqlite_store().put_row, SQLITE_ENTITIES[filename], guild_id, entity_id, value
+            )
+        return
+    if document is None:
+        document = await _ROW_ENTITY_LOADERS[filename]()
+    document.setdefault(guild_id, {})[entity_id] = value
+    mark_dirty(filename, guild_id)
@@ -0,0 +1,292 @@
+"""Content-addressed PNG cache for codex posters and character sheets.
+
+Codex entries in infodata/ never change between requests, yet every poster
+used to re-render its /render page in Chromium. RenderCache.key_for(path)
+hashes everything the page depends on (route, query parameters, the mtimes
+of its template and the shared includes, the theme/font settings, the
+entry's image file and a hash of the data record itself) so a cached PNG is
+only ever served for identical inputs. Entries live as files under
+data/render_cache/ and are evicted least-recently-used once the folder
+exceeds `max_bytes`.
+
+Character sheet entries are named after their investigator and record hash,
+so forget_changed_characters(), registered as a player_stats.json save
+listener in bot.py, can delete sheets whose investigator has changed.
+Routes not listed here (karma cards, handouts) return None and are never
+cached.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import urllib.parse
+from collections import OrderedDict
+
+from dashboard.file_utils import sanitize_filename, ALLOWED_IMAGE_EXTENSIONS
+from dashboard.state import IMAGES_FOLDER
+from loadnsave import (
+    load_player_stats, load_settings_async,
+    load_monsters_data, load_deities_data, load_spells_data, load_weapons_data,
+    load_archetype_data, load_pulp_talents_data, load_madness_insane_talent_data,
+    load_manias_data, load_phobias_data, load_poisons_data, load_skills_data,
+    load_inventions_data, load_years_data, load_occupations_data,
+)
+
+TEMPLATES_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard", "templates")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Settings injected into every render template by dashboard.app.inject_theme
+THEME_SETTINGS = ("dashboard_theme", "dashboard_fonts", "origin_fonts")
+
+# route -> (loader, list key, entry key, template); a None list key means the
+# data is a dict keyed by entry name. Mirrors dashboard/blueprints/render.py.
+_CODEX_SOURCES = {
+    "monster": (load_monsters_data, "monsters", "monster_entry", "render_monster.html"),
+    "deity": (load_deities_data, "deities", "deity_entry", "render_deity.html"),
+    "spell": (load_spells_data, "spells", "spell_entry", "render_spell.html"),
+    "weapon": (load_weapons_data, None, None, "render_weapon.html"),
+    "archetype": (load_archetype_data, None, None, "render_archetype.html"),
+    "pulp_talent": (load_pulp_talents_data, None, None, "render_pulp_talent.html"),
+    "insane_talent": (load_madness_insane_talent_data, None, None, "render_simple_entry.html"),
+    "mania": (load_manias_data, None, None, "render_simple_entry.html"),
+    "phobia": (load_phobias_data, None, None, "render_simple_entry.html"),
+    "poison": (load_poisons_data, None, None, "render_poison.html"),
+    "skill": (load_skills_data, None, None, "render_simple_entry.html"),
+    "invention": (load_inventions_data, None, None, "render_timeline.html"),
+    "year": (load_years_data, None, None, "render_timeline.html"),
+    "occupation": (load_occupations_data, None, None, "render_occupation.html"),
+}
+# Routes with an ?style=origin variant
+_ORIGIN_TEMPLATES = {
+    "monster": "render_monster_origin.html",
+    "deity": "render_deity_origin.html",
+    "spell": "render_spell_origin.html",
+}
+
+_CHARACTER_FILE = re.compile(r"^char-(\d+)-(\d+)-([0-9a-f]{16})-([0-9a-f]{64})\.png$")
+_CODEX_FILE = re.compile(r"^([0-9a-f]{64})\.png$")
+
+
+def record_hash(record):
+    """Stable 16-hex-digit hash of a JSON-serializable data record."""
+    encoded = json.dumps(record, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _find_codex_record(route, data, name):
+    """(canonical name, record) for `name`, matched case-insensitively like render.py."""
+    _, list_key, entry_key, _ = _CODEX_SOURCES[route]
+    name_lower = name.lower()
+    if list_key is not None:
+        for item in data.get(list_key, []):
+            entry = item.get(entry_key)
+            if entry and entry.get("name", "").lower() == name_lower:
+                return entry["name"], entry
+        return None
+    if route == "pulp_talent":
+        for category, talents in data.items():
+            for t_str in talents:
+                match = re.match(r'\*\*(.*?)\*\*:\s*(.*)', t_str)
+                if match and match.group(1).lower() == name_lower:
+                    return match.group(1), {"category": category, "text": t_str}
+        return None
+    for key, value in data.items():
+        if key.lower() == name_lower:
+            return key, value
+    return None
+
+
+def _character_record(player_stats, guild_id, user_id):
+    guild_data = player_stats.get(guild_id) if isinstance(player_stats, dict) else None
+    return guild_data.get(user_id) if isinstance(guild_data, dict) else None
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _template_mtimes(template):
+    includes = os.path.join(TEMPLATES_FOLDER, "includes")
+    try:
+        include_names = sorted(os.listdir(includes))
+    except OSError:
+        include_names = []
+    return [_mtime(os.path.join(TEMPLATES_FOLDER, template))] + [
+        _mtime(os.path.join(includes, n)) for n in include_names
+    ]
+
+
+def _image_identity(type_slug, name):
+    """Path and mtime of the entry's uploaded image, matching get_image_url()."""
+    safe_name = sanitize_filename(name)
+    for ext in ALLOWED_IMAGE_EXTENSIONS:
+        path = os.path.join(IMAGES_FOLDER, type_slug, f"{safe_name}{ext}")
+        mtime = _mtime(path)
+        if mtime is not None:
+            return [path, mtime]
+    return None
+
+
+class RenderCache:
+    def __init__(self, folder, max_bytes=DEFAULT_MAX_BYTES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._entries = None  # filename -> size, least recently used first
+        self._total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+    async def key_for(self, path):
+        """Cache filename for a /render path, or None if the page must not be cached."""
+        parsed = urllib.parse.urlsplit(path)
+        parts = [urllib.parse.unquote(p) for p in parsed.path.strip("/").split("/")]
+        if len(parts) < 2 or parts[0] != "render":
+            return None
+        route = parts[1]
+        params = sorted(urllib.parse.parse_qsl(parsed.query))
+        settings = await load_settings_async()
+        material = {
+            "route": route,
+            "params": params,
+            "theme": {k: settings.get(k) for k in THEME_SETTINGS},
+        }
+
+        if route == "character" and len(parts) == 4:
+            guild_id, user_id = parts[2], parts[3]
+            if not (guild_id.isdigit() and user_id.isdigit()):
+                return None
+            record = _character_record(await load_player_stats(), guild_id, user_id)
+            if not record:
+                return None
+            rh = record_hash(record)
+            material.update(record=rh, templates=_template_mtimes("render_character.html"))
+            return f"char-{guild_id}-{user_id}-{rh}-{self._digest(material)}.png"
+
+        if route not in _CODEX_SOURCES or len(parts) != 2:
+            return None
+        query = dict(params)
+        name = query.get("name")
+        if not name:
+            return None
+        found = _find_codex_record(route, await _CODEX_SOURCES[route][0](), name)
+        if found is None:
+            return None
+        canonical, record = found
+        template = _CODEX_SOURCES[route][3]
+        if query.get("style") == "origin" and route in _ORIGIN_TEMPLATES:
+            template = _ORIGIN_TEMPLATES[route]
+        material.update(
+            record=record_hash(record),
+            templates=_template_mtimes(template),
+            image=_image_identity(route, canonical),
+        )
+        return f"{self._digest(material)}.png"
+
+    @staticmethod
+    def _digest(material):
+        return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _index(self):
+        if self._entries is None:
+            found = []
+            try:
+                with os.scandir(self.folder) as it:
+                    for entry in it:
+                        if _CHARACTER_FILE.match(entry.name) or _CODEX_FILE.match(entry.name):
+                            st = entry.stat()
+                            found.append((st.st_mtime, entry.name, st.st_size))
+            except FileNotFoundError:
+                pass
+            found.sort()
+            self._entries = OrderedDict((name, size) for _, name, size in found)
+            self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    async def get(self, key):
+        """Cached PNG bytes for `key`, or None. A hit makes the entry most recently used."""
+        entries = self._index()
+        if key not in entries:
+            self.stats["misses"] += 1
+            return None
+        path = os.path.join(self.folder, key)
+        try:
+            data = await asyncio.to_thread(self._read_and_touch, path)
+        except OSError:
+            self._drop(key)
+            self.stats["misses"] += 1
+            return None
+        entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return data
+
+    @staticmethod
+    def _read_and_touch(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        # mtime doubles as last-use time so LRU order survives a restart
+        os.utime(path)
+        return data
+
+    async def put(self, key, data):
+        entries = self._index()
+        await asyncio.to_thread(self._write, key, data)
+        if key in entries:
+            self._total_bytes -= entries[key]
+        entries[key] = len(data)
+        entries.move_to_end(key)
+        self._total_bytes += len(data)
+        self.stats["stores"] += 1
+        self._evict()
+
+    def _write(self, key, data):
+        os.makedirs(self.folder, exist_ok=True)
+        tmp_path = os.path.join(self.folder, key + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(self.folder, key))
+
+    def _evict(self):
+        entries = self._index()
+        while self._total_bytes > self.max_bytes and len(entries) > 1:
+            key = next(iter(entries))
+            self._drop(key)
+            self.stats["evictions"] += 1
+
+    def _drop(self, key):
+        size = self._index().pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+        try:
+            os.remove(os.path.join(self.folder, key))
+        except OSError:
+            pass
+
+    def forget_changed_characters(self, player_stats):
+        """Delete character sheets whose investigator was removed or changed.
+
+        Registered with loadnsave.add_save_listener('player_stats.json', ...).
+        Only investigators that have cached sheets are hashed.
+        """
+        current = {}
+        for key in list(self._index()):
+            match = _CHARACTER_FILE.match(key)
+            if not match:
+                continue
+            guild_id, user_id, rh = match.group(1), match.group(2), match.group(3)
+            if (guild_id, user_id) not in current:
+                record = _character_record(player_stats, guild_id, user_id)
+                current[(guild_id, user_id)] = record_hash(record) if record else None
+            if current[(guild_id, user_id)] != rh:
+                self._drop(key)
+                self.stats["invalidations"] += 1
+
+    def snapshot(self):
+        """Counters for /api/status."""
+        return {
+            **self.stats,
+            "entries": len(self._index()),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,230 @@
+"""Shared headless-Chromium renderer for the dashboard's /render pages.
+
+Codex posters, printed character sheets and karma rank cards are all
+screenshots of a page served by the local dashboard. RenderService keeps one
+browser warm for the whole bot with a small pool of reusable pages; jobs
+beyond the pool size queue on a semaphore (bounded by `queue_timeout`)
+instead of each launching its own Chromium, which is what used to happen on
+a burst of karma rank-ups.
+
+    png = await bot.render_service.render("/render/karma/1/2", ".karma-card", (800, 400))
+
+With a RenderCache attached, pages it knows how to key (codex posters,
+character sheets) are served from data/render_cache/ without touching the
+browser.
+"""
+import asyncio
+import time
+
+from lazy_imports import lazy_import
+
+playwright_api = lazy_import("playwright.async_api")
+
+DEFAULT_MAX_PAGES = 2          # concurrent renders; each page is a Chromium renderer process
+DEFAULT_QUEUE_TIMEOUT = 30     # seconds a job may wait for a free page
+DEFAULT_JOB_TIMEOUT = 30       # seconds for navigation, selector wait and screenshot together
+NAVIGATION_TIMEOUT_MS = 10000
+SELECTOR_TIMEOUT_MS = 5000
+
+
+class RenderError(Exception):
+    """A render job failed.
+
+    `status` is the HTTP status when the dashboard answered with an error
+    page, and None when it could not be reached, timed out or was busy.
+    """
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class RenderService:
+    def __init__(self, max_pages=DEFAULT_MAX_PAGES, queue_timeout=DEFAULT_QUEUE_TIMEOUT,
+                 job_timeout=DEFAULT_JOB_TIMEOUT, port=5000, cache=None):
+        self.max_pages = max(1, int(max_pages))
+        self.queue_timeout = queue_timeout
+        self.job_timeout = job_timeout
+        self.port = port
+        self.cache = cache
+        self._slots = asyncio.Semaphore(self.max_pages)
+        self._launch_lock = asyncio.Lock()
+        self._idle_pages = []
+        self._playwright = None
+        self._browser = None
+        self._waiting = 0
+        self.stats = {
+            "jobs": 0,
+            "cache_hits": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "busy": 0,
+            "launches": 0,
+            "pages_created": 0,
+            "max_waiting": 0,
+            "last_render_ms": None,
+        }
+
+    def url_for(self, path):
+        """Absolute dashboard URL for a /render path (already absolute URLs pass through)."""
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    async def render(self, path, selector, viewport, full_page=False, omit_background=False):
+        """Screenshot `selector` on the dashboard page at `path` and return PNG bytes.
+
+        Falls back to a page screenshot (`full_page` controls its extent)
+        when the selector never appears. Raises RenderError on navigation
+        failures, non-2xx responses and timeouts.
+        """
+        cache_key = None
+        if self.cache is not None:
+            try:
+                cache_key = await self.cache.key_for(path)
+                if cache_key is not None:
+                    cached = await self.cache.get(cache_key)
+                    if cached is not None:
+                        self.stats["cache_hits"] += 1
+                        return cached
+            except Exception as e:
+                print(f"RenderService: render cache lookup for {path} failed: {e}")
+                cache_key = None
+
+        data = await self._run_job(path, selector, viewport, full_page, omit_background)
+        if cache_key is not None:
+            try:
+                await self.cache.put(cache_key, data)
+            except Exception as e:
+                print(f"RenderService: could not cache render of {path}: {e}")
+        return data
+
+    async def _run_job(self, path, selector, viewport, full_page, omit_background):
+        self.stats["jobs"] += 1
+        self._waiting += 1
+        self.stats["max_waiting"] = max(self.stats["max_waiting"], self._waiting)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats["busy"] += 1
+            raise RenderError("Renderer is busy, please try again shortly.")
+        finally:
+            self._waiting -= 1
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(
+                self._render(self.url_for(path), selector, viewport, full_page, omit_background),
+                self.job_timeout,
+            )
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise RenderError("Rendering timed out.")
+        except RenderError:
+            self.stats["failed"] += 1
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            raise RenderError(str(e)) from e
+        finally:
+            self.stats["last_render_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self._slots.release()
+
+    async def _render(self, url, selector, viewport, full_page, omit_background):
+        page = await self._acquire_page(viewport)
+        reusable = False
+        try:
+            try:
+                response = await page.goto(url, timeout=NAVIGATION_TIMEOUT_MS)
+            except Exception as e:
+                print(f"RenderService: navigation to {url} failed: {e}")
+                raise RenderError("Failed to load internal dashboard URL. Is the dashboard running?") from e
+
+            reusable = True
+            if not response or not response.ok:
+                status = response.status if response else None
+                raise RenderError(f"Dashboard returned status {status}.", status=status or "Unknown")
+
+            try:
+                element = await page.wait_for_selector(selector, timeout=SELECTOR_TIMEOUT_MS)
+            except Exception:
+                element = None
+
+            if element:
+                return await element.screenshot(omit_background=omit_background)
+            return await page.screenshot(full_page=full_page, omit_background=omit_background)
+        except RenderError:
+            raise
+        except BaseException:
+            # A page interrupted mid-screenshot (or cancelled by job_timeout) is not worth reusing.
+            reusable = False
+            raise
+        finally:
+            await self._release_page(page, reusable)
+
+    async def _get_browser(self):
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            await self._shutdown_browser()
+            self._playwright = await playwright_api.async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch()
+            except Exception:
+                await self._shutdown_browser()
+                raise
+            self.stats["launches"] += 1
+            print("RenderService: Chromium launched.")
+            return self._browser
+
+    async def _acquire_page(self, viewport):
+        browser = await self._get_browser()
+        width, height = viewport
+        while self._idle_pages:
+            page = self._idle_pages.pop()
+            if page.is_closed():
+                continue
+            await page.set_viewport_size({'width': width, 'height': height})
+            return page
+        self.stats["pages_created"] += 1
+        return await browser.new_page(viewport={'width': width, 'height': height})
+
+    async def _release_page(self, page, reusable):
+        if reusable and not page.is_closed() and len(self._idle_pages) < self.max_pages:
+            self._idle_pages.append(page)
+            return
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def _shutdown_browser(self):
+        self._idle_pages.clear()
+        browser, self._browser = self._browser, None
+        pw, self._playwright = self._playwright, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if pw is not None:
+            try:
+                await pw.stop()
+            except Exception:
+                pass
+
+    async def close(self):
+        """Close the pooled pages and the browser; the next render relaunches it."""
+        async with self._launch_lock:
+            await self._shutdown_browser()
+
+    def snapshot(self):
+        """Counters for /api/status."""
+        return {
+            **self.stats,
+            "browser_running": self._browser is not None,
+            "idle_pages": len(self._idle_pages),
+            "waiting": self._waiting,
+            "max_pages": self.max_pages,
+            "cache": self.cache.snapshot() if self.cache is not None else None,
+        }
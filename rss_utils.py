@@ -1,11 +1,291 @@
 import re
+import time
+import heapq
+import random
 import asyncio
-import yt_dlp
+import hashlib
+import calendar
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import aiohttp
+from lazy_imports import lazy_import
+from loadnsave import load_youtube_channel_cache, save_youtube_channel_cache
+
+yt_dlp = lazy_import("yt_dlp")
+feedparser = lazy_import("feedparser")
+
+FEED_FETCH_CONCURRENCY = 8    # simultaneous HTTP requests
+FEED_PARSE_WORKERS = 2        # feedparser threads; kept off the default executor
+FEED_FETCH_TIMEOUT = 20       # seconds per request
+FEED_USER_AGENT = "CthulhuBot RSS reader"
+
+MIN_POLL_INTERVAL = 120            # seconds
+DEFAULT_POLL_INTERVAL = 300        # the old fixed 5-minute loop
+MAX_POLL_INTERVAL = 6 * 3600
+UNCHANGED_BACKOFF = 1.5            # interval growth per 304 / poll without news
+ERROR_BACKOFF = 2.0
+POLL_JITTER = 0.1                  # +/-10% so feeds don't drift into bursts
+
+
+class FeedFetcher:
+    """Downloads feeds on one shared aiohttp session using conditional GETs.
+
+    Only bodies that actually changed are handed to feedparser, in a small
+    dedicated thread pool. fetch() returns a dict:
+        status        HTTP status (304 = unchanged), None on a network error
+        feed          feedparser result for a changed body, otherwise None
+        etag, last_modified   validators to send on the next fetch
+        error         str or None
+        elapsed_ms    download + parse time
+    """
+
+    def __init__(self, concurrency=FEED_FETCH_CONCURRENCY, parse_workers=FEED_PARSE_WORKERS,
+                 timeout=FEED_FETCH_TIMEOUT):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix="feedparser")
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+        self.stats = {"requests": 0, "not_modified": 0, "parsed": 0, "errors": 0, "bytes": 0}
+
+    def get_session(self):
+        """The shared session, also handy for get_youtube_rss_url(session=...).
+        Created on first use so it binds to the running loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self._timeout, headers={"User-Agent": FEED_USER_AGENT})
+        return self._session
+
+    async def fetch(self, link, etag=None, last_modified=None):
+        result = {"status": None, "feed": None, "etag": etag, "last_modified": last_modified,
+                  "error": None, "elapsed_ms": 0.0}
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        started = time.perf_counter()
+        body = None
+        self.stats["requests"] += 1
+        try:
+            async with self._semaphore:
+                async with self.get_session().get(link, headers=headers) as response:
+                    result["status"] = response.status
+                    if response.status == 200:
+                        body = await response.read()
+                        response_headers = {
+                            "content-type": response.headers.get("Content-Type", ""),
+                            "content-location": str(response.url),
+                        }
+                        result["etag"] = response.headers.get("ETag")
+                        result["last_modified"] = response.headers.get("Last-Modified")
+                    elif response.status != 304:
+                        result["error"] = f"HTTP {response.status}"
+
+            if result["status"] == 304:
+                self.stats["not_modified"] += 1
+            elif body is not None:
+                self.stats["bytes"] += len(body)
+                loop = asyncio.get_running_loop()
+                result["feed"] = await loop.run_in_executor(
+                    self._executor, partial(feedparser.parse, body, response_headers=response_headers)
+                )
+                self.stats["parsed"] += 1
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            result["error"] = str(e) or type(e).__name__
+
+        if result["error"]:
+            self.stats["errors"] += 1
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._executor.shutdown(wait=False)
+
+
+def estimate_publish_interval(entries, sample=10):
+    """Median gap in seconds between the newest entries' timestamps, or None."""
+    stamps = []
+    for entry in entries[:sample]:
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if parsed:
+            stamps.append(calendar.timegm(parsed))
+    stamps.sort(reverse=True)
+    gaps = [newer - older for newer, older in zip(stamps, stamps[1:]) if newer > older]
+    return statistics.median(gaps) if gaps else None
+
+
+class FeedScheduler:
+    """Per-feed poll times kept on a min-heap, each feed with its own interval.
+
+    A feed with news is polled at half its typical publish gap; every 304 or
+    poll without news stretches the interval by UNCHANGED_BACKOFF, up to twice
+    that gap (or 4x the default when the feed has no timestamps), and errors
+    double it. Intervals are clamped to [MIN_POLL_INTERVAL, MAX_POLL_INTERVAL]
+    and jittered, and newly seen feeds are spread over one default interval,
+    so polls trickle out instead of arriving in bursts.
+
+    Times are epoch seconds so the dashboard can display them directly.
+    Every link returned by pop_due() must be passed back to record().
+    """
+
+    def __init__(self, spread=DEFAULT_POLL_INTERVAL, rng=None):
+        self._heap = []      # (due, link); entries for removed/rescheduled feeds are skipped
+        self.feeds = {}      # link -> state dict, see sync()
+        self._spread = spread
+        self._rng = rng or random.Random()
+
+    def _offset(self, link):
+        if not self._spread:
+            return 0
+        digest = hashlib.sha1(link.encode('utf-8')).digest()
+        return int.from_bytes(digest[:4], 'big') % int(self._spread)
+
+    def _push(self, link, when):
+        self.feeds[link]["next_poll"] = when
+        heapq.heappush(self._heap, (when, link))
+
+    def sync(self, links, now=None):
+        """Start tracking new links and forget ones no longer subscribed."""
+        now = time.time() if now is None else now
+        links = set(links)
+        for link in self.feeds.keys() - links:
+            del self.feeds[link]
+        for link in links - self.feeds.keys():
+            self.feeds[link] = {
+                "interval": DEFAULT_POLL_INTERVAL,
+                "publish_interval": None,
+                "next_poll": None,
+                "last_poll": None,
+                "last_status": None,
+                "latency_ms": None,
+                "avg_latency_ms": None,
+                "errors": 0,
+            }
+            self._push(link, now + self._offset(link))
+
+    def pop_due(self, now=None):
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, link = heapq.heappop(self._heap)
+            state = self.feeds.get(link)
+            if state is not None and state["next_poll"] == when:
+                due.append(link)
+        return due
+
+    def next_due_in(self, now=None):
+        """Seconds until the earliest scheduled poll, or None if idle."""
+        now = time.time() if now is None else now
+        while self._heap:
+            when, link = self._heap[0]
+            state = self.feeds.get(link)
+            if state is not None and state["next_poll"] == when:
+                return max(when - now, 0.0)
+            heapq.heappop(self._heap)
+        return None
+
+    def record(self, link, result, has_new=False, now=None):
+        """Reschedule `link` from a FeedFetcher result."""
+        state = self.feeds.get(link)
+        if state is None:
+            return
+        now = time.time() if now is None else now
+        state["last_poll"] = now
+        state["last_status"] = result["status"]
+        state["latency_ms"] = result["elapsed_ms"]
+        if state["avg_latency_ms"] is None:
+            state["avg_latency_ms"] = result["elapsed_ms"]
+        else:
+            state["avg_latency_ms"] = round(0.8 * state["avg_latency_ms"] + 0.2 * result["elapsed_ms"], 1)
+
+        if result["error"]:
+            state["errors"] += 1
+            interval = state["interval"] * ERROR_BACKOFF
+        else:
+            state["errors"] = 0
+            if result["feed"] is not None:
+                state["publish_interval"] = estimate_publish_interval(result["feed"].entries) or state["publish_interval"]
+            target = state["publish_interval"] / 2 if state["publish_interval"] else DEFAULT_POLL_INTERVAL
+            if has_new:
+                interval = target
+            else:
+                interval = min(state["interval"] * UNCHANGED_BACKOFF, target * 4)
+        state["interval"] = min(max(interval, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL)
+
+        jitter = 1 + self._rng.uniform(-POLL_JITTER, POLL_JITTER)
+        self._push(link, now + state["interval"] * jitter)
+
+    def snapshot(self):
+        return {link: dict(state) for link, state in self.feeds.items()}
+
+
+YOUTUBE_CHANNEL_TTL = 30 * 86400    # resolved handle/video -> channel mappings
+YOUTUBE_NEGATIVE_TTL = 3600          # URLs nothing could resolve, retried hourly
+YOUTUBE_CACHE_MAX_ENTRIES = 2000
+YOUTUBE_HTML_TIMEOUT = 10
+# The cookie skips the EU consent interstitial, which has no channel metadata.
+_YOUTUBE_HTML_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; CthulhuBot)",
+    "Accept-Language": "en-US,en;q=0.8",
+    "Cookie": "CONSENT=YES+1",
+}
+# Most specific first: a channel page's canonical link, then embedded metadata
+# (watch pages carry the uploader's ID in the itemprop/channelId fields).
+_CHANNEL_ID_PATTERNS = [
+    re.compile(r'<link rel="canonical" href="https://www\.youtube\.com/channel/(UC[\w-]{22})"'),
+    re.compile(r'"externalId":"(UC[\w-]{22})"'),
+    re.compile(r'<meta itemprop="(?:channelId|identifier)" content="(UC[\w-]{22})"'),
+    re.compile(r'"channelId":"(UC[\w-]{22})"'),
+]
+
+
+def _youtube_feed_url(channel_id):
+    return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+
+
+def _youtube_cache_key(url):
+    return re.sub(r'^(https?://)?(www\.|m\.)?', '', url.strip()).rstrip('/')
+
+
+def channel_id_from_html(html):
+    for pattern in _CHANNEL_ID_PATTERNS:
+        match = pattern.search(html)
+        if match:
+            return match.group(1)
+    return None
+
+
+async def _fetch_channel_id_from_html(url, session=None):
+    """One plain GET of the YouTube page; None if it fails or has no ID."""
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession()
+    try:
+        async with session.get(url, headers=_YOUTUBE_HTML_HEADERS,
+                               timeout=aiohttp.ClientTimeout(total=YOUTUBE_HTML_TIMEOUT)) as response:
+            if response.status != 200:
+                return None
+            html = await response.text(errors='replace')
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        return None
+    finally:
+        if own_session:
+            await session.close()
+    return channel_id_from_html(html)
+
 
 async def get_youtube_rss_url(url, session=None):
     """
     Analyzes a URL and returns the YouTube RSS Feed URL if it's a YouTube channel/video link.
     Returns None if no YouTube RSS feed could be determined.
+
+    Handle and video URLs are resolved from the page HTML first and only fall
+    back to a yt-dlp extraction when that fails; results (including failures,
+    for an hour) are cached in data/youtube_channel_cache.json. Pass an
+    aiohttp `session` to reuse its connections for the HTML request.
     """
 
     # 1. Check if it's already a YouTube RSS URL
@@ -20,9 +300,21 @@ async def get_youtube_rss_url(url, session=None):
     # Matches /channel/UCxxxxxxxx
     channel_id_match = re.search(r'youtube\.com/channel/(UC[\w-]+)', url)
     if channel_id_match:
-        return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id_match.group(1)}"
+        return _youtube_feed_url(channel_id_match.group(1))
+
+    # 4. Previously resolved URL
+    key = _youtube_cache_key(url)
+    cache = await load_youtube_channel_cache()
+    cached = cache.get(key)
+    if cached:
+        ttl = YOUTUBE_CHANNEL_TTL if cached.get("channel_id") else YOUTUBE_NEGATIVE_TTL
+        if time.time() - cached.get("resolved_at", 0) < ttl:
+            return _youtube_feed_url(cached["channel_id"]) if cached.get("channel_id") else None
+
+    # 5. Lightweight path: the channel ID is embedded in the page HTML
+    channel_id = await _fetch_channel_id_from_html(url, session)
 
-    # 4. Use yt-dlp to find channel ID (Robust method)
+    # 6. Use yt-dlp to find channel ID (Robust method)
     def fetch_channel_id_with_ytdlp(target_url):
         ydl_opts = {
             'quiet': True,
@@ -39,11 +331,18 @@ async def get_youtube_rss_url(url, session=None):
                 # print(f"yt-dlp error: {e}")
                 return None
 
-    try:
-        channel_id = await asyncio.to_thread(fetch_channel_id_with_ytdlp, url)
-        if channel_id and channel_id.startswith("UC"):
-             return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-    except Exception as e:
-        print(f"Error extracting YouTube RSS with yt-dlp from {url}: {e}")
+    if not channel_id:
+        try:
+            channel_id = await asyncio.to_thread(fetch_channel_id_with_ytdlp, url)
+        except Exception as e:
+            print(f"Error extracting YouTube RSS with yt-dlp from {url}: {e}")
+        if not (channel_id and channel_id.startswith("UC")):
+            channel_id = None
 
-    return None
+    cache[key] = {"channel_id": channel_id, "resolved_at": time.time()}
+    if len(cache) > YOUTUBE_CACHE_MAX_ENTRIES:
+        for old_key in sorted(cache, key=lambda k: cache[k].get("resolved_at", 0))[:len(cache) - YOUTUBE_CACHE_MAX_ENTRIES]:
+            del cache[old_key]
+    await save_youtube_channel_cache(cache)
+
+    return _youtube_feed_url(channel_id) if channel_id else None
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Optional SQLite backend for the per-guild documents in data/.
+
+The JSON files handled here all share the shape {guild_id: {entity_id: value}}
+(player_stats: guild -> user -> character, karma_stats: guild -> user -> score,
+journal_data: guild -> "master"/"personal" -> ..., giveaway_data and
+giveaway_archive: guild -> message -> giveaway). SqliteStore keeps each (guild_id, entity_id) pair as one
+row, so reading one investigator or bumping one karma score touches one row
+instead of the whole multi-guild document.
+
+loadnsave.py decides which backend to use from config.json's
+"storage_backend" ("json" by default, or "sqlite"); nothing outside
+loadnsave should import this module directly.
+
+Migrating existing data: stop the bot, then run
+    python sqlite_store.py migrate
+and set "storage_backend": "sqlite" in config.json.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+
+DEFAULT_DB_FILENAME = "cthulhu.sqlite3"
+
+# JSON filename -> entity name used in the `rows` table.
+SQLITE_ENTITIES = {
+    'player_stats.json': 'player_stats',
+    'karma_stats.json': 'karma_stats',
+    'journal_data.json': 'journal_data',
+    'giveaway_data.json': 'giveaway_data',
+    'giveaway_archive.json': 'giveaway_archive',
+}
+
+# Row key for a guild whose value is not a non-empty mapping (e.g. an empty
+# dict or a bare list); no Discord ID or document key contains a NUL byte.
+GUILD_VALUE_KEY = "\x00guild"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    entity    TEXT NOT NULL,
+    guild_id  TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    data      TEXT NOT NULL,
+    PRIMARY KEY (entity, guild_id, entity_id)
+)
+"""
+
+_UPSERT = """
+INSERT INTO rows (entity, guild_id, entity_id, data) VALUES (?, ?, ?, ?)
+ON CONFLICT (entity, guild_id, entity_id) DO UPDATE SET data = excluded.data
+WHERE rows.data != excluded.data
+"""
+
+
+def _guild_rows(guild_value):
+    """Split one guild's value into (entity_id, serialized value) pairs."""
+    if isinstance(guild_value, dict) and guild_value:
+        return [(str(k), json.dumps(v)) for k, v in guild_value.items()]
+    return [(GUILD_VALUE_KEY, json.dumps(guild_value))]
+
+
+class SqliteStore:
+    """Row-per-entity storage for two-level per-guild documents.
+
+    All methods are synchronous and thread-safe; loadnsave calls them through
+    asyncio.to_thread so the event loop never blocks on disk I/O."""
+
+    def __init__(self, path):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Single rows ---
+    def get_row(self, entity, guild_id, entity_id):
+        """Return one decoded value, or None if the row doesn't exist."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM rows WHERE entity = ? AND guild_id = ? AND entity_id = ?",
+                (entity, str(guild_id), str(entity_id)),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_row(self, entity, guild_id, entity_id, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM rows WHERE entity = ? AND guild_id = ? AND entity_id = ?",
+                (entity, str(guild_id), GUILD_VALUE_KEY),
+            )
+            self._conn.execute(_UPSERT, (entity, str(guild_id), str(entity_id), json.dumps(value)))
+
+    def delete_row(self, entity, guild_id, entity_id):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM rows WHERE entity = ? AND guild_id = ? AND entity_id = ?",
+                (entity, str(guild_id), str(entity_id)),
+            )
+
+    # --- Guilds ---
+    def load_guild(self, entity, guild_id):
+        """Reassemble one guild's value, or None if the guild has no rows."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entity_id, data FROM rows WHERE entity = ? AND guild_id = ? ORDER BY rowid",
+                (entity, str(guild_id)),
+            ).fetchall()
+        if not rows:
+            return None
+        if len(rows) == 1 and rows[0][0] == GUILD_VALUE_KEY:
+            return json.loads(rows[0][1])
+        return {entity_id: json.loads(data) for entity_id, data in rows}
+
+    def save_guilds(self, entity, guilds):
+        """Write the given {guild_id: value} entries, leaving every other guild
+        untouched. A value of None deletes that guild. Unchanged rows are not
+        rewritten."""
+        with self._lock, self._conn:
+            for guild_id, guild_value in guilds.items():
+                self._replace_guild(entity, str(guild_id), guild_value)
+
+    def _replace_guild(self, entity, guild_id, guild_value):
+        if guild_value is None:
+            self._conn.execute(
+                "DELETE FROM rows WHERE entity = ? AND guild_id = ?", (entity, guild_id)
+            )
+            return
+        rows = _guild_rows(guild_value)
+        existing = {
+            r[0] for r in self._conn.execute(
+                "SELECT entity_id FROM rows WHERE entity = ? AND guild_id = ?", (entity, guild_id)
+            )
+        }
+        stale = existing - {entity_id for entity_id, _ in rows}
+        self._conn.executemany(
+            "DELETE FROM rows WHERE entity = ? AND guild_id = ? AND entity_id = ?",
+            [(entity, guild_id, entity_id) for entity_id in stale],
+        )
+        self._conn.executemany(
+            _UPSERT, [(entity, guild_id, entity_id, data) for entity_id, data in rows]
+        )
+
+    # --- Whole documents ---
+    def load_document(self, entity):
+        """Reassemble the full {guild_id: {entity_id: value}} document."""
+        with self._lock:
+            rows = self._conn.execute(
+                # rowid order preserves the documents' original key order.
+                "SELECT guild_id, entity_id, data FROM rows WHERE entity = ? ORDER BY rowid",
+                (entity,),
+            ).fetchall()
+        document = {}
+        for guild_id, entity_id, data in rows:
+            if entity_id == GUILD_VALUE_KEY:
+                document[guild_id] = json.loads(data)
+            else:
+                document.setdefault(guild_id, {})[entity_id] = json.loads(data)
+        return document
+
+    def save_document(self, entity, document):
+        """Make the stored rows match `document`, deleting guilds it no longer
+        contains. Only rows whose value actually changed are rewritten."""
+        with self._lock, self._conn:
+            stored_guilds = {
+                r[0] for r in self._conn.execute(
+                    "SELECT DISTINCT guild_id FROM rows WHERE entity = ?", (entity,)
+                )
+            }
+            for guild_id, guild_value in document.items():
+                self._replace_guild(entity, str(guild_id), guild_value)
+            for guild_id in stored_guilds - {str(g) for g in document}:
+                self._replace_guild(entity, guild_id, None)
+
+    def row_count(self, entity):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM rows WHERE entity = ?", (entity,)
+            ).fetchone()[0]
+
+
+def migrate_json_to_sqlite(data_folder, db_path, filenames=None):
+    """One-shot import of the JSON documents in `data_folder` into `db_path`.
+
+    Existing rows for a migrated entity are replaced, so re-running the
+    migration is safe. Missing files are skipped. Returns {filename: rows}."""
+    store = SqliteStore(db_path)
+    migrated = {}
+    try:
+        for filename in filenames or SQLITE_ENTITIES:
+            file_path = os.path.join(data_folder, filename)
+            if not os.path.exists(file_path):
+                continue
+            with open(file_path, 'r', encoding='utf-8') as file:
+                document = json.load(file)
+            if not isinstance(document, dict):
+                print(f"Skipping {filename}: top level is not an object.")
+                continue
+            entity = SQLITE_ENTITIES[filename]
+            store.save_document(entity, document)
+            migrated[filename] = store.row_count(entity)
+    finally:
+        store.close()
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CthulhuBot SQLite storage tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="Import data/*.json documents into SQLite")
+    migrate.add_argument("--data-folder", default="data")
+    migrate.add_argument("--db", default=None, help=f"defaults to <data-folder>/{DEFAULT_DB_FILENAME}")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        db_path = args.db or os.path.join(args.data_folder, DEFAULT_DB_FILENAME)
+        migrated = migrate_json_to_sqlite(args.data_folder, db_path)
+        for filename, rows in migrated.items():
+            print(f"{filename}: {rows} rows")
+        print(f"Done. Set \"storage_backend\": \"sqlite\" in config.json to use {db_path}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -99,6 +99,25 @@ async def test_deleter_data_marks_active_channels_with_seconds(client, isolated_
     assert channels["556"]["seconds"] == 0
 
 
+@pytest.mark.asyncio
+async def test_deleter_data_includes_sweep_stats_from_cog(client, isolated_data_dir):
+    await login(client)
+    guild = make_guild(channels=[make_channel(555, "spam-channel"), make_channel(556, "general")])
+    await loadnsave.save_deleter_data({"555": 30})
+
+    sweep = {"runs": 2, "last_deleted": 7, "total_deleted": 12, "last_duration_ms": 41.5, "last_error": None}
+    mock_bot = MagicMock()
+    mock_bot.guilds = [guild]
+    mock_bot.get_cog.return_value.channel_stats = {"555": sweep}
+    with patch('dashboard.app.app.bot', mock_bot):
+        response = await client.get('/api/deleter/data')
+
+    channels = {c["id"]: c for c in json.loads(await response.get_data(as_text=True))["guilds"][0]["channels"]}
+    mock_bot.get_cog.assert_called_with("deleter")
+    assert channels["555"]["sweep"] == sweep
+    assert channels["556"]["sweep"] is None
+
+
 @pytest.mark.asyncio
 async def test_deleter_save_missing_arguments_returns_400(client):
     await login(client)
@@ -34,6 +34,7 @@ async def login(client):
 def isolated_data_dir(tmp_path, monkeypatch):
     monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
     monkeypatch.setattr(loadnsave, "_GIVEAWAY_DATA_CACHE", None)
+    monkeypatch.setattr(loadnsave, "_GIVEAWAY_ARCHIVE_CACHE", None)
     return tmp_path
 
 
@@ -134,6 +135,27 @@ async def test_giveaway_data_resolves_names_and_sorts_active_first(client, isola
     assert ended["winner_name"] == "TheWinner"
 
 
+@pytest.mark.asyncio
+async def test_giveaway_data_includes_archived_giveaways(client, isolated_data_dir):
+    await login(client)
+    guild = make_guild(guild_id=123, channels=[make_channel(555, "announcements")])
+
+    await loadnsave.save_giveaway_data({
+        "123": {"2": {"channel_id": "555", "title": "Active One", "status": "active", "participants": []}},
+    })
+    await loadnsave.save_giveaway_archive({
+        "123": {"1": {"channel_id": "555", "title": "Old One", "status": "ended", "participants": ["1"]}},
+    })
+
+    mock_bot = MagicMock()
+    mock_bot.guilds = [guild]
+    with patch('dashboard.app.app.bot', mock_bot):
+        response = await client.get('/api/giveaway/data')
+
+    giveaways = json.loads(await response.get_data(as_text=True))["guilds"][0]["giveaways"]
+    assert [(g["message_id"], g["status"]) for g in giveaways] == [("2", "active"), ("1", "ended")]
+
+
 @pytest.mark.asyncio
 async def test_giveaway_create_missing_arguments_returns_400(client):
     await login(client)
@@ -34,10 +34,12 @@ def reset_bot(monkeypatch):
 
 @pytest.fixture
 def isolated_data_dir(tmp_path, monkeypatch):
-    # karma_settings.json has no in-memory cache in loadnsave.py, only DATA_FOLDER
-    # needs isolating -- karma.py imports load/save_karma_settings by value, but
-    # those functions still execute against loadnsave's own module globals.
+    # karma.py imports load/save_karma_settings by value, but those functions
+    # still execute against loadnsave's own module globals, so resetting the
+    # cache and channel index there is enough.
     monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+    monkeypatch.setattr(loadnsave, "_KARMA_SETTINGS_CACHE", None)
+    monkeypatch.setattr(loadnsave, "_KARMA_CHANNEL_INDEX", None)
     return tmp_path
 
 
@@ -242,6 +244,22 @@ async def test_save_karma_preserves_existing_roles_and_defaults_emojis(client, i
     assert reloaded["555"]["downvote_emoji"] == "🤏"
 
 
+@pytest.mark.asyncio
+async def test_save_karma_moves_channel_index(client, isolated_data_dir):
+    await login(client)
+    await loadnsave.save_karma_settings({"555": {"channel_id": 1, "roles": {}}})
+    assert await loadnsave.get_karma_channel_settings(555, 1) is not None
+
+    response = await client.post(
+        '/api/karma/save',
+        json={"guild_id": "555", "channel_id": "2"},
+        headers={"Origin": "http://localhost"}
+    )
+    assert response.status_code == 200
+    assert await loadnsave.get_karma_channel_settings(555, 1) is None
+    assert (await loadnsave.get_karma_channel_settings(555, 2))["channel_id"] == 2
+
+
 # --- /api/karma/roles/save ---
 
 @pytest.mark.asyncio
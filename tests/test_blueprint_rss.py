@@ -394,3 +394,27 @@ async def test_rss_delete_unknown_link_returns_404(client, isolated_data_dir):
         headers={"Origin": "http://localhost"},
     )
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_rss_data_includes_scheduler_state(client, isolated_data_dir):
+    from rss_utils import FeedScheduler
+    await login(client)
+    await loadnsave.save_rss_data({
+        "123": [{"channel_id": 555, "link": "http://example.com/feed"}],
+    })
+    scheduler = FeedScheduler(spread=0)
+    scheduler.sync(["http://example.com/feed"], now=1000)
+    mock_bot = MagicMock()
+    mock_bot.guilds = []
+    mock_bot.get_guild.return_value = None
+    mock_bot.get_cog.return_value = MagicMock(scheduler=scheduler)
+
+    with patch('dashboard.app.app.bot', mock_bot):
+        response = await client.get('/api/rss/data')
+
+    data = json.loads(await response.get_data(as_text=True))
+    schedule = data["feeds"][0]["schedule"]
+    assert schedule["next_poll"] == 1000
+    assert schedule["interval"] == 300
+    assert schedule["avg_latency_ms"] is None
@@ -1,10 +1,15 @@
+import asyncio
+import importlib
 import os
+import sys
 from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import discord
 import pytest
+from discord.ext import commands
 
 import bot as bot_module
+import loadnsave
 
 
 @pytest.fixture(autouse=True)
@@ -120,3 +125,146 @@ class TestOnReadyWiring:
             await bot_module.on_ready()
 
             assert os.path.exists(bot_module.UPDATE_HEALTH_MARKER)
+
+
+class TestGetPrefix:
+    @pytest.fixture(autouse=True)
+    def isolated_prefixes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+        monkeypatch.setattr(loadnsave, "_SERVER_STATS_CACHE", {"555": "?"})
+        monkeypatch.setattr(loadnsave, "_PREFIX_LIST_CACHE", {})
+
+    def make_message(self, guild_id):
+        message = MagicMock()
+        message.guild = MagicMock(id=guild_id) if guild_id else None
+        return message
+
+    def make_bot(self):
+        fake_bot = MagicMock()
+        fake_bot.user = MagicMock(id=42)
+        return fake_bot
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("guild_id,prefix", [(555, "?"), (777, "!"), (None, "!")])
+    async def test_matches_when_mentioned_or(self, guild_id, prefix):
+        fake_bot, message = self.make_bot(), self.make_message(guild_id)
+
+        result = await bot_module.get_prefix(fake_bot, message)
+
+        assert result == commands.when_mentioned_or(prefix)(fake_bot, message)
+
+    @pytest.mark.asyncio
+    async def test_prefix_list_is_memoized_per_guild(self):
+        fake_bot, message = self.make_bot(), self.make_message(555)
+
+        first = await bot_module.get_prefix(fake_bot, message)
+        loadnsave._SERVER_STATS_CACHE["555"] = "changed-behind-our-back"
+
+        assert await bot_module.get_prefix(fake_bot, message) is first
+
+    @pytest.mark.asyncio
+    async def test_save_server_stats_invalidates_memoized_prefix(self):
+        fake_bot, message = self.make_bot(), self.make_message(555)
+        await bot_module.get_prefix(fake_bot, message)
+
+        stats = await loadnsave.load_server_stats()
+        stats["555"] = "$"
+        await loadnsave.save_server_stats(stats)
+
+        assert (await bot_module.get_prefix(fake_bot, message))[-1] == "$"
+
+    @pytest.mark.asyncio
+    async def test_file_browser_invalidation_clears_memoized_prefix(self):
+        fake_bot, message = self.make_bot(), self.make_message(555)
+        await bot_module.get_prefix(fake_bot, message)
+
+        loadnsave.invalidate_data_cache("server_stats.json")
+
+        assert loadnsave._PREFIX_LIST_CACHE == {}
+
+
+class TestExtensionImportTimer:
+    def test_times_module_body_of_watched_names_only(self, tmp_path, monkeypatch):
+        (tmp_path / "slow_ext.py").write_text("import time\ntime.sleep(0.02)\n")
+        (tmp_path / "other_ext.py").write_text("")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        timer = bot_module._ExtensionImportTimer(["slow_ext"])
+        monkeypatch.setattr(sys, "meta_path", [timer] + sys.meta_path)
+        try:
+            importlib.import_module("slow_ext")
+            importlib.import_module("other_ext")
+        finally:
+            sys.modules.pop("slow_ext", None)
+            sys.modules.pop("other_ext", None)
+
+        assert timer.import_ms["slow_ext"] >= 20
+        assert "other_ext" not in timer.import_ms
+
+
+class TestLoad:
+    @pytest.fixture(autouse=True)
+    def isolated_report(self, monkeypatch):
+        monkeypatch.setattr(bot_module.bot, "failed_extensions", [])
+        monkeypatch.setattr(bot_module.bot, "startup_report", {})
+        monkeypatch.setattr(bot_module, "_extension_names", lambda: ["alpha", "beta", "broken"])
+
+        async def fake_load_extension(name):
+            await asyncio.sleep(0.05)
+            if name == "commands.broken":
+                raise commands.ExtensionFailed(name, RuntimeError("boom"))
+
+        monkeypatch.setattr(bot_module.bot, "load_extension", fake_load_extension)
+
+    @pytest.mark.asyncio
+    async def test_extensions_load_concurrently(self):
+        await bot_module.load()
+
+        # Three 50 ms setups back to back would take 150 ms.
+        assert bot_module.bot.startup_report["load_ms"] < 120
+
+    @pytest.mark.asyncio
+    async def test_report_records_timings_and_failures(self):
+        await bot_module.load()
+
+        report = bot_module.bot.startup_report
+        assert report["loaded"] == 2 and report["failed"] == 1
+        assert report["ready_ms"] is None
+        by_name = {e["name"]: e for e in report["extensions"]}
+        assert set(by_name) == {"alpha", "beta", "broken"}
+        assert by_name["broken"]["status"] == "failed"
+        assert "boom" in by_name["broken"]["error"]
+        assert by_name["alpha"]["total_ms"] >= 50
+        assert by_name["alpha"]["setup_ms"] + by_name["alpha"]["import_ms"] == pytest.approx(by_name["alpha"]["total_ms"], abs=0.2)
+        assert bot_module.bot.failed_extensions == [("broken.py", by_name["broken"]["error"])]
+
+    @pytest.mark.asyncio
+    async def test_on_ready_stamps_time_to_ready_once(self, monkeypatch):
+        await bot_module.load()
+        monkeypatch.setattr(bot_module.bot, "failed_extensions", [])
+        monkeypatch.setattr(bot_module.bot, "application_info", AsyncMock(side_effect=Exception("no network in test")))
+
+        with patch.object(type(bot_module.bot), 'user', new_callable=PropertyMock) as mock_user:
+            mock_user.return_value = MagicMock(id=123)
+            await bot_module.on_ready()
+            first = bot_module.bot.startup_report["ready_ms"]
+            await bot_module.on_ready()
+
+        assert first is not None
+        assert bot_module.bot.startup_report["ready_ms"] == first
+
+
+def test_format_startup_report_lists_slowest_extensions():
+    report = {
+        "extensions": [
+            {"name": "codex", "total_ms": 120.4, "import_ms": 20.0, "setup_ms": 100.4},
+            {"name": "dice", "total_ms": 3.0, "import_ms": 2.0, "setup_ms": 1.0},
+        ],
+        "loaded": 2, "failed": 0, "load_ms": 130, "ready_ms": 2500,
+    }
+
+    text = bot_module._format_startup_report(report, slowest=1)
+
+    assert "2 extensions loaded in 130 ms, ready after 2.5s" in text
+    assert "`codex` 120 ms (import 20 / setup 100)" in text
+    assert "dice" not in text
+    assert bot_module._format_startup_report({}) == ""
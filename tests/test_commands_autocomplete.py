@@ -0,0 +1,135 @@
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+from rapidfuzz import utils
+
+from commands._autocomplete import AutocompleteEngine
+
+SKILLS = ["Spot Hidden", "Stealth", "Swim", "Science", "Sleight of Hand", "Listen", "Library Use"]
+
+
+def names(matches, choices=SKILLS):
+    return [choices[i] for i, _ in matches]
+
+
+class CountingEngine(AutocompleteEngine):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.scored = []
+
+    def _score(self, query, choices, candidates):
+        self.scored.append(len(choices) if candidates is None else len(candidates))
+        return super()._score(query, choices, candidates)
+
+
+class TestAutocompleteEngine:
+    @pytest.mark.asyncio
+    async def test_repeated_query_served_from_cache(self):
+        engine = CountingEngine()
+        first = await engine.search(1, "stat", "Sp", SKILLS)
+        again = await engine.search(1, "stat", "Sp", list(SKILLS))
+
+        assert again == first
+        assert engine.scored == [len(SKILLS)]
+        assert engine.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_is_per_user_and_dropped_when_choices_change(self):
+        engine = CountingEngine()
+        await engine.search(1, "stat", "Sp", SKILLS)
+        await engine.search(2, "stat", "Sp", SKILLS)
+        changed = SKILLS + ["Spot Hidden (70)"]
+        await engine.search(1, "stat", "Sp", changed)
+
+        assert engine.stats["hits"] == 0
+        assert len(engine.scored) == 3
+
+    @pytest.mark.asyncio
+    async def test_extended_query_rescores_complete_pool_only(self):
+        engine = CountingEngine()
+        await engine.search(1, "stat", "Sp", SKILLS)
+
+        matches = await engine.search(1, "stat", "Spot H", SKILLS, limit=1)
+
+        assert names(matches) == ["Spot Hidden"]
+        assert engine.scored == [len(SKILLS), len(SKILLS)]
+        assert engine.stats["narrowed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_extended_query_finds_choices_that_scored_zero_before(self):
+        # "ttt" scores 0 for "ab" and is cut from the pool, but matches "abt".
+        choices = [f"ab{n:03d}" for n in range(5)] + [f"zz{n:03d}" for n in range(300)] + ["ttt"]
+        engine = AutocompleteEngine(pool_size=10)
+        await engine.search(1, "stat", "ab", choices)
+
+        extended = await engine.search(1, "stat", "abt", choices, limit=8)
+        fresh = await AutocompleteEngine(pool_size=10).search(1, "stat", "abt", choices, limit=8)
+
+        assert extended == fresh
+        assert "ttt" in names(extended, choices)
+        assert engine.stats["narrowed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_incomplete_pool_is_not_narrowed(self):
+        choices = [f"Skill {n:04d}" for n in range(1000)] + ["Spot Hidden"]
+        engine = CountingEngine(pool_size=50)
+        await engine.search(1, "stat", "S", choices)
+
+        await engine.search(1, "stat", "Sp", choices)
+
+        assert engine.scored == [1001, 1001]
+        assert engine.stats["narrowed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_name_typed_a_character_at_a_time_comes_back_first(self):
+        spells = json.loads((Path(__file__).parent.parent / "infodata" / "spells.json").read_text(encoding="utf-8"))
+        choices = [utils.default_process(s["spell_entry"]["name"]) for s in spells["spells"] if s.get("spell_entry")]
+        engine = AutocompleteEngine()
+        assert len(choices) > engine.pool_size
+
+        target = utils.default_process("Summon Byakhee")
+        for end in range(1, len(target) + 1):
+            matches = await engine.search(1, "spell", target[:end], choices)
+
+        assert choices[matches[0][0]] == target
+
+    @pytest.mark.asyncio
+    async def test_score_cutoff_and_limit(self):
+        engine = AutocompleteEngine()
+        matches = await engine.search(1, "versus", "Stealth", SKILLS, limit=1, score_cutoff=60)
+
+        assert names(matches) == ["Stealth"]
+        assert await engine.search(1, "versus", "zzzz", SKILLS, score_cutoff=60) == []
+
+    @pytest.mark.asyncio
+    async def test_large_lists_scored_off_the_event_loop(self):
+        engine = CountingEngine(thread_threshold=3)
+        loop_thread = threading.get_ident()
+        threads = []
+        score = engine._score
+
+        def record(*args):
+            threads.append(threading.get_ident())
+            return score(*args)
+
+        engine._score = record
+        await engine.search(1, "stat", "Swim", SKILLS)
+
+        assert threads and threads[0] != loop_thread
+        assert engine.stats["threaded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_scoring_falls_back_to_substring_match(self):
+        engine = AutocompleteEngine(thread_threshold=0, budget=0.05)
+        release = threading.Event()
+        engine._score = lambda *args: release.wait(1) and []
+
+        matches = await engine.search(1, "stat", "li", SKILLS)
+        release.set()
+
+        assert names(matches) == ["Listen", "Library Use"]
+        assert engine.stats["timeouts"] == 1
+        await asyncio.sleep(0)
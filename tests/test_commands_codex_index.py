@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from commands._codex_index import get_index
+from commands.codex import Codex
+
+MONSTERS = {"monsters": [
+    {"monster_entry": {"name": "Deep One", "hp": 8}},
+    {"monster_entry": {"name": "Dark Young", "hp": 40}},
+    {"monster_entry": {"name": "Byakhee", "hp": 11}},
+    {"other_entry": {"name": "Ignored"}},
+]}
+
+TALENTS = {
+    "Physical": ["**Brawler**: Extra damage.", "**Hardened**: Ignores penalties."],
+    "Mental": ["**Arcane Insight**: Halves spell costs.", "not a talent"],
+}
+
+
+class TestCodexIndex:
+    def test_list_documents_indexed_by_entry_name(self):
+        index = get_index(MONSTERS, "monsters")
+
+        assert index.names == ["Byakhee", "Dark Young", "Deep One"]
+        assert index.get("Dark Young") == {"name": "Dark Young", "hp": 40}
+        assert index.exact("deep one") == "Deep One"
+        assert index.exact("Ignored") is None
+
+    def test_pulp_talents_flattened_with_category(self):
+        index = get_index(TALENTS, flatten_pulp=True)
+
+        assert index.names == ["Arcane Insight", "Brawler", "Hardened"]
+        assert index.get("Brawler") == {"name": "Brawler", "description": "Extra damage.", "category": "Physical"}
+
+    def test_search_ignores_case(self):
+        index = get_index(MONSTERS, "monsters")
+
+        assert index.search("deep", limit=1) == ["Deep One"]
+        assert index.search("DARK YOUNG", limit=1) == ["Dark Young"]
+
+    def test_index_reused_until_document_replaced(self):
+        data = {"Handgun": {}, "Rifle": {}}
+        index = get_index(data)
+        assert get_index(data) is index
+
+        replaced = {"Handgun": {}, "Rifle": {}, "Shotgun": {}}
+        assert get_index(replaced).names == ["Handgun", "Rifle", "Shotgun"]
+
+
+class TestCodexLookups:
+    @pytest.mark.asyncio
+    async def test_autocomplete_and_entry_lookup_use_index(self):
+        cog = Codex(MagicMock())
+        interaction = MagicMock()
+        interaction.command.name = "monster"
+
+        async def loader():
+            return MONSTERS
+
+        choices = await cog._get_autocomplete_choices(interaction, "byak", loader, data_key="monsters")
+        assert choices[0].value == "Byakhee"
+        assert [c.value for c in await cog._get_autocomplete_choices(interaction, "", loader, data_key="monsters")] == ["Byakhee", "Dark Young", "Deep One"]
+        assert cog._get_entry_data(MONSTERS, "Byakhee", "monster", data_key="monsters") == {"name": "Byakhee", "hp": 11}
+
+    def test_find_matches_prefers_exact_match(self):
+        cog = Codex(MagicMock())
+        index = get_index(MONSTERS, "monsters")
+
+        assert cog._find_matches("DEEP ONE", index) == ["Deep One"]
+        assert "Deep One" in cog._find_matches("Deep On", index)
+        assert cog._find_matches("zzzz", index) == []
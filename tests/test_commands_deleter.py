@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+import pytest_asyncio
+import pytz
+
+from commands._rate_budget import RateBudget
+from commands.deleter import Deleter
+
+NOW = datetime(2026, 3, 1, tzinfo=pytz.utc)
+
+
+class FakeMessage:
+    def __init__(self, channel, created_at):
+        self.channel = channel
+        self.created_at = created_at
+        self.id = discord.utils.time_snowflake(created_at)
+
+    async def delete(self):
+        self.channel.messages.remove(self)
+        self.channel.single_deletes += 1
+
+
+class FakeChannel:
+    """Just enough of a TextChannel: history() honours before/after/oldest_first
+    and counts how many messages it had to list."""
+
+    def __init__(self, channel_id, ages):
+        self.id = channel_id
+        self.messages = sorted((FakeMessage(self, NOW - age) for age in ages), key=lambda m: m.id)
+        self.listed = 0
+        self.single_deletes = 0
+        self.bulk_batches = []
+
+    async def history(self, limit=None, before=None, after=None, oldest_first=None):
+        before_id = discord.utils.time_snowflake(before)
+        after_id = after.id if after else 0
+        for message in list(self.messages):
+            if after_id < message.id < before_id:
+                self.listed += 1
+                yield message
+
+    async def delete_messages(self, messages):
+        self.bulk_batches.append(len(messages))
+        for message in messages:
+            self.messages.remove(message)
+
+
+@pytest_asyncio.fixture
+async def cog():
+    cog = Deleter(MagicMock())
+    cog.cog_unload()
+    cog._budget = RateBudget(rate=1000)
+    return cog
+
+
+class TestIncrementalSweep:
+    @pytest.mark.asyncio
+    async def test_young_messages_bulk_deleted_old_ones_singly(self, cog):
+        ages = [timedelta(days=30), timedelta(days=20)] + [timedelta(hours=h) for h in range(2, 252)]
+        channel = FakeChannel(1, ages + [timedelta(minutes=10)])
+
+        deleted = await cog.sweep_channel(channel, 3600, NOW)
+
+        assert deleted == 252
+        assert channel.single_deletes == 2
+        assert channel.bulk_batches == [100, 100, 50]
+        assert [m.created_at for m in channel.messages] == [NOW - timedelta(minutes=10)]
+        stats = cog.channel_stats["1"]
+        assert (stats["last_deleted"], stats["bulk_requests"], stats["single_deletes"]) == (252, 3, 2)
+        assert stats["incremental"] is False and stats["last_error"] is None
+
+    @pytest.mark.asyncio
+    async def test_next_sweep_only_lists_messages_past_watermark(self, cog):
+        channel = FakeChannel(1, [timedelta(hours=h) for h in range(2, 50)] + [timedelta(minutes=m) for m in range(30, 61)])
+        await cog.sweep_channel(channel, 3600, NOW)
+        channel.listed = 0
+
+        deleted = await cog.sweep_channel(channel, 3600, NOW + timedelta(minutes=15))
+
+        assert deleted == 15
+        assert channel.listed == 15
+        assert cog.channel_stats["1"]["incremental"] is True
+        assert cog.channel_stats["1"]["total_deleted"] == 48 + 15
+
+    @pytest.mark.asyncio
+    async def test_failed_sweep_resumes_after_last_deleted_message(self, cog):
+        channel = FakeChannel(1, [timedelta(days=30), timedelta(days=29), timedelta(hours=5)])
+        real_delete = channel.delete_messages
+        channel.delete_messages = AsyncMock(side_effect=discord.HTTPException(MagicMock(status=500), "boom"))
+
+        assert await cog.sweep_channel(channel, 3600, NOW) == 2
+        assert cog.channel_stats["1"]["errors"] == 1
+        assert "boom" in cog.channel_stats["1"]["last_error"]
+
+        channel.delete_messages = real_delete
+        channel.listed = 0
+        assert await cog.sweep_channel(channel, 3600, NOW) == 1
+        assert channel.listed == 1
+        assert channel.messages == []
+
+    @pytest.mark.asyncio
+    async def test_channels_swept_concurrently(self, cog, monkeypatch):
+        channels = {1: FakeChannel(1, []), 2: FakeChannel(2, [])}
+        cog.bot.get_channel.side_effect = lambda cid: channels.get(cid)
+        monkeypatch.setattr("commands.deleter.load_deleter_data", AsyncMock(return_value={"1": 60, "2": 60, "3": 60}))
+        running = []
+        release = asyncio.Event()
+
+        async def sweep(channel, seconds, now):
+            running.append(channel.id)
+            await release.wait()
+
+        cog.sweep_channel = sweep
+        task = asyncio.create_task(cog.sweep_all())
+        await asyncio.sleep(0.01)
+        assert sorted(running) == [1, 2]
+        release.set()
+        await task
+
+
+class TestRateBudget:
+    @pytest.mark.asyncio
+    async def test_budget_limits_request_rate(self):
+        budget = RateBudget(rate=100, burst=2)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(7):
+            await budget.acquire()
+        # Two from the burst, then five refills at 10 ms each.
+        assert loop.time() - started >= 0.045
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from commands._drain_queue import DrainQueue
+
+
+class TestDrainQueue:
+    @pytest.mark.asyncio
+    async def test_one_item_at_a_time_per_key_and_replacement(self):
+        processed = []
+        release = asyncio.Event()
+
+        async def process(key, item_key, item):
+            processed.append((key, item))
+            await release.wait()
+
+        queue = DrainQueue(process)
+        assert queue.put("a", 1, "a1") is False
+        queue.put("a", 2, "a2")
+        queue.put("b", 1, "b1")
+        await asyncio.sleep(0.01)
+        assert queue.put("a", 2, "a2-latest") is True
+
+        assert processed == [("a", "a1"), ("b", "b1")]
+        release.set()
+        await queue.join()
+        assert processed[2:] == [("a", "a2-latest")]
+
+    @pytest.mark.asyncio
+    async def test_ready_at_holds_items_until_due(self):
+        processed = []
+
+        async def process(key, item_key, item):
+            processed.append(item["value"])
+
+        queue = DrainQueue(process, ready_at=lambda item: item["due"])
+        loop = asyncio.get_running_loop()
+        queue.put("a", 1, {"due": loop.time() + 0.05, "value": "first"})
+        await asyncio.sleep(0.01)
+        queue.get("a", 1)["value"] = "replaced"
+        assert processed == []
+
+        await queue.join()
+        assert processed == ["replaced"]
+
+    @pytest.mark.asyncio
+    async def test_close_then_reuse_key(self):
+        processed = []
+
+        async def process(key, item_key, item):
+            await asyncio.sleep(0.01)
+            processed.append(item)
+
+        queue = DrainQueue(process)
+        queue.put("a", 1, "old")
+        await asyncio.sleep(0)
+        queue.close()
+        queue.put("a", 1, "new")
+        await queue.join()
+
+        assert processed == ["new"]
@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from commands._edit_scheduler import EditScheduler
+
+
+def make_message(message_id, channel_id):
+    message = MagicMock(id=message_id)
+    message.channel.id = channel_id
+    message.edit = AsyncMock()
+    return message
+
+
+def render(signature, **kwargs):
+    return lambda: (signature, lambda: kwargs)
+
+
+class TestEditScheduler:
+    @pytest.mark.asyncio
+    async def test_burst_for_one_message_is_one_edit_with_latest_render(self):
+        scheduler = EditScheduler()
+        message = make_message(1, 10)
+        for i in range(5):
+            scheduler.submit(message, render(i, content=str(i)))
+
+        await scheduler.join()
+
+        message.edit.assert_awaited_once_with(content="4")
+        assert scheduler.stats["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_channels_edit_concurrently_but_one_at_a_time_each(self):
+        scheduler = EditScheduler()
+        release = asyncio.Event()
+        in_flight = []
+
+        async def slow_edit(**kwargs):
+            in_flight.append(kwargs["content"])
+            await release.wait()
+
+        a1, a2, b1 = make_message(1, 10), make_message(2, 10), make_message(3, 20)
+        for message, name in ((a1, "a1"), (a2, "a2"), (b1, "b1")):
+            message.edit.side_effect = slow_edit
+            scheduler.submit(message, render(name, content=name))
+
+        await asyncio.sleep(0.01)
+        assert in_flight == ["a1", "b1"]
+        release.set()
+        await scheduler.join()
+        assert in_flight == ["a1", "b1", "a2"]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_signature_is_skipped_until_forgotten(self):
+        scheduler = EditScheduler()
+        message = make_message(1, 10)
+
+        scheduler.submit(message, render("same", content="x"))
+        await scheduler.join()
+        scheduler.submit(message, render("same", content="x"))
+        await scheduler.join()
+        assert message.edit.await_count == 1
+        assert scheduler.stats["skipped"] == 1
+
+        scheduler.forget(message)
+        scheduler.submit(message, render("same", content="x"))
+        await scheduler.join()
+        assert message.edit.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deleted_message_reported(self):
+        gone = []
+        scheduler = EditScheduler(on_missing=gone.append)
+        message = make_message(1, 10)
+        message.edit.side_effect = discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+
+        scheduler.submit(message, render("x", content="x"))
+        await scheduler.join()
+
+        assert gone == [message]
+        assert scheduler.stats["edits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_signatures_kept_only_for_recent_messages(self):
+        scheduler = EditScheduler(max_tracked=2)
+        messages = [make_message(i, 10) for i in range(3)]
+        for message in messages:
+            scheduler.submit(message, render("same", content="x"))
+        await scheduler.join()
+
+        assert list(scheduler._sent) == [1, 2]
+        scheduler.submit(messages[0], render("same", content="x"))
+        await scheduler.join()
+        assert messages[0].edit.await_count == 2
@@ -0,0 +1,145 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+from commands._presence_coalescer import PresenceCoalescer
+from commands.gameroles import GamerRoles
+
+
+class FakeRole:
+    def __init__(self, role_id, name, position, members=(), hoist=False):
+        self.id = role_id
+        self.name = name
+        self.position = position
+        self.members = list(members)
+        self.hoist = hoist
+        self.edit = AsyncMock(side_effect=self._edit)
+
+    async def _edit(self, hoist=None, **kwargs):
+        if hoist is not None:
+            self.hoist = hoist
+
+
+class FakeGuild:
+    def __init__(self, roles):
+        self.id = 1
+        self.name = "Guild"
+        self.roles = roles
+
+    def get_role(self, role_id):
+        return next((r for r in self.roles if r.id == role_id), None)
+
+
+@pytest_asyncio.fixture
+async def cog():
+    cog = GamerRoles(MagicMock())
+    cog.settings_cache = {"1": {"enabled": True, "managed_roles": []}}
+    yield cog
+    cog.cog_unload()
+
+
+class TestRoleIndex:
+    @pytest.mark.asyncio
+    async def test_find_role_follows_name_precedence(self, cog):
+        guild = FakeGuild([FakeRole(10, "Chess", 1), FakeRole(11, "🎮 Chess", 2), FakeRole(12, "♟️ Chess", 3)])
+        settings = {"activity_emojis": {"Chess": "♟️"}, "managed_roles": ["11", "12"]}
+
+        assert (await cog.find_role_for_game(guild, "Chess", settings)).id == 12
+        assert (await cog.find_role_for_game(guild, "Chess", {})).id == 11
+
+    @pytest.mark.asyncio
+    async def test_role_events_keep_index_current(self, cog):
+        renamed = FakeRole(20, "🎲 Go", 1)
+        guild = FakeGuild([renamed])
+        settings = {"managed_roles": ["20"]}
+        assert (await cog.find_role_for_game(guild, "Go", settings)).id == 20
+
+        before = FakeRole(20, "🎲 Go", 1)
+        renamed.name = "🎲 Baduk"
+        await cog.on_guild_role_update(before, SimpleNamespace(id=20, name="🎲 Baduk", guild=guild))
+        assert await cog.find_role_for_game(guild, "Go", settings) is None
+        assert (await cog.find_role_for_game(guild, "Baduk", settings)).id == 20
+
+        created = FakeRole(21, "🎮 Go", 2)
+        guild.roles.append(created)
+        created.guild = guild
+        await cog.on_guild_role_create(created)
+        assert (await cog.find_role_for_game(guild, "Go", settings)).id == 21
+
+        guild.roles.remove(created)
+        await cog.on_guild_role_delete(created)
+        assert await cog.find_role_for_game(guild, "Go", settings) is None
+
+    @pytest.mark.asyncio
+    async def test_member_tally_follows_member_updates(self, cog):
+        chess = FakeRole(10, "🎮 Chess", 1, members=["a", "b"])
+        guild = FakeGuild([chess])
+        index = cog.get_role_index(guild)
+        assert index.count(chess) == 2
+        chess.members = []  # tally is not recounted
+
+        member = SimpleNamespace(guild=guild, roles=[])
+        await cog.on_member_update(member, SimpleNamespace(guild=guild, roles=[chess]))
+        assert index.count(chess) == 3
+        await cog.on_member_remove(SimpleNamespace(guild=guild, roles=[chess]))
+        assert index.count(chess) == 2
+
+
+class TestHoisting:
+    @pytest.mark.asyncio
+    async def test_hoisting_debounced_and_ranked_by_tally(self, cog, monkeypatch):
+        monkeypatch.setattr("commands.gameroles.HOIST_DEBOUNCE", 0.05)
+        roles = [FakeRole(i, f"🎮 Game {i}", i, members=range(i), hoist=(i == 1)) for i in range(1, 8)]
+        guild = FakeGuild(roles)
+        cog.settings_cache["1"]["managed_roles"] = [str(r.id) for r in roles]
+        cog.update_hoisting = AsyncMock(wraps=cog.update_hoisting)
+
+        for _ in range(10):
+            cog.schedule_hoisting(guild)
+        await asyncio.sleep(0.1)
+
+        cog.update_hoisting.assert_awaited_once()
+        assert [r.id for r in roles if r.hoist] == [3, 4, 5, 6, 7]
+
+
+class TestPresenceCoalescing:
+    @pytest.mark.asyncio
+    async def test_changes_settle_into_one_apply_and_toggles_are_suppressed(self):
+        applied = []
+
+        async def apply(guild, member, old_game, new_game):
+            applied.append((member.id, old_game, new_game))
+
+        coalescer = PresenceCoalescer(apply, settle=0.05, rate=1000)
+        guild = SimpleNamespace(id=1, name="Guild")
+        alice, bob = SimpleNamespace(id=1), SimpleNamespace(id=2)
+
+        coalescer.observe(guild, alice, None, "Chess")
+        coalescer.observe(guild, alice, "Chess", "Go")
+        coalescer.observe(guild, alice, "Go", "Poker")
+        coalescer.observe(guild, bob, "Chess", None)
+        coalescer.observe(guild, bob, None, "Chess")
+        await asyncio.sleep(0.01)
+        assert applied == []
+        await coalescer.join()
+
+        assert applied == [(1, None, "Poker")]
+        assert coalescer.stats[1] == {"observed": 5, "coalesced": 3, "suppressed": 1, "applied": 1, "errors": 0}
+
+    @pytest.mark.asyncio
+    async def test_game_switch_changes_only_the_two_game_roles(self, cog):
+        everyone = FakeRole(1, "@everyone", 0)
+        chess, go = FakeRole(10, "🎮 Chess", 1), FakeRole(11, "🎮 Go", 2)
+        guild = FakeGuild([everyone, chess, go])
+        cog.settings_cache["1"]["managed_roles"] = ["10", "11"]
+        cog.get_role_index(guild).counts[10] = 3
+        member = SimpleNamespace(roles=[everyone, chess], edit=AsyncMock(), add_roles=AsyncMock(), remove_roles=AsyncMock())
+
+        await cog.apply_game_change(guild, member, "Chess", "Go")
+
+        member.add_roles.assert_awaited_once_with(go, reason="Gamer Role: Started playing")
+        member.remove_roles.assert_awaited_once_with(chess, reason="Gamer Role: Stopped playing")
+        member.edit.assert_not_awaited()
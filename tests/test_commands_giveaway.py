@@ -0,0 +1,114 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+import loadnsave
+from commands.giveaway import Giveaway
+
+
+@pytest.fixture
+def isolated_giveaways(tmp_path, monkeypatch):
+    monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+    monkeypatch.setattr(loadnsave, "_GIVEAWAY_DATA_CACHE", None)
+    monkeypatch.setattr(loadnsave, "_GIVEAWAY_ARCHIVE_CACHE", None)
+    monkeypatch.setattr(loadnsave, "_SAVE_LISTENERS", {})
+    monkeypatch.setattr(loadnsave, "_DIRTY", {})
+    monkeypatch.setattr(loadnsave, "_FRAGMENTS", {})
+    return tmp_path
+
+
+def giveaway(status="active", end_time=None, participants=None):
+    return {"creator_id": 1, "channel_id": 10, "title": "Idol", "description": "", "prize_secret": "key",
+            "status": status, "participants": participants or [], "end_time": end_time}
+
+
+@pytest_asyncio.fixture
+async def cog(isolated_giveaways):
+    bot = MagicMock()
+    bot.wait_until_ready = AsyncMock()
+    bot.get_guild.return_value = None
+    cog = Giveaway(bot)
+    yield cog
+    await cog.cog_unload()
+
+
+class TestGiveawayArchive:
+    @pytest.mark.asyncio
+    async def test_load_moves_ended_giveaways_out_of_the_index(self, cog):
+        now = time.time()
+        await loadnsave.save_giveaway_data({
+            "1": {"100": giveaway("ended"), "101": giveaway(end_time=now + 3600), "102": giveaway()},
+            "2": {"200": giveaway("ended")},
+        })
+        await cog.cog_load()
+
+        data = await loadnsave.load_giveaway_data()
+        archive = await loadnsave.load_giveaway_archive()
+        assert data == {"1": {"101": giveaway(end_time=now + 3600), "102": giveaway()}}
+        assert {g: sorted(gws) for g, gws in archive.items()} == {"1": ["100"], "2": ["200"]}
+        assert cog._deadlines == [(now + 3600, "1", "101")]
+        assert loadnsave._DIRTY == {"giveaway_data.json": {"1", "2"}, "giveaway_archive.json": {"1", "2"}}
+
+    @pytest.mark.asyncio
+    async def test_reroll_and_end_see_archived_giveaway(self, cog):
+        await loadnsave.save_giveaway_archive({"1": {"100": giveaway("ended", participants=["7"])}})
+        cog.pick_winner = AsyncMock(return_value="7")
+
+        assert await cog.api_end_giveaway("1", "100") == (False, "This giveaway is already ended.")
+        assert await cog.api_reroll_giveaway("1", "100") == (True, "Rerolled. New Winner: 7")
+
+
+class TestGiveawayDeadlines:
+    @pytest.mark.asyncio
+    async def test_ends_at_deadline_and_archives(self, cog):
+        await loadnsave.save_giveaway_data({"1": {"100": giveaway(end_time=time.time() + 0.1)}})
+        await cog.cog_load()
+
+        await asyncio.sleep(0.05)
+        assert "100" in (await loadnsave.load_giveaway_data())["1"]
+        await asyncio.sleep(0.1)
+
+        assert await loadnsave.load_giveaway_data() == {}
+        assert (await loadnsave.load_giveaway_archive())["1"]["100"]["status"] == "ended"
+
+    @pytest.mark.asyncio
+    async def test_dashboard_save_schedules_earlier_giveaway(self, cog):
+        now = time.time()
+        await loadnsave.save_giveaway_data({"1": {"100": giveaway(end_time=now + 3600)}})
+        await cog.cog_load()
+        await asyncio.sleep(0.01)  # scheduler is now sleeping for an hour
+
+        data = await loadnsave.load_giveaway_data()
+        data["1"]["101"] = giveaway(end_time=now + 0.05)
+        await loadnsave.save_giveaway_data(data)
+        await asyncio.sleep(0.15)
+
+        assert list((await loadnsave.load_giveaway_archive())["1"]) == ["101"]
+        assert list((await loadnsave.load_giveaway_data())["1"]) == ["100"]
+
+    @pytest.mark.asyncio
+    async def test_giveaway_ended_by_hand_is_skipped(self, cog):
+        await loadnsave.save_giveaway_data({"1": {"100": giveaway(end_time=time.time() + 0.05)}})
+        await cog.cog_load()
+        await cog.api_end_giveaway("1", "100")
+        cog.api_end_giveaway = AsyncMock()
+
+        await asyncio.sleep(0.1)
+        cog.api_end_giveaway.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_ending_is_retried(self, cog, monkeypatch):
+        monkeypatch.setattr("commands.giveaway.END_RETRY_SECONDS", 0.05)
+        await loadnsave.save_giveaway_data({"1": {"100": giveaway(end_time=time.time() - 1, participants=["7"])}})
+        cog.pick_winner = AsyncMock(side_effect=[None, "7"])
+        await cog.cog_load()
+
+        await asyncio.sleep(0.02)
+        assert "100" in (await loadnsave.load_giveaway_data())["1"]
+        await asyncio.sleep(0.1)
+
+        assert cog.pick_winner.await_count == 2
+        assert (await loadnsave.load_giveaway_archive())["1"]["100"]["winner_id"] == "7"
@@ -0,0 +1,213 @@
+import asyncio
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from commands._karma_leaderboard import LeaderboardIndex
+from commands.karma import Karma
+
+
+def reference_order(guild_stats):
+    return sorted(guild_stats.items(), key=lambda item: (-item[1], item[0]))
+
+
+class TestLeaderboardIndex:
+    def test_matches_full_sort_after_random_votes(self):
+        index = LeaderboardIndex()
+        guild = {str(i): random.randint(-5, 20) for i in range(50)}
+        assert index.top("1", guild) == reference_order(guild)
+
+        rng = random.Random(7)
+        for _ in range(500):
+            user_id = str(rng.randint(0, 60))
+            old = guild.get(user_id)
+            guild[user_id] = (old or 0) + rng.choice((1, -1))
+            index.update("1", guild, user_id, old, guild[user_id])
+
+        assert index.top("1", guild) == reference_order(guild)
+        assert index.top("1", guild, limit=3) == reference_order(guild)[:3]
+
+    def test_replaced_guild_dict_is_rebuilt(self):
+        index = LeaderboardIndex()
+        guild = {"1": 5, "2": 3}
+        index.top("1", guild)
+
+        recalculated = {"1": 1, "2": 9}
+        assert index.top("1", recalculated) == [("2", 9), ("1", 1)]
+
+    def test_out_of_band_change_is_rebuilt(self):
+        index = LeaderboardIndex()
+        guild = {"1": 5}
+        index.top("1", guild)
+        guild["2"] = 7  # written without update()
+
+        assert index.top("1", guild) == [("2", 7), ("1", 5)]
+
+    def test_update_before_first_read_is_ignored(self):
+        index = LeaderboardIndex()
+        guild = {"1": 2}
+        index.update("1", guild, "1", 1, 2)
+        assert index.top("1", guild) == [("1", 2)]
+
+
+@pytest.fixture
+def karma_cog(monkeypatch):
+    stats = {}
+    monkeypatch.setattr("commands.karma.load_karma_stats", AsyncMock(return_value=stats))
+    monkeypatch.setattr("commands.karma.mark_dirty", MagicMock())
+
+    bot = MagicMock()
+    cog = Karma(bot)
+    cog.role_update_delay = 0.01
+    cog.get_guild_settings = AsyncMock(return_value={"channel_id": 1, "roles": {"10": 99}})
+    cog.update_karma_roles = AsyncMock(return_value=True)
+    cog.stats = stats
+    yield cog
+    cog.cog_unload()
+
+
+class TestKarmaRoleDebounce:
+    @pytest.mark.asyncio
+    async def test_burst_of_votes_checks_roles_once(self, karma_cog):
+        for _ in range(50):
+            await karma_cog.update_karma(1, 2, 1)
+
+        assert karma_cog.update_karma_roles.await_count == 0
+        await asyncio.sleep(0.05)
+
+        karma_cog.update_karma_roles.assert_awaited_once()
+        member, karma, settings = karma_cog.update_karma_roles.await_args.args
+        assert karma == 50
+        assert karma_cog.stats == {"1": {"2": 50}}
+        assert karma_cog.role_update_stats == {"votes": 50, "role_checks": 1}
+
+    @pytest.mark.asyncio
+    async def test_members_are_debounced_independently(self, karma_cog):
+        await karma_cog.update_karma(1, 2, 1)
+        await karma_cog.update_karma(1, 3, -1)
+        await asyncio.sleep(0.05)
+
+        assert karma_cog.update_karma_roles.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_vote_after_window_starts_new_check(self, karma_cog):
+        await karma_cog.update_karma(1, 2, 1)
+        await asyncio.sleep(0.05)
+        await karma_cog.update_karma(1, 2, 1)
+        await asyncio.sleep(0.05)
+
+        assert karma_cog.update_karma_roles.await_count == 2
+        assert karma_cog.update_karma_roles.await_args.args[1] == 2
+
+    @pytest.mark.asyncio
+    async def test_unload_cancels_pending_checks(self, karma_cog):
+        await karma_cog.update_karma(1, 2, 1)
+        karma_cog.cog_unload()
+        await asyncio.sleep(0.05)
+
+        karma_cog.update_karma_roles.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_leaderboard_data_follows_votes(self, karma_cog):
+        karma_cog.stats["1"] = {"2": 4, "3": 6}
+        assert [r["user_id"] for r in await karma_cog.get_guild_leaderboard_data(1)] == ["3", "2"]
+
+        await karma_cog.update_karma(1, 2, 5)
+        data = await karma_cog.get_guild_leaderboard_data(1)
+        assert [(r["user_id"], r["score"]) for r in data] == [("2", 9), ("3", 6)]
+
+
+@pytest.fixture
+def reaction_cog(monkeypatch):
+    settings = {"channel_id": 10, "upvote_emoji": "👌", "downvote_emoji": "🤏", "roles": {}}
+    monkeypatch.setattr("commands.karma.get_karma_channel_settings", AsyncMock(return_value=settings))
+
+    channel = MagicMock()
+    channel.fetch_message = AsyncMock(return_value=SimpleNamespace(author=SimpleNamespace(id=7)))
+    partial = MagicMock()
+    partial.remove_reaction = AsyncMock()
+    channel.get_partial_message.return_value = partial
+    guild = MagicMock()
+    guild.get_channel.return_value = channel
+
+    bot = MagicMock()
+    bot.user.id = 1
+    bot.get_guild.return_value = guild
+    bot.cached_messages = []
+
+    cog = Karma(bot)
+    cog.update_karma = AsyncMock()
+    cog.channel = channel
+    yield cog
+    cog.cog_unload()
+
+
+def reaction(message_id=100, user_id=5, emoji="👌", author_id=None):
+    return SimpleNamespace(message_id=message_id, user_id=user_id, channel_id=10, guild_id=2,
+                           emoji=emoji, message_author_id=author_id)
+
+
+class TestKarmaAuthorCache:
+    @pytest.mark.asyncio
+    async def test_on_message_seeds_cache(self, reaction_cog):
+        message = MagicMock(id=100, author=SimpleNamespace(id=7))
+        message.add_reaction = AsyncMock()
+        await reaction_cog.on_message(message)
+
+        await reaction_cog.on_raw_reaction_add(reaction())
+
+        reaction_cog.channel.fetch_message.assert_not_awaited()
+        reaction_cog.update_karma.assert_awaited_once_with(2, 7, 1)
+        assert reaction_cog.author_cache_metrics()["hits_local"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gateway_author_id_is_used(self, reaction_cog):
+        await reaction_cog.on_raw_reaction_add(reaction(author_id=8))
+
+        reaction_cog.channel.fetch_message.assert_not_awaited()
+        reaction_cog.update_karma.assert_awaited_once_with(2, 8, 1)
+
+    @pytest.mark.asyncio
+    async def test_client_message_cache_is_used(self, reaction_cog):
+        reaction_cog.bot.cached_messages = [SimpleNamespace(id=100, author=SimpleNamespace(id=9))]
+        await reaction_cog.on_raw_reaction_remove(reaction(emoji="🤏"))
+
+        reaction_cog.channel.fetch_message.assert_not_awaited()
+        reaction_cog.update_karma.assert_awaited_once_with(2, 9, 1)
+
+    @pytest.mark.asyncio
+    async def test_rest_fallback_is_cached_and_counted(self, reaction_cog):
+        await reaction_cog.on_raw_reaction_remove(reaction())
+        await reaction_cog.on_raw_reaction_remove(reaction(user_id=6))
+
+        reaction_cog.channel.fetch_message.assert_awaited_once_with(100)
+        metrics = reaction_cog.author_cache_metrics()
+        assert metrics["lookups"] == 2
+        assert metrics["rest_fetches"] == 1
+        assert metrics["rest_calls_avoided"] == 1
+        assert metrics["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_removed_non_karma_emoji_skips_lookup(self, reaction_cog):
+        await reaction_cog.on_raw_reaction_remove(reaction(emoji="🎉"))
+
+        assert reaction_cog.author_cache_metrics()["lookups"] == 0
+        reaction_cog.update_karma.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_self_vote_removed_without_fetching(self, reaction_cog):
+        await reaction_cog.on_raw_reaction_add(reaction(user_id=7, author_id=7))
+
+        reaction_cog.channel.fetch_message.assert_not_awaited()
+        reaction_cog.channel.get_partial_message.assert_called_once_with(100)
+        reaction_cog.channel.get_partial_message.return_value.remove_reaction.assert_awaited_once()
+        reaction_cog.update_karma.assert_not_awaited()
+
+    def test_cache_is_bounded(self, reaction_cog, monkeypatch):
+        monkeypatch.setattr("commands.karma.AUTHOR_CACHE_SIZE", 3)
+        for message_id in range(5):
+            reaction_cog._remember_author(message_id, 1)
+
+        assert list(reaction_cog._message_authors) == [2, 3, 4]
@@ -1247,3 +1247,61 @@ class TestFavoritesClear:
         interaction.response.send_message.assert_awaited_once_with(
             "🧹 Your favorites have been cleared.", ephemeral=True
         )
+
+
+class TestDashboardRefresh:
+    def playing_track(self, elapsed=10.0):
+        return SimpleNamespace(finished=False, paused=False, volume=0.5, elapsed=elapsed,
+                               metadata={"title": "Song", "duration": 200, "original_url": ""})
+
+    @pytest.mark.asyncio
+    async def test_refresh_edits_every_guild_without_waiting_between_them(self):
+        cog = make_music_cog()
+        messages = {}
+        for guild_id in ("1", "2", "3"):
+            msg = MagicMock(id=int(guild_id))
+            msg.channel.id = int(guild_id) * 10
+            msg.edit = AsyncMock()
+            messages[guild_id] = msg
+            cog.dashboard_messages[guild_id] = msg
+            cog.current_track[guild_id] = self.playing_track()
+
+        await cog._refresh_dashboards.coro(cog)
+        await cog._dashboard_edits.join()
+
+        for msg in messages.values():
+            msg.edit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_dashboard_is_not_edited_again(self):
+        cog = make_music_cog()
+        msg = MagicMock(id=1)
+        msg.channel.id = 10
+        msg.edit = AsyncMock()
+        cog.dashboard_messages["1"] = msg
+        cog.current_track["1"] = track = self.playing_track()
+
+        await cog._update_dashboard_for_guild("1")
+        await cog._update_dashboard_for_guild("1")
+        await cog._dashboard_edits.join()
+        await cog._update_dashboard_for_guild("1")
+        await cog._dashboard_edits.join()
+        assert msg.edit.await_count == 1
+
+        track.elapsed = 30.0
+        await cog._refresh_dashboards.coro(cog)
+        await cog._dashboard_edits.join()
+        assert msg.edit.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deleted_dashboard_is_dropped(self):
+        cog = make_music_cog()
+        msg = MagicMock(id=1)
+        msg.channel.id = 10
+        msg.edit = AsyncMock(side_effect=discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "gone"))
+        cog.dashboard_messages["1"] = msg
+
+        await cog._update_dashboard_for_guild("1")
+        await cog._dashboard_edits.join()
+
+        assert "1" not in cog.dashboard_messages
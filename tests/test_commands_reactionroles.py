@@ -0,0 +1,164 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+import loadnsave
+from commands._role_grant_queue import RoleGrantQueue
+from commands.reactionroles import ReactionRoles
+
+
+@pytest.fixture
+def isolated_reaction_roles(tmp_path, monkeypatch):
+    monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+    monkeypatch.setattr(loadnsave, "_REACTION_ROLES_CACHE", None)
+    monkeypatch.setattr(loadnsave, "_SAVE_LISTENERS", {})
+    return tmp_path
+
+
+class FakeMember:
+    def __init__(self, member_id, roles=()):
+        self.id = member_id
+        self.roles = list(roles)
+        self.add_roles = AsyncMock(side_effect=lambda role: self.roles.append(role))
+        self.remove_roles = AsyncMock(side_effect=lambda role: self.roles.remove(role))
+
+
+class FakeGuild:
+    def __init__(self, members, roles):
+        self.id = 555
+        self.name = "Guild"
+        self.members = {m.id: m for m in members}
+        self.roles = {r.id: r for r in roles}
+
+    def get_member(self, member_id):
+        return self.members.get(member_id)
+
+    def get_role(self, role_id):
+        return self.roles.get(role_id)
+
+
+def payload(message_id, emoji, user_id=7):
+    return SimpleNamespace(user_id=user_id, guild_id=555, message_id=message_id, emoji=emoji)
+
+
+@pytest_asyncio.fixture
+async def cog(isolated_reaction_roles):
+    bot = MagicMock()
+    bot.user.id = 1
+    cog = ReactionRoles(bot)
+    yield cog
+    cog.cog_unload()
+
+
+class TestRoutingTable:
+    @pytest.mark.asyncio
+    async def test_compiles_both_storage_formats(self, cog):
+        await loadnsave.save_reaction_roles({"555": {
+            "1000": {"channel_id": "9", "roles": {"👍": "111"}},
+            "1001": {"👎": "222"},
+        }})
+        await cog.cog_load()
+
+        assert cog.routes == {(1000, "👍"): 111, (1001, "👎"): 222}
+        assert cog.routed_messages == {1000, 1001}
+
+    @pytest.mark.asyncio
+    async def test_add_reaction_role_and_outside_saves_rebuild_table(self, cog):
+        await cog.cog_load()
+        await cog.add_reaction_role(555, 1000, "👍", 111, channel_id=9)
+        assert cog.routes == {(1000, "👍"): 111}
+
+        data = await loadnsave.load_reaction_roles()
+        del data["555"]["1000"]
+        await loadnsave.save_reaction_roles(data)
+        assert cog.routed_messages == set()
+
+    @pytest.mark.asyncio
+    async def test_reactions_route_to_grant_queue(self, cog):
+        await loadnsave.save_reaction_roles({"555": {"1000": {"roles": {"👍": "111"}}}})
+        await cog.cog_load()
+        role = SimpleNamespace(id=111)
+        member = FakeMember(7)
+        cog.bot.get_guild.return_value = FakeGuild([member], [role])
+
+        await cog.on_raw_reaction_add(payload(2000, "👍"))
+        await cog.on_raw_reaction_add(payload(1000, "👎"))
+        assert cog.grants.stats["submitted"] == 0
+
+        await cog.on_raw_reaction_add(payload(1000, "👍"))
+        await cog.grants.join()
+        assert member.roles == [role]
+
+        await cog.on_raw_reaction_remove(payload(1000, "👍"))
+        await cog.grants.join()
+        assert member.roles == []
+
+
+class TestRoleGrantQueue:
+    @pytest.mark.asyncio
+    async def test_react_unreact_before_drain_costs_no_request(self):
+        role = SimpleNamespace(id=111)
+        member = FakeMember(7)
+        guild = FakeGuild([member], [role])
+        queue = RoleGrantQueue(rate=1000)
+
+        queue.submit(guild, 7, 111, True)
+        queue.submit(guild, 7, 111, False)
+        await queue.join()
+
+        member.add_roles.assert_not_awaited()
+        member.remove_roles.assert_not_awaited()
+        assert (queue.stats["coalesced"], queue.stats["skipped"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_unreact_after_grant_is_sent_before_member_cache_updates(self):
+        role = SimpleNamespace(id=111)
+        member = FakeMember(7)
+        member.add_roles = AsyncMock()  # the cached roles lag the request
+        guild = FakeGuild([member], [role])
+        queue = RoleGrantQueue(rate=1000)
+
+        queue.submit(guild, 7, 111, True)
+        await queue.join()
+        queue.submit(guild, 7, 111, False)
+        await queue.join()
+
+        member.add_roles.assert_awaited_once_with(role)
+        member.remove_roles.assert_awaited_once_with(role)
+        assert queue.stats["skipped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_keeps_the_guild_queue_draining(self):
+        role = SimpleNamespace(id=111)
+        broken, member = FakeMember(6), FakeMember(7)
+        broken.add_roles = AsyncMock(side_effect=RuntimeError("boom"))
+        guild = FakeGuild([broken, member], [role])
+        queue = RoleGrantQueue(rate=1000)
+
+        queue.submit(guild, 6, 111, True)
+        queue.submit(guild, 7, 111, True)
+        await queue.join()
+
+        assert member.roles == [role]
+        assert (queue.stats["errors"], queue.stats["granted"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_burst_is_paced_by_budget(self):
+        role = SimpleNamespace(id=111)
+        members = [FakeMember(i) for i in range(6)]
+        guild = FakeGuild(members, [role])
+        queue = RoleGrantQueue(rate=100, burst=2)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        for member in members:
+            queue.submit(guild, member.id, 111, True)
+        await queue.join()
+
+        assert all(m.roles == [role] for m in members)
+        assert queue.stats["granted"] == 6
+        # Two from the burst, then four refills at 10 ms each.
+        assert loop.time() - started >= 0.035
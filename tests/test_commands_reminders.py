@@ -0,0 +1,124 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+import loadnsave
+from commands.reminders import Reminders
+
+
+@pytest.fixture
+def isolated_reminders(tmp_path, monkeypatch):
+    monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+    monkeypatch.setattr(loadnsave, "_REMINDER_DATA_CACHE", None)
+    monkeypatch.setattr(loadnsave, "_SAVE_LISTENERS", {})
+    monkeypatch.setattr(loadnsave, "_VIEWS", {})
+    monkeypatch.setattr(loadnsave, "_DIRTY", {})
+    monkeypatch.setattr(loadnsave, "_FRAGMENTS", {})
+    return tmp_path
+
+
+def reminder(reminder_id, due, user_id=5, channel_id=10):
+    return {"id": reminder_id, "user_id": user_id, "channel_id": channel_id,
+            "message": f"note {reminder_id}", "due_timestamp": due, "created_at": due - 60}
+
+
+@pytest_asyncio.fixture
+async def cog(isolated_reminders):
+    bot = MagicMock()
+    bot.wait_until_ready = AsyncMock()
+    cog = Reminders(bot)
+    cog.delivered = []
+
+    async def record(r):
+        cog.delivered.append((r["id"], time.monotonic()))
+
+    cog.send_reminder = record
+    yield cog
+    cog.cog_unload()
+
+
+class TestReminderScheduler:
+    @pytest.mark.asyncio
+    async def test_fires_when_due_not_on_a_poll(self, cog):
+        await cog.cog_load()
+        started = time.monotonic()
+        await cog.create_reminder_api(1, 10, 5, "soon", 0.1)
+
+        await asyncio.sleep(0.05)
+        assert cog.delivered == []
+        await asyncio.sleep(0.15)
+
+        [(_, fired_at)] = cog.delivered
+        assert 0.08 <= fired_at - started < 0.2
+        assert cog.reminders == {}
+
+    @pytest.mark.asyncio
+    async def test_earlier_reminder_wakes_scheduler(self, cog):
+        await cog.cog_load()
+        await cog.create_reminder_api(1, 10, 5, "next week", 604800)
+        await asyncio.sleep(0.01)  # scheduler is now sleeping for a week
+        await cog.create_reminder_api(1, 10, 5, "now-ish", 0.05)
+
+        await asyncio.sleep(0.15)
+        assert len(cog.delivered) == 1
+        assert [r["message"] for r in cog.reminders["1"]] == ["next week"]
+
+    @pytest.mark.asyncio
+    async def test_due_reminders_are_delivered_concurrently(self, cog):
+        now = time.time()
+        await loadnsave.save_reminder_data({"1": [reminder("a", now - 5)], "2": [reminder("b", now - 1)]})
+        release = asyncio.Event()
+        started = []
+
+        async def slow_send(r):
+            started.append(r["id"])
+            await release.wait()
+
+        cog.send_reminder = slow_send
+        await cog.cog_load()
+        await asyncio.sleep(0.02)
+
+        assert sorted(started) == ["a", "b"]
+        release.set()
+
+    @pytest.mark.asyncio
+    async def test_only_fired_guilds_are_marked_and_written(self, cog, isolated_reminders):
+        now = time.time()
+        await loadnsave.save_reminder_data({
+            "1": [reminder("due", now - 1), reminder("later", now + 3600)],
+            "2": [reminder("other", now + 7200)],
+        })
+        await cog.cog_load()
+        loadnsave._DIRTY.clear()
+
+        fired = await cog._fire_due()
+
+        assert [r["id"] for r in fired] == ["due"]
+        assert loadnsave._DIRTY == {"reminder_data.json": {"1"}}
+        await loadnsave.flush_dirty()
+        on_disk = json.loads((isolated_reminders / "reminder_data.json").read_text())
+        assert [r["id"] for r in on_disk["1"]] == ["later"]
+        assert [r["id"] for r in on_disk["2"]] == ["other"]
+
+    @pytest.mark.asyncio
+    async def test_deleted_reminder_never_fires(self, cog):
+        await cog.cog_load()
+        ok, created = await cog.create_reminder_api(1, 10, 5, "cancel me", 0.05)
+        assert (await cog.delete_reminder_api(1, created["id"]))[0]
+
+        await asyncio.sleep(0.1)
+        assert cog.delivered == []
+
+    @pytest.mark.asyncio
+    async def test_outside_save_rebuilds_schedule(self, cog):
+        await cog.cog_load()
+        async with loadnsave.edit_data('reminder_data.json') as data:
+            data["3"] = [reminder("edited", time.time() + 0.05)]
+
+        assert cog.reminders is loadnsave._REMINDER_DATA_CACHE
+        await asyncio.sleep(0.15)
+        assert [rid for rid, _ in cog.delivered] == ["edited"]
@@ -0,0 +1,102 @@
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import loadnsave
+from commands.smartreaction import SmartReactionMatcher, smartreaction
+
+
+def naive(reactions, content):
+    """The per-word scan on_message used before the compiled matcher."""
+    return [(w, e) for w, e in reactions.items() if w.lower() in content.lower()]
+
+
+class TestSmartReactionMatcher:
+    def test_overlapping_and_nested_words_all_match(self):
+        reactions = {"cats": "🐈", "cat": "🐱", "at": "🅰️", "scat": "💩", "dog": "🐕"}
+        matcher = SmartReactionMatcher(reactions)
+
+        assert matcher.matches("The SCATS were here") == naive(reactions, "The SCATS were here")
+        assert matcher.matches("nothing here") == []
+
+    def test_configuration_order_is_kept(self):
+        reactions = {"zebra": "🦓", "apple": "🍎", "app": "📱"}
+        assert SmartReactionMatcher(reactions).matches("apple zebra") == [
+            ("zebra", "🦓"), ("apple", "🍎"), ("app", "📱"),
+        ]
+
+    def test_regex_metacharacters_and_mixed_case_words(self):
+        reactions = {"c++": "➕", "a.b": "🔵", "Ia!": "🙏", "(y)": "👍"}
+        matcher = SmartReactionMatcher(reactions)
+
+        assert matcher.matches("c++ and ia! (y)") == [("c++", "➕"), ("Ia!", "🙏"), ("(y)", "👍")]
+        assert matcher.matches("aXb") == []
+
+    def test_empty_word_always_matches(self):
+        assert SmartReactionMatcher({"": "❓", "x": "❌"}).matches("abc") == [("", "❓")]
+
+    def test_agrees_with_naive_scan(self):
+        rng = random.Random(3)
+        alphabet = "abcab "
+        for _ in range(200):
+            words = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))): "🐙" for _ in range(rng.randint(1, 12))}
+            content = "".join(rng.choice(alphabet + "ABC") for _ in range(rng.randint(0, 40)))
+            assert SmartReactionMatcher(words).matches(content) == naive(words, content)
+
+
+@pytest.fixture
+def isolated_smart_react(tmp_path, monkeypatch):
+    monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+    monkeypatch.setattr(loadnsave, "_SMART_REACT_CACHE", None)
+    monkeypatch.setattr(loadnsave, "_SAVE_LISTENERS", {})
+    monkeypatch.setattr(loadnsave, "_VIEWS", {})
+
+
+def make_message(content, guild_id=1):
+    message = MagicMock()
+    message.content = content
+    message.guild.id = guild_id
+    message.add_reaction = AsyncMock()
+    return message
+
+
+class TestSmartReactionCog:
+    @pytest.mark.asyncio
+    async def test_matcher_reused_until_save(self, isolated_smart_react, monkeypatch):
+        await loadnsave.smartreact_save({"1": {"shoggoth": "🫧"}})
+        cog = smartreaction(MagicMock())
+        await cog.cog_load()
+
+        built = []
+        real_matcher = SmartReactionMatcher
+        monkeypatch.setattr("commands.smartreaction.SmartReactionMatcher",
+                            lambda reactions: built.append(dict(reactions)) or real_matcher(reactions))
+
+        first = make_message("A Shoggoth!")
+        await cog.on_message(first)
+        await cog.on_message(make_message("shoggoth again"))
+        first.add_reaction.assert_awaited_once_with("🫧")
+        assert len(built) == 1
+
+        async with loadnsave.edit_data('smart_react.json') as reactions:
+            reactions["1"]["tekeli"] = "🐧"
+
+        second = make_message("tekeli-li, said the shoggoth")
+        await cog.on_message(second)
+        assert len(built) == 2
+        assert [c.args[0] for c in second.add_reaction.await_args_list] == ["🫧", "🐧"]
+
+        cog.cog_unload()
+        assert loadnsave._SAVE_LISTENERS['smart_react.json'] == []
+
+    @pytest.mark.asyncio
+    async def test_guild_without_reactions_is_skipped(self, isolated_smart_react):
+        await loadnsave.smartreact_save({"2": {"word": "🐙"}})
+        cog = smartreaction(MagicMock())
+
+        message = make_message("word", guild_id=1)
+        await cog.on_message(message)
+
+        message.add_reaction.assert_not_awaited()
+        assert cog._matchers == {}
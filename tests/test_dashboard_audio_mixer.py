@@ -1,8 +1,9 @@
+import struct
 from unittest.mock import MagicMock
 
 import pytest
 
-from dashboard.audio_mixer import Track, MixingAudioSource
+from dashboard.audio_mixer import CHUNK_SIZE, PcmMixer, Track, MixingAudioSource
 
 
 @pytest.fixture(autouse=True)
@@ -92,3 +93,81 @@ class TestMixingAudioSourceSeekTrack:
 
         assert result is True
         assert track.elapsed == pytest.approx(50, abs=0.05)
+
+
+def pcm(*samples):
+    """Pack `samples` as one full 16-bit frame, repeating the pattern to CHUNK_SIZE."""
+    n = CHUNK_SIZE // 2
+    values = (list(samples) * (n // len(samples) + 1))[:n]
+    return struct.pack(f'<{n}h', *values)
+
+
+def unpack(data, count=4):
+    return list(struct.unpack(f'<{count}h', data[:count * 2]))
+
+
+class TestPcmMixer:
+    def test_empty_frame_is_silence(self):
+        mixer = PcmMixer()
+        mixer.reset()
+        assert mixer.render() == b'\x00' * CHUNK_SIZE
+
+    def test_sums_all_tracks_before_clipping(self):
+        mixer = PcmMixer()
+        mixer.reset()
+        mixer.add(pcm(30000, -30000))
+        mixer.add(pcm(30000, -30000))
+        mixer.add(pcm(-30000, 30000))
+        # Pairwise clipping would have produced 2767/-2768 here.
+        assert unpack(mixer.render()) == [30000, -30000, 30000, -30000]
+
+    def test_clips_to_int16_range(self):
+        mixer = PcmMixer()
+        mixer.reset()
+        mixer.add(pcm(30000, -30000, 100, -5))
+        mixer.add(pcm(30000, -30000, 200, 5))
+        assert unpack(mixer.render()) == [32767, -32768, 300, 0]
+
+    def test_volume_truncates_toward_zero(self):
+        mixer = PcmMixer()
+        mixer.reset()
+        mixer.add(pcm(1001, -1001, 3, -3), volume=0.5)
+        assert unpack(mixer.render()) == [500, -500, 1, -1]
+
+    def test_reset_clears_previous_frame(self):
+        mixer = PcmMixer()
+        mixer.reset()
+        mixer.add(pcm(1000))
+        mixer.render()
+        mixer.reset()
+        mixer.add(pcm(7))
+        assert unpack(mixer.render()) == [7, 7, 7, 7]
+        assert mixer.sources == 1
+
+
+class TestMixingAudioSourceRead:
+    def test_read_mixes_active_tracks_with_their_volumes(self):
+        mixer = MixingAudioSource()
+        music = mixer.add_track(file_path="http://a", is_url=True, volume=1.0)
+        effect = mixer.add_track(file_path="http://b", is_url=True, volume=0.5)
+        music.source.read.return_value = pcm(1000, -1000)
+        effect.source.read.return_value = pcm(400, 400)
+
+        assert unpack(mixer.read()) == [1200, -800, 1200, -800]
+
+    def test_read_skips_paused_tracks_without_reading(self):
+        mixer = MixingAudioSource()
+        track = mixer.add_track(file_path="http://a", is_url=True, volume=1.0)
+        track.source.read.return_value = pcm(1000)
+        track.paused = True
+
+        assert mixer.read() == b'\x00' * CHUNK_SIZE
+        track.source.read.assert_not_called()
+
+    def test_read_drops_finished_tracks(self):
+        mixer = MixingAudioSource()
+        track = mixer.add_track(file_path="http://a", is_url=True)
+
+        assert mixer.read() == b'\x00' * CHUNK_SIZE
+        assert track.finished is True
+        assert mixer.tracks == []
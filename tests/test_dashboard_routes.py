@@ -1,7 +1,7 @@
 import pytest
 from dashboard.app import app
 import json
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 @pytest.fixture
 def client():
@@ -84,3 +84,23 @@ async def test_api_fonts_list_unauthorized_without_session(client):
     """/api/* routes require session login except _PUBLIC_API entries."""
     response = await client.get('/api/fonts/list')
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_api_status_hides_extension_timings_from_anonymous(client):
+    bot = MagicMock()
+    bot.is_ready.return_value = False
+    bot.startup_report = {
+        "extensions": [{"name": "codex", "status": "failed", "error": "secret path"}],
+        "loaded": 0, "failed": 1, "load_ms": 10, "ready_ms": None,
+    }
+    with patch.object(app, 'bot', bot):
+        response = await client.get('/api/status')
+        data = json.loads(await response.get_data(as_text=True))
+        assert data["startup"] == {"loaded": 0, "failed": 1, "load_ms": 10, "ready_ms": None}
+
+        async with client.session_transaction() as sess:
+            sess['logged_in'] = True
+        response = await client.get('/api/status')
+        data = json.loads(await response.get_data(as_text=True))
+        assert data["startup"]["extensions"][0]["name"] == "codex"
@@ -45,10 +45,16 @@ ENTITY_CASES = [
     ),
     pytest.param(
         loadnsave.load_karma_stats, loadnsave.save_karma_stats,
-        "karma_stats.json", None,
+        "karma_stats.json", "_KARMA_STATS_CACHE",
         {"123": {"456": 5}},
         id="karma_stats",
     ),
+    pytest.param(
+        loadnsave.load_karma_settings, loadnsave.save_karma_settings,
+        "karma_settings.json", "_KARMA_SETTINGS_CACHE",
+        {"123": {"channel_id": 456, "upvote_emoji": "👌", "downvote_emoji": "🤏", "roles": {}}},
+        id="karma_settings",
+    ),
     pytest.param(
         loadnsave.load_retired_characters_data, loadnsave.save_retired_characters_data,
         "retired_characters_data.json", "_RETIRED_CHARACTERS_CACHE",
@@ -69,7 +75,8 @@ def isolated_data_dir(tmp_path, monkeypatch):
     monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
     for cache_name in [
         "_PLAYER_STATS_CACHE", "_SERVER_STATS_CACHE", "_SESSION_DATA_CACHE",
-        "_CHASE_DATA_CACHE", "_RETIRED_CHARACTERS_CACHE",
+        "_CHASE_DATA_CACHE", "_RETIRED_CHARACTERS_CACHE", "_KARMA_STATS_CACHE",
+        "_KARMA_SETTINGS_CACHE", "_KARMA_CHANNEL_INDEX",
     ]:
         monkeypatch.setattr(loadnsave, cache_name, None)
     return tmp_path
@@ -107,3 +114,38 @@ async def test_load_json_file_backs_up_corrupt_file(isolated_data_dir):
 
     assert result == {}
     assert (isolated_data_dir / "server_stats.json.bak").exists()
+
+
+@pytest.mark.asyncio
+async def test_karma_channel_index_reads_disk_once(isolated_data_dir, monkeypatch):
+    (isolated_data_dir / "karma_settings.json").write_text(
+        json.dumps({"1": {"channel_id": 10}, "2": {"channel_id": "20"}, "3": {"roles": {}}}),
+        encoding="utf-8",
+    )
+    reads = []
+    real_load = loadnsave._load_json_file
+
+    async def counting_load(folder, filename):
+        reads.append(filename)
+        return await real_load(folder, filename)
+
+    monkeypatch.setattr(loadnsave, "_load_json_file", counting_load)
+
+    assert (await loadnsave.get_karma_channel_settings(1, 10))["channel_id"] == 10
+    assert (await loadnsave.get_karma_channel_settings("2", 20))["channel_id"] == "20"
+    assert await loadnsave.get_karma_channel_settings(1, 11) is None
+    assert await loadnsave.get_karma_channel_settings(3, 10) is None
+    assert await loadnsave.get_karma_channel_settings(None, 10) is None
+    assert reads == ["karma_settings.json"]
+
+
+@pytest.mark.asyncio
+async def test_karma_channel_index_follows_invalidation(isolated_data_dir):
+    await loadnsave.save_karma_settings({"1": {"channel_id": 10}})
+    assert await loadnsave.get_karma_channel_settings(1, 10) is not None
+
+    (isolated_data_dir / "karma_settings.json").write_text(json.dumps({"1": {"channel_id": 12}}), encoding="utf-8")
+    loadnsave.invalidate_data_cache("karma_settings.json")
+
+    assert await loadnsave.get_karma_channel_settings(1, 10) is None
+    assert await loadnsave.get_karma_channel_settings(1, 12) is not None
@@ -0,0 +1,85 @@
+from types import MappingProxyType
+
+import pytest
+
+import loadnsave
+
+
+@pytest.fixture
+def isolated_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+    for cache_name in ["_SMART_REACT_CACHE", "_MUSIC_BLACKLIST_CACHE", "_SERVER_STATS_CACHE"]:
+        monkeypatch.setattr(loadnsave, cache_name, None)
+    monkeypatch.setattr(loadnsave, "_VIEWS", {})
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_load_view_is_read_only_and_reused(isolated_data_dir):
+    await loadnsave.smartreact_save({"1": {"cthulhu": "🐙"}})
+
+    view = await loadnsave.load_view("smart_react.json")
+
+    assert isinstance(view, MappingProxyType)
+    assert view["1"]["cthulhu"] == "🐙"
+    with pytest.raises(TypeError):
+        view["2"] = {}
+    assert await loadnsave.load_view("smart_react.json") is view
+
+
+@pytest.mark.asyncio
+async def test_load_view_refreshes_after_save_and_invalidation(isolated_data_dir):
+    await loadnsave.smartreact_save({"1": {"a": "🅰️"}})
+    first = await loadnsave.load_view("smart_react.json")
+
+    await loadnsave.smartreact_save({"1": {"b": "🅱️"}})
+    second = await loadnsave.load_view("smart_react.json")
+    assert second is not first
+    assert dict(second) == {"1": {"b": "🅱️"}}
+
+    loadnsave.invalidate_data_cache("smart_react.json")
+    assert await loadnsave.load_view("smart_react.json") == {"1": {"b": "🅱️"}}
+
+
+@pytest.mark.asyncio
+async def test_list_documents_get_tuple_snapshots(isolated_data_dir):
+    await loadnsave.save_music_blacklist(["https://bad.example"])
+
+    view = await loadnsave.load_view("music_blacklist.json")
+
+    assert view == ("https://bad.example",)
+
+
+@pytest.mark.asyncio
+async def test_edit_data_commits_a_private_copy(isolated_data_dir):
+    await loadnsave.smartreact_save({"1": {"a": "🅰️"}})
+    before = await loadnsave.load_view("smart_react.json")
+
+    async with loadnsave.edit_data("smart_react.json") as reactions:
+        reactions["1"]["b"] = "🅱️"
+        # Nothing is visible to readers until the block commits.
+        assert "b" not in before["1"]
+
+    after = await loadnsave.load_view("smart_react.json")
+    assert dict(after["1"]) == {"a": "🅰️", "b": "🅱️"}
+    assert "b" not in before["1"]
+    assert (isolated_data_dir / "smart_react.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_edit_data_discards_changes_on_error(isolated_data_dir):
+    await loadnsave.smartreact_save({"1": {"a": "🅰️"}})
+
+    with pytest.raises(RuntimeError):
+        async with loadnsave.edit_data("smart_react.json") as reactions:
+            reactions["1"].clear()
+            raise RuntimeError("abort")
+
+    assert (await loadnsave.load_view("smart_react.json"))["1"] == {"a": "🅰️"}
+
+
+@pytest.mark.asyncio
+async def test_save_server_stats_keeps_caller_object_without_copying(isolated_data_dir):
+    stats = {"1": "?"}
+    await loadnsave.save_server_stats(stats)
+    assert await loadnsave.load_server_stats() is stats
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+
+import loadnsave
+
+
+@pytest.fixture
+def isolated_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+    monkeypatch.setattr(loadnsave, "_SETTINGS_CACHE", {})
+    for cache_name in ["_PLAYER_STATS_CACHE", "_KARMA_STATS_CACHE", "_SMART_REACT_CACHE"]:
+        monkeypatch.setattr(loadnsave, cache_name, None)
+    monkeypatch.setattr(loadnsave, "_DIRTY", {})
+    monkeypatch.setattr(loadnsave, "_FRAGMENTS", {})
+    monkeypatch.setattr(loadnsave, "_WRITE_BEHIND_STATS", dict.fromkeys(loadnsave._WRITE_BEHIND_STATS, 0))
+    return tmp_path
+
+
+def read_json(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.asyncio
+async def test_mark_dirty_defers_write_until_flush(isolated_data_dir):
+    stats = await loadnsave.load_karma_stats()
+    stats.setdefault("1", {})["10"] = 3
+    loadnsave.mark_dirty("karma_stats.json", "1")
+
+    assert not (isolated_data_dir / "karma_stats.json").exists()
+    assert loadnsave.has_pending_writes()
+
+    assert await loadnsave.flush_dirty() == 1
+    assert read_json(isolated_data_dir / "karma_stats.json") == {"1": {"10": 3}}
+    assert not loadnsave.has_pending_writes()
+
+
+@pytest.mark.asyncio
+async def test_many_marks_coalesce_into_one_write(isolated_data_dir):
+    stats = await loadnsave.load_karma_stats()
+    stats["1"] = {}
+    for vote in range(50):
+        stats["1"]["10"] = vote
+        loadnsave.mark_dirty("karma_stats.json", "1")
+
+    await loadnsave.flush_dirty()
+
+    result = loadnsave.get_write_behind_stats()
+    assert result["marks"] == 50
+    assert result["files_written"] == 1
+    assert result["marks_coalesced"] == 49
+    assert result["bytes_written"] == (isolated_data_dir / "karma_stats.json").stat().st_size
+
+
+@pytest.mark.asyncio
+async def test_only_dirty_guild_is_reserialized_and_output_matches_json_dumps(isolated_data_dir):
+    stats = await loadnsave.load_player_stats()
+    stats.update({"1": {"10": {"NAME": "A", "LUCK": 50}}, "2": {"20": {"NAME": "Ü", "LUCK": 40}}})
+    loadnsave.mark_dirty("player_stats.json")
+    await loadnsave.flush_dirty()
+
+    stats["2"]["20"]["LUCK"] = 35
+    loadnsave.mark_dirty("player_stats.json", "2")
+    before = loadnsave.get_write_behind_stats()
+    await loadnsave.flush_dirty()
+    after = loadnsave.get_write_behind_stats()
+
+    assert after["fragments_serialized"] - before["fragments_serialized"] == 1
+    assert after["fragments_reused"] - before["fragments_reused"] == 1
+    text = (isolated_data_dir / "player_stats.json").read_text(encoding="utf-8")
+    assert text == json.dumps(stats, indent=4)
+
+
+@pytest.mark.asyncio
+async def test_full_save_cancels_pending_write_behind(isolated_data_dir):
+    stats = await loadnsave.load_karma_stats()
+    stats["1"] = {"10": 1}
+    loadnsave.mark_dirty("karma_stats.json", "1")
+
+    await loadnsave.save_karma_stats({"1": {"10": 99}})
+
+    assert not loadnsave.has_pending_writes()
+    assert await loadnsave.flush_dirty() == 0
+    assert read_json(isolated_data_dir / "karma_stats.json") == {"1": {"10": 99}}
+
+
+@pytest.mark.asyncio
+async def test_flush_skips_entity_invalidated_after_mark(isolated_data_dir):
+    stats = await loadnsave.load_karma_stats()
+    stats["1"] = {"10": 1}
+    loadnsave.mark_dirty("karma_stats.json", "1")
+
+    loadnsave.invalidate_data_cache("karma_stats.json")
+
+    assert await loadnsave.flush_dirty() == 0
+    assert not (isolated_data_dir / "karma_stats.json").exists()
+
+
+def test_mark_dirty_rejects_entities_whose_loader_returns_a_copy():
+    with pytest.raises(ValueError):
+        loadnsave.mark_dirty("smart_react.json")
+
+
+@pytest.mark.asyncio
+async def test_flusher_flushes_on_cancel(isolated_data_dir):
+    stats = await loadnsave.load_karma_stats()
+    task = asyncio.create_task(loadnsave.write_behind_flusher(interval=3600))
+    await asyncio.sleep(0)
+
+    stats["1"] = {"10": 7}
+    loadnsave.mark_dirty("karma_stats.json", "1")
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert read_json(isolated_data_dir / "karma_stats.json") == {"1": {"10": 7}}
+    assert not list(isolated_data_dir.glob("*.tmp"))
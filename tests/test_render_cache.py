@@ -0,0 +1,173 @@
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+
+import loadnsave
+import render_cache
+from render_cache import RenderCache, record_hash
+from render_service import RenderService
+
+MONSTERS = {"monsters": [
+    {"monster_entry": {"name": "Deep One", "STR": 80}},
+    {"monster_entry": {"name": "Byakhee", "STR": 90}},
+]}
+PLAYER_STATS = {
+    "1": {"10": {"NAME": "Harvey Walters", "HP": 10}, "11": {"NAME": "Mary Ann", "HP": 9}},
+}
+
+
+@pytest.fixture
+def sources(monkeypatch, tmp_path):
+    """Isolated player stats, monster data, templates, images and settings."""
+    monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path / "data"))
+    monkeypatch.setattr(loadnsave, "_PLAYER_STATS_CACHE", None)
+    monkeypatch.setattr(loadnsave, "_SAVE_LISTENERS", {})
+    monkeypatch.setattr(render_cache, "load_player_stats", loadnsave.load_player_stats)
+
+    monsters = {"data": MONSTERS}
+    loader = AsyncMock(side_effect=lambda: monsters["data"])
+    monkeypatch.setitem(render_cache._CODEX_SOURCES, "monster", (loader, "monsters", "monster_entry", "render_monster.html"))
+
+    templates = tmp_path / "templates"
+    (templates / "includes").mkdir(parents=True)
+    for name in ("render_monster.html", "render_monster_origin.html", "render_character.html", "includes/font_styles.html"):
+        (templates / name).write_text("<html></html>")
+    monkeypatch.setattr(render_cache, "TEMPLATES_FOLDER", str(templates))
+
+    images = tmp_path / "images"
+    monkeypatch.setattr(render_cache, "IMAGES_FOLDER", str(images))
+
+    settings = {"dashboard_theme": "cthulhu"}
+    monkeypatch.setattr(render_cache, "load_settings_async", AsyncMock(side_effect=lambda: dict(settings)))
+
+    return {"monsters": monsters, "templates": templates, "images": images, "settings": settings}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RenderCache(str(tmp_path / "data" / "render_cache"), max_bytes=1000)
+
+
+class TestRenderCacheKeys:
+    @pytest.mark.asyncio
+    async def test_same_inputs_same_key(self, sources, cache):
+        a = await cache.key_for("/render/monster?name=Deep%20One")
+        b = await cache.key_for("/render/monster?name=Deep%20One")
+        assert a is not None and a == b
+        assert await cache.key_for("/render/monster?name=Byakhee") != a
+        assert await cache.key_for("/render/monster?name=Deep%20One&style=origin") != a
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_paths(self, sources, cache):
+        assert await cache.key_for("/render/karma/1/10?rank=Elder&type=up") is None
+        assert await cache.key_for("/render/newspaper?headline=Extra") is None
+        assert await cache.key_for("/render/monster?name=Nobody") is None
+        assert await cache.key_for("/render/monster") is None
+        assert await cache.key_for("/render/character/1/99") is None
+
+    @pytest.mark.asyncio
+    async def test_record_change_changes_key(self, sources, cache):
+        before = await cache.key_for("/render/monster?name=deep one")
+        sources["monsters"]["data"] = {"monsters": [{"monster_entry": {"name": "Deep One", "STR": 85}}]}
+        assert await cache.key_for("/render/monster?name=deep one") != before
+
+    @pytest.mark.asyncio
+    async def test_template_change_changes_key(self, sources, cache):
+        before = await cache.key_for("/render/monster?name=Deep One")
+        include = sources["templates"] / "includes" / "font_styles.html"
+        st = os.stat(include)
+        os.utime(include, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert await cache.key_for("/render/monster?name=Deep One") != before
+
+    @pytest.mark.asyncio
+    async def test_theme_and_image_change_key(self, sources, cache):
+        before = await cache.key_for("/render/monster?name=Deep One")
+        sources["settings"]["dashboard_theme"] = "pulp"
+        themed = await cache.key_for("/render/monster?name=Deep One")
+        assert themed != before
+
+        (sources["images"] / "monster").mkdir(parents=True)
+        (sources["images"] / "monster" / "Deep_One.png").write_bytes(b"img")
+        assert await cache.key_for("/render/monster?name=Deep One") != themed
+
+    @pytest.mark.asyncio
+    async def test_character_key_names_investigator(self, sources, cache):
+        await loadnsave.save_player_stats({g: dict(c) for g, c in PLAYER_STATS.items()})
+        key = await cache.key_for("/render/character/1/10")
+        assert key.startswith(f"char-1-10-{record_hash(PLAYER_STATS['1']['10'])}-")
+
+
+class TestRenderCacheStorage:
+    @pytest.mark.asyncio
+    async def test_put_get_roundtrip_and_restart(self, cache):
+        key = "a" * 64 + ".png"
+        assert await cache.get(key) is None
+        await cache.put(key, b"png-bytes")
+        assert await cache.get(key) == b"png-bytes"
+
+        reopened = RenderCache(cache.folder, max_bytes=1000)
+        assert await reopened.get(key) == b"png-bytes"
+        assert reopened.snapshot()["bytes"] == len(b"png-bytes")
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_respects_recent_use(self, cache):
+        keys = [c * 64 + ".png" for c in "abc"]
+        await cache.put(keys[0], b"x" * 400)
+        await cache.put(keys[1], b"x" * 400)
+        await cache.get(keys[0])
+        await cache.put(keys[2], b"x" * 400)
+
+        assert await cache.get(keys[1]) is None
+        assert await cache.get(keys[0]) is not None
+        assert await cache.get(keys[2]) is not None
+        assert not os.path.exists(os.path.join(cache.folder, keys[1]))
+        assert cache.stats["evictions"] == 1
+
+
+class TestCharacterInvalidation:
+    @pytest.mark.asyncio
+    async def test_save_player_stats_drops_changed_investigator_only(self, sources, cache):
+        loadnsave.add_save_listener('player_stats.json', cache.forget_changed_characters)
+        stats = {g: {u: dict(c) for u, c in chars.items()} for g, chars in PLAYER_STATS.items()}
+        await loadnsave.save_player_stats(stats)
+
+        harvey = await cache.key_for("/render/character/1/10")
+        mary = await cache.key_for("/render/character/1/11")
+        await cache.put(harvey, b"harvey")
+        await cache.put(mary, b"mary")
+
+        stats["1"]["10"]["HP"] = 4
+        await loadnsave.save_player_stats(stats)
+
+        assert harvey not in cache._index()
+        assert not os.path.exists(os.path.join(cache.folder, harvey))
+        assert await cache.get(mary) == b"mary"
+        assert cache.stats["invalidations"] == 1
+        assert await cache.key_for("/render/character/1/10") != harvey
+
+
+class TestRenderServiceWithCache:
+    @pytest.mark.asyncio
+    async def test_second_render_skips_browser(self, sources, cache):
+        service = RenderService(cache=cache)
+        service._run_job = AsyncMock(return_value=b"poster")
+
+        first = await service.render("/render/monster?name=Deep One", ".coc-sheet", (1100, 1200))
+        second = await service.render("/render/monster?name=Deep One", ".coc-sheet", (1100, 1200))
+
+        assert first == second == b"poster"
+        service._run_job.assert_awaited_once()
+        assert service.stats["cache_hits"] == 1
+        assert service.snapshot()["cache"]["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_routes_always_render(self, sources, cache):
+        service = RenderService(cache=cache)
+        service._run_job = AsyncMock(return_value=b"card")
+
+        await service.render("/render/karma/1/10?rank=A&type=up", ".karma-card", (800, 400))
+        await service.render("/render/karma/1/10?rank=A&type=up", ".karma-card", (800, 400))
+
+        assert service._run_job.await_count == 2
+        assert cache.snapshot()["entries"] == 0
@@ -0,0 +1,273 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import render_service
+from render_service import RenderError, RenderService
+from commands.karma import Karma
+from commands.printcharacter import PrintCharacter
+
+
+class FakeElement:
+    async def screenshot(self, omit_background=False):
+        return b"element-png"
+
+
+class FakeResponse:
+    def __init__(self, status=200):
+        self.status = status
+        self.ok = 200 <= status < 300
+
+
+class FakePage:
+    def __init__(self, browser, viewport):
+        self.browser = browser
+        self.viewport = viewport
+        self.closed = False
+        self.visits = []
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    async def set_viewport_size(self, viewport):
+        self.viewport = viewport
+
+    async def goto(self, url, timeout=None):
+        self.visits.append(url)
+        self.browser.in_flight += 1
+        self.browser.max_in_flight = max(self.browser.max_in_flight, self.browser.in_flight)
+        try:
+            await asyncio.sleep(self.browser.delay)
+        finally:
+            self.browser.in_flight -= 1
+        if self.browser.goto_error:
+            raise self.browser.goto_error
+        return FakeResponse(self.browser.status)
+
+    async def wait_for_selector(self, selector, timeout=None):
+        if self.browser.missing_selector:
+            raise TimeoutError(selector)
+        return FakeElement()
+
+    async def screenshot(self, full_page=False, omit_background=False):
+        return b"page-png-full" if full_page else b"page-png"
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.pages = []
+        self.delay = 0
+        self.status = 200
+        self.goto_error = None
+        self.missing_selector = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_page(self, viewport=None):
+        page = FakePage(self, viewport)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.browsers = []
+        self.chromium = MagicMock()
+        self.chromium.launch = AsyncMock(side_effect=self._launch)
+        self.stopped = False
+
+    async def _launch(self):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    pw = FakePlaywright()
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=pw)
+    monkeypatch.setattr(render_service, "playwright_api", MagicMock(async_playwright=MagicMock(return_value=starter)))
+    return pw
+
+
+class TestRenderService:
+    @pytest.mark.asyncio
+    async def test_browser_is_launched_once_and_pages_reused(self, fake_playwright):
+        service = RenderService(max_pages=2)
+
+        for _ in range(5):
+            assert await service.render("/render/karma/1/2", ".karma-card", (800, 400)) == b"element-png"
+
+        assert len(fake_playwright.browsers) == 1
+        browser = fake_playwright.browsers[0]
+        assert len(browser.pages) == 1
+        assert browser.pages[0].visits[0] == "http://127.0.0.1:5000/render/karma/1/2"
+        assert service.stats["jobs"] == 5
+        assert service.stats["launches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reused_page_takes_the_new_viewport(self, fake_playwright):
+        service = RenderService(max_pages=1)
+        await service.render("/a", ".coc-sheet", (1000, 1200))
+        await service.render("/b", ".karma-card", (800, 400))
+
+        page = fake_playwright.browsers[0].pages[0]
+        assert page.viewport == {'width': 800, 'height': 400}
+
+    @pytest.mark.asyncio
+    async def test_burst_is_bounded_by_pool_size(self, fake_playwright):
+        service = RenderService(max_pages=2)
+        await service.render("/warm", ".karma-card", (800, 400))
+        fake_playwright.browsers[0].delay = 0.02
+
+        results = await asyncio.gather(*(service.render(f"/k/{i}", ".karma-card", (800, 400)) for i in range(8)))
+
+        browser = fake_playwright.browsers[0]
+        assert results == [b"element-png"] * 8
+        assert browser.max_in_flight == 2
+        assert len(browser.pages) == 2
+        assert len(fake_playwright.browsers) == 1
+        assert service.stats["max_waiting"] >= 6
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_reports_busy(self, fake_playwright):
+        service = RenderService(max_pages=1, queue_timeout=0.01)
+        await service.render("/warm", ".karma-card", (800, 400))
+        fake_playwright.browsers[0].delay = 0.2
+
+        slow = asyncio.create_task(service.render("/slow", ".karma-card", (800, 400)))
+        await asyncio.sleep(0)
+        with pytest.raises(RenderError) as exc:
+            await service.render("/queued", ".karma-card", (800, 400))
+
+        assert exc.value.status is None
+        assert service.stats["busy"] == 1
+        assert await slow == b"element-png"
+
+    @pytest.mark.asyncio
+    async def test_job_timeout_discards_the_page(self, fake_playwright):
+        service = RenderService(max_pages=1, job_timeout=0.01)
+        await service.render("/warm", ".karma-card", (800, 400))
+        browser = fake_playwright.browsers[0]
+        browser.delay = 0.2
+
+        with pytest.raises(RenderError):
+            await service.render("/hang", ".karma-card", (800, 400))
+
+        assert browser.pages[0].closed
+        assert service.stats["timeouts"] == 1
+        browser.delay = 0
+        assert await service.render("/next", ".karma-card", (800, 400)) == b"element-png"
+        assert len(browser.pages) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_status_is_reported_and_page_kept(self, fake_playwright):
+        service = RenderService()
+        await service.render("/warm", ".coc-sheet", (1000, 1200))
+        fake_playwright.browsers[0].status = 404
+
+        with pytest.raises(RenderError) as exc:
+            await service.render("/render/character/1/2", ".coc-sheet", (1000, 1200))
+
+        assert exc.value.status == 404
+        assert service.stats["failed"] == 1
+        assert service.snapshot()["idle_pages"] == 1
+
+    @pytest.mark.asyncio
+    async def test_navigation_error_has_no_status(self, fake_playwright):
+        service = RenderService()
+        await service.render("/warm", ".coc-sheet", (1000, 1200))
+        fake_playwright.browsers[0].goto_error = ConnectionError("refused")
+
+        with pytest.raises(RenderError) as exc:
+            await service.render("/render/character/1/2", ".coc-sheet", (1000, 1200))
+
+        assert exc.value.status is None
+        assert "dashboard" in str(exc.value)
+
+    @pytest.mark.asyncio
+    async def test_missing_selector_falls_back_to_page_screenshot(self, fake_playwright):
+        service = RenderService()
+        await service.render("/warm", ".coc-sheet", (1000, 1200))
+        fake_playwright.browsers[0].missing_selector = True
+
+        assert await service.render("/x", ".coc-sheet", (1000, 1200), full_page=True) == b"page-png-full"
+        assert await service.render("/x", ".karma-card", (800, 400)) == b"page-png"
+
+    @pytest.mark.asyncio
+    async def test_disconnected_browser_is_relaunched(self, fake_playwright):
+        service = RenderService()
+        await service.render("/a", ".karma-card", (800, 400))
+        fake_playwright.browsers[0].connected = False
+
+        assert await service.render("/b", ".karma-card", (800, 400)) == b"element-png"
+        assert len(fake_playwright.browsers) == 2
+        assert service.stats["launches"] == 2
+        assert fake_playwright.browsers[1].pages[0].visits == ["http://127.0.0.1:5000/b"]
+
+    @pytest.mark.asyncio
+    async def test_close_shuts_down_browser(self, fake_playwright):
+        service = RenderService()
+        await service.render("/a", ".karma-card", (800, 400))
+        await service.close()
+
+        assert not fake_playwright.browsers[0].connected
+        assert fake_playwright.stopped
+        assert service.snapshot()["browser_running"] is False
+
+
+class TestRenderCallers:
+    @pytest.mark.asyncio
+    async def test_karma_card_goes_through_shared_service(self):
+        bot = MagicMock()
+        bot.render_service.render = AsyncMock(return_value=b"png")
+        cog = Karma(bot)
+
+        assert await cog.generate_notification_image(1, 2, "Elder Sign", "up") == b"png"
+        path, selector, viewport = bot.render_service.render.await_args.args
+        assert path == "/render/karma/1/2?rank=Elder%20Sign&type=up"
+        assert selector == ".karma-card"
+        assert viewport == (800, 400)
+
+    @pytest.mark.asyncio
+    async def test_karma_card_returns_none_on_render_error(self):
+        bot = MagicMock()
+        bot.render_service.render = AsyncMock(side_effect=RenderError("busy"))
+        cog = Karma(bot)
+
+        assert await cog.generate_notification_image(1, 2, "Rank", "down") is None
+
+    @pytest.mark.asyncio
+    async def test_printcharacter_reports_status(self, monkeypatch):
+        bot = MagicMock()
+        bot.render_service.render = AsyncMock(side_effect=RenderError("status 500", status=500))
+        cog = PrintCharacter(bot)
+        monkeypatch.setattr("commands.printcharacter.load_player_stats",
+                            AsyncMock(return_value={"1": {"2": {"NAME": "Harvey"}}}))
+
+        interaction = MagicMock()
+        interaction.guild.id = 1
+        interaction.response.is_done.return_value = True
+        msg = MagicMock()
+        msg.edit = AsyncMock()
+        interaction.followup.send = AsyncMock(return_value=msg)
+        user = MagicMock(id=2, display_name="Harvey")
+
+        await cog._print_character(interaction, user)
+
+        msg.edit.assert_awaited_once_with(content="Error: Failed to load character sheet (Status: 500).")
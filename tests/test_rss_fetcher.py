@@ -0,0 +1,518 @@
+import asyncio
+import random
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import loadnsave
+import rss_utils
+from commands.rss import rss as RssCog
+
+ITEM_XML = "<item><guid>{guid}</guid><title>{title}</title><link>https://example.com/{guid}</link></item>"
+FEED_XML = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Arkham Gazette</title>{items}</channel></rss>"""
+
+
+def feed_xml(*guids):
+    return FEED_XML.format(items="".join(ITEM_XML.format(guid=g, title=f"Title {g}") for g in guids))
+
+
+@pytest_asyncio.fixture
+async def feed_server():
+    """Local feed with a single ETag; counts requests and conditional hits."""
+    state = {"etag": '"v1"', "guid": "a1", "requests": 0, "conditional": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def handle_feed(request):
+        state["requests"] += 1
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(0.01)
+            if request.headers.get("If-None-Match") == state["etag"]:
+                state["conditional"] += 1
+                return web.Response(status=304)
+            body = feed_xml(state["guid"])
+            return web.Response(text=body, content_type="application/rss+xml",
+                                headers={"ETag": state["etag"], "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+        finally:
+            state["in_flight"] -= 1
+
+    async def handle_missing(request):
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get("/feed.xml", handle_feed)
+    app.router.add_get("/missing.xml", handle_missing)
+    server = TestServer(app)
+    await server.start_server()
+    state["url"] = str(server.make_url("/feed.xml"))
+    state["missing_url"] = str(server.make_url("/missing.xml"))
+    yield state
+    await server.close()
+
+
+class TestFeedFetcher:
+    @pytest.mark.asyncio
+    async def test_parses_body_and_returns_validators(self, feed_server):
+        fetcher = rss_utils.FeedFetcher()
+        try:
+            result = await fetcher.fetch(feed_server["url"])
+        finally:
+            await fetcher.close()
+
+        assert result["status"] == 200
+        assert result["error"] is None
+        assert result["feed"].feed.title == "Arkham Gazette"
+        assert result["feed"].entries[0].title == "Title a1"
+        assert result["etag"] == '"v1"'
+        assert result["last_modified"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    @pytest.mark.asyncio
+    async def test_not_modified_skips_parsing(self, feed_server, monkeypatch):
+        fetcher = rss_utils.FeedFetcher()
+        parse_calls = []
+        real_parse = rss_utils.feedparser.parse
+        monkeypatch.setattr(rss_utils.feedparser, "parse", lambda *a, **kw: parse_calls.append(a) or real_parse(*a, **kw))
+        try:
+            first = await fetcher.fetch(feed_server["url"])
+            second = await fetcher.fetch(feed_server["url"], first["etag"], first["last_modified"])
+        finally:
+            await fetcher.close()
+
+        assert second["status"] == 304
+        assert second["feed"] is None
+        assert second["etag"] == '"v1"'
+        assert len(parse_calls) == 1
+        assert feed_server["conditional"] == 1
+        assert fetcher.stats["not_modified"] == 1 and fetcher.stats["parsed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_http_errors_are_reported_not_raised(self, feed_server):
+        fetcher = rss_utils.FeedFetcher()
+        try:
+            result = await fetcher.fetch(feed_server["missing_url"])
+        finally:
+            await fetcher.close()
+
+        assert result["status"] == 404
+        assert result["feed"] is None
+        assert result["error"] == "HTTP 404"
+        assert fetcher.stats["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, feed_server):
+        fetcher = rss_utils.FeedFetcher(concurrency=2)
+        try:
+            await asyncio.gather(*(fetcher.fetch(feed_server["url"]) for _ in range(6)))
+        finally:
+            await fetcher.close()
+
+        assert feed_server["requests"] == 6
+        assert feed_server["max_in_flight"] <= 2
+
+
+class TestCheckRssFeed:
+    @pytest.fixture(autouse=True)
+    def isolated_data(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+        monkeypatch.setattr(loadnsave, "_RSS_DATA_CACHE", None)
+
+    def make_cog(self, fetch_results):
+        bot = MagicMock()
+        channel = MagicMock()
+        channel.send = AsyncMock()
+        bot.get_channel.return_value = channel
+        cog = RssCog.__new__(RssCog)
+        cog.bot = bot
+        cog.fetcher = MagicMock()
+        cog.fetcher.fetch = AsyncMock(side_effect=lambda link, etag=None, last_modified=None: fetch_results[link])
+        cog.scheduler = rss_utils.FeedScheduler(spread=0)
+        return cog, channel
+
+    def parsed(self, *guids):
+        return rss_utils.feedparser.parse(feed_xml(*guids))
+
+    @pytest.mark.asyncio
+    async def test_sends_stored_validators_and_skips_unchanged_feed(self):
+        link = "https://example.com/feed.xml"
+        await loadnsave.save_rss_data({"1": [{"link": link, "channel_id": 10, "last_id": "a1",
+                                              "etag": '"v1"', "last_modified": "Wed"}]})
+        cog, channel = self.make_cog({link: {"status": 304, "feed": None, "etag": '"v1"',
+                                             "last_modified": "Wed", "error": None, "elapsed_ms": 1.0}})
+
+        await RssCog.check_rss_feed.coro(cog)
+
+        cog.fetcher.fetch.assert_awaited_once_with(link, '"v1"', "Wed")
+        channel.send.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_new_entries_posted_and_validators_persisted(self):
+        link = "https://example.com/feed.xml"
+        await loadnsave.save_rss_data({"1": [{"link": link, "channel_id": 10, "last_id": "a1"}]})
+        cog, channel = self.make_cog({link: {"status": 200, "feed": self.parsed("a2", "a1"), "etag": '"v2"',
+                                             "last_modified": "Thu", "error": None, "elapsed_ms": 1.0}})
+
+        await RssCog.check_rss_feed.coro(cog)
+
+        assert channel.send.await_count == 1
+        loadnsave._RSS_DATA_CACHE = None
+        sub = (await loadnsave.load_rss_data())["1"][0]
+        assert sub["last_id"] == "a2"
+        assert (sub["etag"], sub["last_modified"]) == ('"v2"', "Thu")
+
+    @pytest.mark.asyncio
+    async def test_disagreeing_subscriptions_force_unconditional_fetch(self):
+        link = "https://example.com/feed.xml"
+        await loadnsave.save_rss_data({
+            "1": [{"link": link, "channel_id": 10, "last_id": "a1", "etag": '"v1"'}],
+            "2": [{"link": link, "channel_id": 20, "last_id": "a1"}],
+        })
+        cog, _ = self.make_cog({link: {"status": 200, "feed": self.parsed("a1"), "etag": '"v1"',
+                                       "last_modified": None, "error": None, "elapsed_ms": 1.0}})
+
+        await RssCog.check_rss_feed.coro(cog)
+
+        cog.fetcher.fetch.assert_awaited_once_with(link, None, None)
+
+    @pytest.mark.asyncio
+    async def test_only_due_feeds_are_fetched_and_then_rescheduled(self):
+        due, later = "https://example.com/due.xml", "https://example.com/later.xml"
+        await loadnsave.save_rss_data({"1": [{"link": due, "channel_id": 10, "last_id": "a1"},
+                                             {"link": later, "channel_id": 10, "last_id": "a1"}]})
+        cog, _ = self.make_cog({due: {"status": 304, "feed": None, "etag": None,
+                                      "last_modified": None, "error": None, "elapsed_ms": 5.0}})
+        cog.scheduler.sync([due, later], now=0)
+        cog.scheduler.feeds[later]["next_poll"] = float("inf")
+
+        await RssCog.check_rss_feed.coro(cog)
+
+        cog.fetcher.fetch.assert_awaited_once_with(due, None, None)
+        assert cog.scheduler.feeds[due]["last_status"] == 304
+        assert cog.scheduler.feeds[due]["next_poll"] > cog.scheduler.feeds[due]["last_poll"]
+
+    @pytest.mark.asyncio
+    async def test_feed_is_rescheduled_even_if_processing_raises(self, monkeypatch):
+        link = "https://example.com/feed.xml"
+        await loadnsave.save_rss_data({"1": [{"link": link, "channel_id": 10, "last_id": "a1"}]})
+        cog, _ = self.make_cog({link: {"status": 200, "feed": self.parsed("a2", "a1"), "etag": None,
+                                       "last_modified": None, "error": None, "elapsed_ms": 1.0}})
+        monkeypatch.setattr(cog, "_apply_feed_updates", AsyncMock(side_effect=RuntimeError("boom")))
+
+        with pytest.raises(RuntimeError):
+            await RssCog.check_rss_feed.coro(cog)
+
+        assert cog.scheduler.next_due_in() is not None
+        assert cog.scheduler.feeds[link]["last_status"] == 200
+
+
+def entry_at(epoch):
+    return {"published_parsed": time.gmtime(epoch)}
+
+
+def fetched(status=200, entries=None, error=None, elapsed_ms=10.0):
+    feed = None
+    if status == 200 and error is None:
+        feed = MagicMock()
+        feed.entries = entries or []
+    return {"status": status, "feed": feed, "etag": None, "last_modified": None,
+            "error": error, "elapsed_ms": elapsed_ms}
+
+
+class TestFeedScheduler:
+    def test_estimate_publish_interval_uses_median_gap(self):
+        entries = [entry_at(t) for t in (10_000, 6_400, 2_800, 2_700)]
+
+        assert rss_utils.estimate_publish_interval(entries) == 3_600
+        assert rss_utils.estimate_publish_interval([{"title": "no dates"}]) is None
+
+    def test_new_feeds_are_spread_across_one_interval(self):
+        scheduler = rss_utils.FeedScheduler()
+        links = [f"https://example.com/{i}.xml" for i in range(200)]
+        scheduler.sync(links, now=0)
+
+        offsets = sorted(state["next_poll"] for state in scheduler.feeds.values())
+        assert 0 <= offsets[0] and offsets[-1] < rss_utils.DEFAULT_POLL_INTERVAL
+        # No single 30-second tick should carry much more than its share
+        per_tick = [sum(1 for o in offsets if t <= o < t + 30) for t in range(0, 300, 30)]
+        assert max(per_tick) < 40
+
+    def test_pop_due_returns_each_feed_once(self):
+        scheduler = rss_utils.FeedScheduler(spread=0)
+        scheduler.sync(["a", "b"], now=100)
+
+        assert sorted(scheduler.pop_due(now=100)) == ["a", "b"]
+        assert scheduler.pop_due(now=100) == []
+
+    def test_active_feed_polls_at_half_its_publish_gap(self):
+        scheduler = rss_utils.FeedScheduler(spread=0, rng=random.Random(1))
+        scheduler.sync(["a"], now=0)
+        scheduler.pop_due(now=0)
+        hourly = [entry_at(t) for t in (7_200, 3_600, 0)]
+
+        scheduler.record("a", fetched(entries=hourly), has_new=True, now=0)
+
+        assert scheduler.feeds["a"]["interval"] == 1_800
+        assert 1_620 <= scheduler.feeds["a"]["next_poll"] <= 1_980
+
+    def test_unchanged_polls_back_off_up_to_twice_the_publish_gap(self):
+        scheduler = rss_utils.FeedScheduler(spread=0)
+        scheduler.sync(["a"], now=0)
+        scheduler.pop_due(now=0)
+        scheduler.record("a", fetched(entries=[entry_at(t) for t in (7_200, 3_600, 0)]), has_new=True, now=0)
+
+        intervals = []
+        for _ in range(8):
+            scheduler.record("a", fetched(status=304), now=0)
+            intervals.append(scheduler.feeds["a"]["interval"])
+
+        assert intervals[0] == 2_700
+        assert intervals == sorted(intervals)
+        assert intervals[-1] == 7_200
+
+    def test_errors_double_interval_up_to_max(self):
+        scheduler = rss_utils.FeedScheduler(spread=0)
+        scheduler.sync(["a"], now=0)
+        for _ in range(10):
+            scheduler.record("a", fetched(status=None, error="timeout"), now=0)
+
+        state = scheduler.feeds["a"]
+        assert state["errors"] == 10
+        assert state["interval"] == rss_utils.MAX_POLL_INTERVAL
+
+        scheduler.record("a", fetched(status=304), now=0)
+        assert scheduler.feeds["a"]["errors"] == 0
+        assert scheduler.feeds["a"]["interval"] == rss_utils.DEFAULT_POLL_INTERVAL * 4
+
+    def test_latency_is_tracked_per_feed(self):
+        scheduler = rss_utils.FeedScheduler(spread=0)
+        scheduler.sync(["a"], now=0)
+        scheduler.record("a", fetched(status=304, elapsed_ms=100.0), now=0)
+        scheduler.record("a", fetched(status=304, elapsed_ms=200.0), now=0)
+
+        assert scheduler.feeds["a"]["latency_ms"] == 200.0
+        assert scheduler.feeds["a"]["avg_latency_ms"] == 120.0
+
+    def test_unsubscribed_feeds_are_dropped(self):
+        scheduler = rss_utils.FeedScheduler(spread=0)
+        scheduler.sync(["a", "b"], now=0)
+        scheduler.sync(["a"], now=0)
+
+        assert scheduler.pop_due(now=0) == ["a"]
+        scheduler.record("b", fetched(status=304), now=0)
+        assert "b" not in scheduler.feeds
+
+
+class TestFeedFanOut:
+    LINK = "https://example.com/feed.xml"
+
+    def make_cog(self, channel_ids):
+        channels = {}
+        for cid in channel_ids:
+            channel = MagicMock()
+            channel.send = AsyncMock()
+            channels[cid] = channel
+        bot = MagicMock()
+        bot.get_channel.side_effect = channels.get
+        cog = RssCog.__new__(RssCog)
+        cog.bot = bot
+        return cog, channels
+
+    def result(self, *guids):
+        return {"status": 200, "feed": rss_utils.feedparser.parse(feed_xml(*guids)),
+                "etag": '"v2"', "last_modified": None, "error": None, "elapsed_ms": 1.0}
+
+    def seen(self, cog, *guids):
+        feed = rss_utils.feedparser.parse(feed_xml(*guids))
+        return [cog._entry_key(entry) for entry in feed.entries]
+
+    def sent_titles(self, channel):
+        return [c.kwargs["embed"].title for c in channel.send.await_args_list]
+
+    @pytest.mark.asyncio
+    async def test_shared_feed_builds_each_embed_once_and_fans_out(self, monkeypatch):
+        cog, channels = self.make_cog([10, 20, 30])
+        window = self.seen(cog, "a1")
+        rss_data = {
+            "1": [{"link": self.LINK, "channel_id": 10, "seen_ids": list(window), "color": "#FF0000"}],
+            "2": [{"link": self.LINK, "channel_id": 20, "seen_ids": list(window), "color": "#FF0000"}],
+            "3": [{"link": self.LINK, "channel_id": 30, "seen_ids": list(window), "color": "#0000FF"}],
+        }
+        builds = []
+        real_build = cog._create_rss_embed
+        monkeypatch.setattr(cog, "_create_rss_embed", lambda *a: builds.append(a) or real_build(*a))
+
+        posted, changed = await cog._apply_feed_updates(rss_data, {self.LINK: self.result("a3", "a2", "a1")})
+
+        assert posted == {self.LINK} and changed
+        assert len(builds) == 2
+        for cid in (10, 20, 30):
+            assert self.sent_titles(channels[cid]) == ["Title a2", "Title a3"]
+        assert channels[10].send.await_args_list[0].kwargs["embed"] is channels[20].send.await_args_list[0].kwargs["embed"]
+        assert channels[30].send.await_args_list[0].kwargs["embed"].colour.value == 0x0000FF
+        assert rss_data["3"][0]["seen_ids"] == self.seen(cog, "a3", "a2", "a1")
+        assert rss_data["3"][0]["last_id"].endswith("a3")
+
+    @pytest.mark.asyncio
+    async def test_reordered_feed_only_posts_unseen_entries(self):
+        cog, channels = self.make_cog([10])
+        rss_data = {"1": [{"link": self.LINK, "channel_id": 10, "seen_ids": self.seen(cog, "a2", "a1")}]}
+
+        await cog._apply_feed_updates(rss_data, {self.LINK: self.result("a1", "a3", "a2")})
+
+        assert self.sent_titles(channels[10]) == ["Title a3"]
+
+    @pytest.mark.asyncio
+    async def test_nothing_lost_when_every_seen_entry_rolled_off(self):
+        cog, channels = self.make_cog([10])
+        rss_data = {"1": [{"link": self.LINK, "channel_id": 10, "last_id": "gone", "seen_ids": self.seen(cog, "gone")}]}
+
+        await cog._apply_feed_updates(rss_data, {self.LINK: self.result("a3", "a2")})
+
+        assert self.sent_titles(channels[10]) == ["Title a2", "Title a3"]
+
+    @pytest.mark.asyncio
+    async def test_legacy_marker_seeds_window(self):
+        cog, channels = self.make_cog([10])
+        first = rss_utils.feedparser.parse(feed_xml("a1")).entries[0]
+        rss_data = {"1": [{"link": self.LINK, "channel_id": 10, "last_id": cog.get_entry_id(first)}]}
+
+        await cog._apply_feed_updates(rss_data, {self.LINK: self.result("a2", "a1")})
+
+        assert self.sent_titles(channels[10]) == ["Title a2"]
+        assert rss_data["1"][0]["seen_ids"] == self.seen(cog, "a2", "a1")
+
+    @pytest.mark.asyncio
+    async def test_failed_channel_keeps_its_window_for_retry(self):
+        cog, channels = self.make_cog([10, 20])
+        channels[20].send.side_effect = RuntimeError("Missing Access")
+        window = self.seen(cog, "a1")
+        rss_data = {
+            "1": [{"link": self.LINK, "channel_id": 10, "seen_ids": list(window)}],
+            "2": [{"link": self.LINK, "channel_id": 20, "seen_ids": list(window)}],
+        }
+
+        await cog._apply_feed_updates(rss_data, {self.LINK: self.result("a2", "a1")})
+
+        assert self.sent_titles(channels[10]) == ["Title a2"]
+        assert rss_data["1"][0]["seen_ids"] == self.seen(cog, "a2", "a1")
+        assert rss_data["1"][0]["etag"] == '"v2"'
+        assert rss_data["2"][0]["seen_ids"] == window
+        assert "etag" not in rss_data["2"][0]
+
+    @pytest.mark.asyncio
+    async def test_window_is_bounded_but_covers_the_whole_feed(self, monkeypatch):
+        import commands.rss as rss_module
+        monkeypatch.setattr(rss_module, "SEEN_WINDOW", 3)
+        cog, _ = self.make_cog([10])
+        old = [f"{i:016x}" for i in range(10)]
+        rss_data = {"1": [{"link": self.LINK, "channel_id": 10, "seen_ids": old}]}
+
+        await cog._apply_feed_updates(rss_data, {self.LINK: self.result("a4", "a3", "a2", "a1")})
+
+        window = rss_data["1"][0]["seen_ids"]
+        assert window == self.seen(cog, "a4", "a3", "a2", "a1")
+
+
+CHANNEL = "UC" + "a" * 22
+OTHER_CHANNEL = "UC" + "b" * 22
+
+
+class TestYoutubeChannelResolution:
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+        monkeypatch.setattr(loadnsave, "_YOUTUBE_CHANNEL_CACHE", None)
+
+    @pytest.fixture
+    def ytdlp(self, monkeypatch):
+        fake = MagicMock()
+        ydl = fake.YoutubeDL.return_value.__enter__.return_value
+        ydl.extract_info.return_value = {"channel_id": OTHER_CHANNEL}
+        monkeypatch.setattr(rss_utils, "yt_dlp", fake)
+        return ydl
+
+    def test_canonical_link_wins_over_embedded_ids(self):
+        html = (f'<script>{{"channelId":"{OTHER_CHANNEL}"}}</script>'
+                f'<link rel="canonical" href="https://www.youtube.com/channel/{CHANNEL}">')
+
+        assert rss_utils.channel_id_from_html(html) == CHANNEL
+        assert rss_utils.channel_id_from_html(f'"channelId":"{OTHER_CHANNEL}"') == OTHER_CHANNEL
+        assert rss_utils.channel_id_from_html("<html></html>") is None
+
+    @pytest.mark.asyncio
+    async def test_channel_url_needs_no_lookup(self, ytdlp, monkeypatch):
+        monkeypatch.setattr(rss_utils, "_fetch_channel_id_from_html", AsyncMock())
+
+        url = await rss_utils.get_youtube_rss_url(f"https://www.youtube.com/channel/{CHANNEL}")
+
+        assert url.endswith(f"channel_id={CHANNEL}")
+        rss_utils._fetch_channel_id_from_html.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_html_path_resolves_and_caches_without_ytdlp(self, ytdlp, monkeypatch):
+        html_lookup = AsyncMock(return_value=CHANNEL)
+        monkeypatch.setattr(rss_utils, "_fetch_channel_id_from_html", html_lookup)
+
+        first = await rss_utils.get_youtube_rss_url("https://www.youtube.com/@Arkham/")
+        second = await rss_utils.get_youtube_rss_url("https://youtube.com/@Arkham")
+
+        assert first == second == rss_utils._youtube_feed_url(CHANNEL)
+        assert html_lookup.await_count == 1
+        ytdlp.extract_info.assert_not_called()
+        loadnsave._YOUTUBE_CHANNEL_CACHE = None
+        assert (await loadnsave.load_youtube_channel_cache())["youtube.com/@Arkham"]["channel_id"] == CHANNEL
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_ytdlp_when_html_has_no_id(self, ytdlp, monkeypatch):
+        monkeypatch.setattr(rss_utils, "_fetch_channel_id_from_html", AsyncMock(return_value=None))
+
+        url = await rss_utils.get_youtube_rss_url("https://www.youtube.com/watch?v=abc")
+
+        assert url == rss_utils._youtube_feed_url(OTHER_CHANNEL)
+        ytdlp.extract_info.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_resolved_again(self, ytdlp, monkeypatch):
+        html_lookup = AsyncMock(return_value=CHANNEL)
+        monkeypatch.setattr(rss_utils, "_fetch_channel_id_from_html", html_lookup)
+        await loadnsave.save_youtube_channel_cache({
+            "youtube.com/@Old": {"channel_id": OTHER_CHANNEL, "resolved_at": time.time() - rss_utils.YOUTUBE_CHANNEL_TTL - 1},
+        })
+
+        assert await rss_utils.get_youtube_rss_url("https://www.youtube.com/@Old") == rss_utils._youtube_feed_url(CHANNEL)
+        assert html_lookup.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_cached_briefly(self, ytdlp, monkeypatch):
+        html_lookup = AsyncMock(return_value=None)
+        monkeypatch.setattr(rss_utils, "_fetch_channel_id_from_html", html_lookup)
+        ytdlp.extract_info.return_value = {"id": "not-a-channel"}
+
+        assert await rss_utils.get_youtube_rss_url("https://www.youtube.com/@Nobody") is None
+        assert await rss_utils.get_youtube_rss_url("https://www.youtube.com/@Nobody") is None
+        assert html_lookup.await_count == 1
+
+        cache = await loadnsave.load_youtube_channel_cache()
+        cache["youtube.com/@Nobody"]["resolved_at"] -= rss_utils.YOUTUBE_NEGATIVE_TTL + 1
+        await rss_utils.get_youtube_rss_url("https://www.youtube.com/@Nobody")
+        assert html_lookup.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_html_fetch_against_live_page(self):
+        async def handle(request):
+            return web.Response(text=f'<link rel="canonical" href="https://www.youtube.com/channel/{CHANNEL}">',
+                                content_type="text/html")
+        app = web.Application()
+        app.router.add_get("/@Arkham", handle)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            channel_id = await rss_utils._fetch_channel_id_from_html(str(server.make_url("/@Arkham")))
+        finally:
+            await server.close()
+
+        assert channel_id == CHANNEL
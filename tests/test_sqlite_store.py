@@ -0,0 +1,150 @@
+import json
+
+import pytest
+
+import loadnsave
+from sqlite_store import SqliteStore, migrate_json_to_sqlite
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SqliteStore(str(tmp_path / "test.sqlite3"))
+    yield s
+    s.close()
+
+
+class TestSqliteStore:
+    def test_document_round_trips_with_key_order(self, store):
+        doc = {"2": {"b": {"NAME": "B"}, "a": {"NAME": "A"}}, "1": {"x": 5}, "3": {}}
+        store.save_document("player_stats", doc)
+        loaded = store.load_document("player_stats")
+        assert loaded == doc
+        assert list(loaded) == ["2", "1", "3"]
+        assert list(loaded["2"]) == ["b", "a"]
+
+    def test_rows_are_keyed_per_guild_and_entity(self, store):
+        store.save_document("karma_stats", {"1": {"10": 3, "11": 4}, "2": {"20": 1}})
+        assert store.row_count("karma_stats") == 3
+        assert store.get_row("karma_stats", "1", "11") == 4
+        assert store.get_row("karma_stats", "1", "99") is None
+
+    def test_save_document_removes_missing_guilds_and_entities(self, store):
+        store.save_document("karma_stats", {"1": {"10": 3, "11": 4}, "2": {"20": 1}})
+        store.save_document("karma_stats", {"1": {"10": 3}})
+        assert store.load_document("karma_stats") == {"1": {"10": 3}}
+
+    def test_save_guilds_leaves_other_guilds_untouched(self, store):
+        store.save_document("karma_stats", {"1": {"10": 3}, "2": {"20": 1}})
+        store.save_guilds("karma_stats", {"2": {"20": 2, "21": 5}})
+        store.save_guilds("karma_stats", {"1": None})
+        assert store.load_document("karma_stats") == {"2": {"20": 2, "21": 5}}
+
+    def test_put_row_replaces_bare_guild_value(self, store):
+        store.save_document("journal_data", {"1": {}})
+        store.put_row("journal_data", "1", "master", {"entries": []})
+        assert store.load_guild("journal_data", "1") == {"master": {"entries": []}}
+
+    def test_entities_are_isolated(self, store):
+        store.save_document("karma_stats", {"1": {"10": 3}})
+        store.save_document("giveaway_data", {"1": {"555": {"prize": "Idol"}}})
+        assert store.load_document("karma_stats") == {"1": {"10": 3}}
+
+
+def test_migrate_json_to_sqlite_imports_existing_files(tmp_path):
+    (tmp_path / "karma_stats.json").write_text(json.dumps({"1": {"10": 3, "11": -2}}), encoding="utf-8")
+    (tmp_path / "player_stats.json").write_text(json.dumps({"1": {"10": {"NAME": "Harvey"}}}), encoding="utf-8")
+    db_path = str(tmp_path / "cthulhu.sqlite3")
+
+    migrated = migrate_json_to_sqlite(str(tmp_path), db_path)
+    # Re-running is harmless.
+    migrate_json_to_sqlite(str(tmp_path), db_path)
+
+    assert migrated == {"player_stats.json": 1, "karma_stats.json": 2}
+    store = SqliteStore(db_path)
+    try:
+        assert store.load_document("karma_stats") == {"1": {"10": 3, "11": -2}}
+    finally:
+        store.close()
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+    monkeypatch.setattr(loadnsave, "_SETTINGS_CACHE", {"storage_backend": "sqlite"})
+    monkeypatch.setattr(loadnsave, "_SQLITE_STORE", None)
+    for cache_name in ["_PLAYER_STATS_CACHE", "_KARMA_STATS_CACHE"]:
+        monkeypatch.setattr(loadnsave, cache_name, None)
+    monkeypatch.setattr(loadnsave, "_DIRTY", {})
+    monkeypatch.setattr(loadnsave, "_FRAGMENTS", {})
+    yield tmp_path
+    if loadnsave._SQLITE_STORE is not None:
+        loadnsave._SQLITE_STORE.close()
+
+
+class TestLoadnsaveSqliteBackend:
+    @pytest.mark.asyncio
+    async def test_save_and_load_go_through_sqlite(self, sqlite_backend):
+        await loadnsave.save_karma_stats({"1": {"10": 3}})
+        loadnsave.invalidate_data_cache("karma_stats.json")
+
+        assert not (sqlite_backend / "karma_stats.json").exists()
+        assert await loadnsave.load_karma_stats() == {"1": {"10": 3}}
+
+    @pytest.mark.asyncio
+    async def test_load_entity_reads_one_row_without_loading_document(self, sqlite_backend):
+        await loadnsave.save_karma_stats({"1": {"10": 3}, "2": {"20": 9}})
+        loadnsave.invalidate_data_cache("karma_stats.json")
+
+        assert await loadnsave.load_entity("karma_stats.json", 2, 20) == 9
+        assert await loadnsave.load_entity("karma_stats.json", 2, 21, default=0) == 0
+        assert loadnsave._KARMA_STATS_CACHE is None
+
+    @pytest.mark.asyncio
+    async def test_skill_autocomplete_reads_only_the_investigator_row(self, sqlite_backend):
+        from types import SimpleNamespace
+        from commands.roll import Roll
+
+        await loadnsave.save_player_stats({"1": {"10": {"NAME": "Harvey", "Spot Hidden": 60}}, "2": {"20": {"NAME": "Other"}}})
+        loadnsave.invalidate_data_cache("player_stats.json")
+        interaction = SimpleNamespace(guild_id=1, user=SimpleNamespace(id=10))
+
+        choices = await Roll.__new__(Roll).skill_autocomplete(interaction, "")
+
+        assert [c.value for c in choices] == ["Spot Hidden"]
+        assert loadnsave._PLAYER_STATS_CACHE is None
+
+    @pytest.mark.asyncio
+    async def test_save_entity_writes_row_and_updates_loaded_cache(self, sqlite_backend):
+        stats = await loadnsave.load_karma_stats()
+        await loadnsave.save_entity("karma_stats.json", 1, 10, 42)
+
+        assert stats == {"1": {"10": 42}}
+        assert loadnsave._get_sqlite_store().get_row("karma_stats", "1", "10") == 42
+
+    @pytest.mark.asyncio
+    async def test_write_behind_flush_writes_only_dirty_guild(self, sqlite_backend):
+        await loadnsave.save_karma_stats({"1": {"10": 3}, "2": {"20": 9}})
+        stats = await loadnsave.load_karma_stats()
+        stats["2"]["20"] = 10
+        stats["1"]["10"] = 999  # not marked dirty, so must not be written
+        loadnsave.mark_dirty("karma_stats.json", "2")
+
+        await loadnsave.flush_dirty()
+
+        assert loadnsave._get_sqlite_store().load_document("karma_stats") == {"1": {"10": 3}, "2": {"20": 10}}
+
+
+@pytest.mark.asyncio
+async def test_load_entity_json_backend_reads_cached_document(tmp_path, monkeypatch):
+    monkeypatch.setattr(loadnsave, "DATA_FOLDER", str(tmp_path))
+    monkeypatch.setattr(loadnsave, "_SETTINGS_CACHE", {})
+    monkeypatch.setattr(loadnsave, "_KARMA_STATS_CACHE", None)
+    monkeypatch.setattr(loadnsave, "_DIRTY", {})
+    (tmp_path / "karma_stats.json").write_text(json.dumps({"1": {"10": 3}}), encoding="utf-8")
+
+    assert await loadnsave.load_entity("karma_stats.json", "1", "10") == 3
+    await loadnsave.save_entity("karma_stats.json", "1", "10", 4)
+
+    assert loadnsave.has_pending_writes()
+    await loadnsave.flush_dirty()
+    assert json.loads((tmp_path / "karma_stats.json").read_text(encoding="utf-8")) == {"1": {"10": 4}}